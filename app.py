@@ -16,37 +16,31 @@ def main():
     - Create and catalog individual symbol glyphs
     - Compose words from saved symbols
     - Build complete sentences mixing symbols and text
+    - Explore letter pair, position and word pair statistics
     
     Navigate using the sidebar to access different tools.
     """)
     
     # Display some basic stats if databases exist
     try:
-        from pathlib import Path
-        import json
+        from components.repository import load_letters, load_words, load_sentences
         
         stats = []
         
         # Check letters
-        letters_path = Path("data/letters.json")
-        if letters_path.exists():
-            with open(letters_path) as f:
-                letters = json.load(f)
-                stats.append(f"📝 Letters cataloged: {len(letters)}")
+        letters = load_letters()
+        if letters:
+            stats.append(f"📝 Letters cataloged: {len(letters)}")
         
         # Check words
-        words_path = Path("data/words.json")
-        if words_path.exists():
-            with open(words_path) as f:
-                words = json.load(f)
-                stats.append(f"📚 Words composed: {len(words)}")
+        words = load_words()
+        if words:
+            stats.append(f"📚 Words composed: {len(words)}")
         
         # Check sentences
-        sentences_path = Path("data/sentences.json")
-        if sentences_path.exists():
-            with open(sentences_path) as f:
-                sentences = json.load(f)
-                stats.append(f"📜 Sentences recorded: {len(sentences)}")
+        sentences = load_sentences()
+        if sentences:
+            stats.append(f"📜 Sentences recorded: {len(sentences)}")
         
         if stats:
             st.subheader("Current Progress")
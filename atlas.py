@@ -0,0 +1,105 @@
+"""Precomputed sprite atlas of every possible glyph.
+
+A glyph is a 13-bit component mask, so there are only 8192 distinct
+letters. build_atlas renders each of them once into an N x H x W uint8
+array of ink coverage indexed by mask and stores it as a .npy file that
+load_atlas memory-maps read-only, so every Streamlit worker process shares
+the same pages. Words and sentences are then composited by slicing.
+
+Build it with:
+
+    python atlas.py [--height 144] [--path data/glyph_atlas.npy]
+"""
+import argparse
+import os
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+
+from render import SymbolConfig, SymbolGlyph, N_COMPONENTS
+from raster import MARGIN, STROKE_WIDTH, Y_RANGE, draw_segments, glyph_x_range, pixel_scale, rasterize_ink
+
+ATLAS_PATH = Path("data/glyph_atlas.npy")
+# thumbnails are drawn at this height too, so composing them is pure slicing;
+# it has to give whole-pixel glyph cells (144 px: 60 px cells, 12 px margins)
+ATLAS_HEIGHT = 144
+
+_atlas_cache = {}
+
+def _cell_layout(height: int):
+    """Pixel width of one glyph cell and of the margin on either side of it"""
+    scale = pixel_scale(height)
+    cell = scale * (SymbolConfig.GLYPH_WIDTH + SymbolConfig.GLYPH_SPACING)
+    pad = scale * MARGIN
+    if not (np.isclose(cell, round(cell)) and np.isclose(pad, round(pad))):
+        raise ValueError(f"Atlas height {height} does not give whole-pixel glyph cells")
+    return int(round(cell)), int(round(pad))
+
+def build_atlas(path: Path = ATLAS_PATH, height: int = ATLAS_HEIGHT,
+                stroke_width: float = STROKE_WIDTH) -> Path:
+    """Render all 2^13 glyphs (without fraction line) into a .npy atlas"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    cell, pad = _cell_layout(height)
+    n_glyphs = 1 << N_COMPONENTS
+    tmp_path = path.with_name(path.name + ".tmp")
+    atlas = np.lib.format.open_memmap(
+        tmp_path, mode="w+", dtype=np.uint8, shape=(n_glyphs, height, cell + 2 * pad)
+    )
+    x_range = glyph_x_range(1)
+    for mask in range(n_glyphs):
+        geometry = SymbolGlyph(mask).geometry()
+        ink = rasterize_ink(geometry.segments, geometry.circles, x_range, height,
+                            stroke_width=stroke_width, fraction_line=False)
+        atlas[mask] = np.rint(ink * 255)
+    atlas.flush()
+    del atlas
+    # atomic swap so readers never map a half-written atlas
+    os.replace(tmp_path, path)
+    _atlas_cache.pop(str(path), None)
+    return path
+
+def load_atlas(path: Path = ATLAS_PATH) -> Optional[np.ndarray]:
+    """Memory-map the atlas read-only, or return None if it has not been built"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    key = str(path)
+    if key not in _atlas_cache:
+        _atlas_cache[key] = np.load(path, mmap_mode="r")
+    return _atlas_cache[key]
+
+def _fraction_profile(height: int, stroke_width: float = STROKE_WIDTH) -> np.ndarray:
+    """Ink coverage of the fraction line for one pixel column"""
+    key = ("fraction", height, stroke_width)
+    if key not in _atlas_cache:
+        column = np.zeros((height, 1), dtype=np.float32)
+        draw_segments(column, np.array([[-1.0, SymbolConfig.FRACTION_Y, 1.0, SymbolConfig.FRACTION_Y]]),
+                      (0.0, 1.0 / pixel_scale(height)), Y_RANGE, stroke_width)
+        _atlas_cache[key] = np.rint(column * 255).astype(np.uint8)
+    return _atlas_cache[key]
+
+def compose_chain(atlas: np.ndarray, masks: Sequence[int]) -> np.ndarray:
+    """Composite a chain of glyph masks into a uint8 grayscale image"""
+    n_glyphs, height, sprite_width = atlas.shape
+    cell, pad = _cell_layout(height)
+    sprites = atlas[np.asarray(masks, dtype=np.intp)]
+    ink = np.zeros((height, len(masks) * cell + 2 * pad), dtype=np.uint8)
+    # neighbouring sprites overlap on their shared verticals, so merge by max
+    for i, sprite in enumerate(sprites):
+        window = ink[:, i * cell:i * cell + sprite_width]
+        np.maximum(window, sprite, out=window)
+    np.maximum(ink, _fraction_profile(height), out=ink)
+    return 255 - ink
+
+def compose_glyph(atlas: np.ndarray, mask: int) -> np.ndarray:
+    """Composite a single glyph, fraction line included"""
+    return compose_chain(atlas, [mask])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the glyph sprite atlas")
+    parser.add_argument("--path", type=Path, default=ATLAS_PATH)
+    parser.add_argument("--height", type=int, default=ATLAS_HEIGHT)
+    args = parser.parse_args()
+    print(f"Atlas written to {build_atlas(args.path, args.height)}")
@@ -1,6 +1,12 @@
 import numpy as np
 import string
 import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+from components.english_corpus import english_word_counts
+from components.repository import load_words, save_records
+from components.translation_solver import solve_translations
 
 def get_freq_distibution(
         letters, words, sentences
@@ -27,16 +33,9 @@ def get_freq_distibution(
 
 def load_english_word_freq_sample(english_sample_path = "english_sample.txt"):
 
-    with open(english_sample_path, "r") as f:
-        text = f.read()
-
-    words = text.split()
-    words = [word.lower() for word in words]
-    # remove tokens that contain punctuation
-    words = [word for word in words if not any([char in string.punctuation for char in word])]
-    word_counts = np.unique(words, return_counts=True)
-    word_frequency = word_counts[0]
-    word_counts = word_counts[1]
+    # streamed, tokenized like text.split() + lower() minus punctuated
+    # tokens, and cached on disk by content hash
+    word_frequency, word_counts = english_word_counts(Path(english_sample_path))
 
     print (f"The most common word is {word_frequency[np.argmax(word_counts)]} with {np.max(word_counts)} occurrences.")
     sorted_word_frequency = word_frequency[np.argsort(word_counts)][::-1]
@@ -48,33 +47,133 @@ def load_english_word_freq_sample(english_sample_path = "english_sample.txt"):
 
     return sorted_word_frequency, sorted_word_counts
 
-def translate_words_from_english_freq(
-        letters, 
-        words, 
+def propose_translations_from_english_freq(
+        letters,
+        words,
         sentences,
         note_key="known",
-        commit:bool=True
     ):
-    import streamlit as st
+    """
+    Match words to English words of the same frequency rank, without saving.
+    Returns a diff: "changes" lists each word whose translation would change
+    (word_id, old, new) and "skipped" lists the known words that were kept
+    (word_id, suggested, known).
+    """
     sorted_ewf, sorted_ewc = load_english_word_freq_sample()
     word_freq, word_count, _, _ = get_freq_distibution(letters, words, sentences)
     sort_indices = np.argsort(word_count)[::-1]
     words_by_freq = [str(word) for word in word_freq[sort_indices]]
+    changes, skipped = [], []
     offset = 0
     for i, word_id in enumerate(words_by_freq):
-        word_data = words[word_id] 
+        if i - offset >= len(sorted_ewf):
+            break  # ran out of English words
+        word_data = words[word_id]
         likely_translation = str(sorted_ewf[i - offset]) # offset accounts for "skipped" word matches
-        notes = word_data["notes"]
+        notes = word_data.get("notes", "")
         if note_key in notes:
             known_translation = word_data["translation"]
             print(f"frequency suggested the translation for word {word_id} is {likely_translation}, but it is known to be {known_translation}")
             print("updating offset and skipping")
+            skipped.append({"word_id": word_id, "suggested": likely_translation, "known": known_translation})
             offset += 1
             continue
         print(f"frequency suggests the translation for word {word_id} is {likely_translation}")
-        word_data["translation"] = likely_translation
-        words[word_id] = word_data
+        old_translation = word_data.get("translation", "")
+        if old_translation != likely_translation:
+            changes.append({"word_id": word_id, "old": old_translation, "new": likely_translation})
+    return {"changes": changes, "skipped": skipped}
+
+def propose_translations_by_assignment(
+        letters,
+        words,
+        sentences,
+        note_key="known",
+        top_k=5,
+        english_sample_path="english_sample.txt",
+    ):
+    """
+    Like propose_translations_from_english_freq, but solved as one global
+    assignment: every word gets a distinct English word of similar frequency
+    rank and length, at the lowest total cost. Known words keep their
+    translation, which no other word can take. Changes also carry the cost
+    and the top_k alternatives.
+    """
+    english_words, english_counts = english_word_counts(Path(english_sample_path))
+    word_freq, word_count, _, _ = get_freq_distibution(letters, words, sentences)
+    word_ids = [str(word) for word in word_freq]
+    known = {
+        word_id: words[word_id].get("translation", "")
+        for word_id in word_ids if note_key in words[word_id].get("notes", "")
+    }
+    lengths = np.array([len(words[word_id]["letter_ids"]) for word_id in word_ids])
+    solution = solve_translations(word_ids, word_count, lengths, english_words, english_counts,
+                                  known=known, top_k=top_k)
+    changes, skipped = [], []
+    for entry in sorted(solution, key=lambda entry: entry["cost"]):
+        word_id = entry["word_id"]
+        if entry["known"]:
+            skipped.append({"word_id": word_id, "suggested": None, "known": entry["translation"]})
+            continue
+        old_translation = words[word_id].get("translation", "")
+        if entry["translation"] is not None and old_translation != entry["translation"]:
+            changes.append({
+                "word_id": word_id, "old": old_translation, "new": entry["translation"],
+                "cost": round(entry["cost"], 3),
+                "alternatives": ", ".join(english for english, _ in entry["candidates"]),
+            })
+    return {"changes": changes, "skipped": skipped}
+
+TRANSLATION_METHODS = {
+    "rank order": propose_translations_from_english_freq,
+    "global assignment": propose_translations_by_assignment,
+}
+
+def apply_translation_diff(diff, words=None):
+    """
+    Save all changes of a translation diff in one atomic write.
+    Words whose translation changed since the diff was proposed are left
+    alone. Returns the changes that were applied.
+    """
+    if words is None:
+        words = load_words()
+    applied, updated = [], []
+    for change in diff["changes"]:
+        word_data = words.get(change["word_id"])
+        if word_data is None or word_data.get("translation", "") != change["old"]:
+            continue
+        updated.append(dict(word_data, translation=change["new"]))
+        applied.append(change)
+    if updated:
+        save_records("words", updated)
+    return applied
+
+def translate_words_from_english_freq(
+        letters, 
+        words, 
+        sentences,
+        note_key="known",
+        commit:bool=True,
+        method:str="rank order"
+    ):
+    """
+    Propose translations by frequency (method is a key of
+    TRANSLATION_METHODS) and, if commit is set, save them all at once.
+    With commit=False this is a dry run. Returns the diff.
+    """
+    diff = TRANSLATION_METHODS[method](letters, words, sentences, note_key)
+    if commit:
+        apply_translation_diff(diff, words)
+    return diff
+
+# one translation at a time, off the Streamlit script thread
+_translation_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="translate")
 
-        if commit:
-            with open("data/words.json", "w") as f:
-                json.dump(words, f, indent=2)
+def submit_translation(letters, words, sentences, note_key="known", method="rank order") -> Future:
+    """
+    Run a dry-run translate_words_from_english_freq on a background thread.
+    The future's result is the diff.
+    """
+    return _translation_executor.submit(
+        translate_words_from_english_freq, letters, words, sentences, note_key, False, method
+    )
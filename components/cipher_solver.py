@@ -0,0 +1,310 @@
+# components/cipher_solver.py
+# Letter-level decipherment: search for the mapping from letter ids to
+# English graphemes under which the recorded sentences read most like
+# English. A mapping is scored by the log-probability of the decoded
+# in-word grapheme bigrams (word boundaries included) under a bigram model
+# of the English sample. The glyph side is reduced once to a letter bigram
+# count matrix over the CSR corpus, so a score is a weighted sum over that
+# matrix, and the score change of reassigning one letter is computed for
+# every grapheme at once.
+#
+# Independent simulated-annealing chains run on a process pool in epochs;
+# after each epoch the best mapping so far is reported and the worst chain
+# restarts from it. Run it with:
+#     python -m components.cipher_solver solve --chains 4 --epochs 30
+import argparse
+import os
+import string
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from components.corpus import Corpus
+from components.parallel import pool_context
+
+GRAPHEMES = tuple(string.ascii_lowercase)
+SMOOTHING = 0.5  # add-k smoothing of the English bigram counts
+
+@dataclass
+class CipherModel:
+    """Everything a chain needs: glyph bigram counts and English bigram log-probabilities"""
+    letter_ids: List[str]  # the letters that occur, in matrix order
+    graphemes: List[str]
+    counts: np.ndarray  # (letters + 1)^2 bigram counts, last row/column is the word boundary
+    log_probs: np.ndarray  # (graphemes + 1)^2 log P(next | previous), same boundary convention
+    unigrams: np.ndarray  # grapheme frequencies, for the initial mapping
+
+@dataclass
+class CipherResult:
+    mapping: Dict[str, str]
+    score: float  # mean log-probability per bigram
+    history: List[float] = field(default_factory=list)  # best score after each epoch
+
+def _segment(word: str, index: Dict[str, int], longest: int) -> List[int]:
+    parts, i = [], 0
+    while i < len(word):
+        for size in range(min(longest, len(word) - i), 0, -1):
+            if word[i:i + size] in index:
+                parts.append(index[word[i:i + size]])
+                i += size
+                break
+        else:
+            i += 1
+    return parts
+
+def segment(word: str, graphemes: Sequence[str]) -> List[int]:
+    """Greedy longest-match split of a word into grapheme indices, skipping unknown characters"""
+    index = {grapheme: i for i, grapheme in enumerate(graphemes)}
+    return _segment(word, index, max(len(grapheme) for grapheme in graphemes))
+
+def english_bigrams(words: Sequence[str], counts: np.ndarray,
+                    graphemes: Sequence[str] = GRAPHEMES) -> Tuple[np.ndarray, np.ndarray]:
+    """Word-count weighted grapheme bigram counts (with boundaries) and grapheme unigram counts"""
+    boundary = len(graphemes)
+    bigrams = np.zeros((boundary + 1, boundary + 1))
+    unigrams = np.zeros(boundary)
+    index = {grapheme: i for i, grapheme in enumerate(graphemes)}
+    longest = max(len(grapheme) for grapheme in graphemes)
+    for word, count in zip(words, counts):
+        parts = _segment(str(word), index, longest)
+        if not parts:
+            continue
+        sequence = [boundary] + parts + [boundary]
+        np.add.at(bigrams, (sequence[:-1], sequence[1:]), count)
+        np.add.at(unigrams, parts, count)
+    return bigrams, unigrams
+
+def letter_bigrams(corpus: Corpus) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Occurrence-weighted letter bigram counts within words, with the word
+    boundary as an extra last index, restricted to the letters that occur.
+    Returns (letter positions in the corpus, counts).
+    """
+    word_counts = corpus.word_counts().astype(np.float64)
+    lengths = corpus.word_lengths()
+    letters = corpus.word_letters.astype(np.int64)
+    owner = np.repeat(np.arange(corpus.n_words), lengths)
+    weights = word_counts[owner]
+    used = np.flatnonzero(np.bincount(letters, weights=weights, minlength=corpus.n_letters) > 0)
+    compact = np.full(corpus.n_letters, -1, dtype=np.int64)
+    compact[used] = np.arange(len(used))
+    boundary = len(used)
+    letters = compact[letters]
+
+    inner = np.flatnonzero(owner[:-1] == owner[1:])
+    starts = corpus.word_offsets[:-1].astype(np.int64)[lengths > 0]
+    ends = corpus.word_offsets[1:].astype(np.int64)[lengths > 0] - 1
+    previous = np.concatenate([letters[inner], np.full(len(starts), boundary), letters[ends]])
+    following = np.concatenate([letters[inner + 1], letters[starts], np.full(len(ends), boundary)])
+    pair_weights = np.concatenate([weights[inner], weights[starts], weights[ends]])
+    keep = pair_weights > 0
+    size = boundary + 1
+    counts = np.bincount(previous[keep] * size + following[keep], weights=pair_weights[keep],
+                         minlength=size * size).reshape(size, size)
+    return used, counts
+
+def build_model(corpus: Corpus, english_words: Sequence[str], english_counts: np.ndarray,
+                graphemes: Sequence[str] = GRAPHEMES, smoothing: float = SMOOTHING) -> CipherModel:
+    used, counts = letter_bigrams(corpus)
+    bigrams, unigrams = english_bigrams(english_words, english_counts, graphemes)
+    bigrams += smoothing
+    bigrams[-1, -1] = 0.0  # no empty words
+    with np.errstate(divide="ignore"):
+        log_probs = np.log(bigrams / bigrams.sum(axis=1, keepdims=True))
+    log_probs[-1, -1] = 0.0  # never counted on the glyph side either
+    return CipherModel(
+        letter_ids=[str(corpus.letter_ids[i]) for i in used],
+        graphemes=list(graphemes),
+        counts=counts,
+        log_probs=log_probs,
+        unigrams=unigrams,
+    )
+
+def _xlogx(x: np.ndarray) -> np.ndarray:
+    x = np.maximum(x, 0.0)
+    return x * np.log(np.where(x > 0, x, 1.0))
+
+def _log_likelihood(counts: np.ndarray, log_probs: np.ndarray, full: np.ndarray) -> float:
+    """
+    Bigram log-likelihood of the decoded corpus plus the homophone term
+    sum(n_l * log(n_l / N_g)): letters sharing a grapheme must also explain
+    how the grapheme is split between them, so merging letters is not free.
+    """
+    occurrences = counts[:-1].sum(axis=1)
+    totals = np.bincount(full[:-1], weights=occurrences, minlength=log_probs.shape[0])
+    homophones = _xlogx(occurrences).sum() - _xlogx(totals).sum()
+    return float((counts * log_probs[np.ix_(full, full)]).sum() + homophones)
+
+def score(model: CipherModel, mapping: np.ndarray) -> float:
+    """Log-likelihood per bigram of the corpus under mapping (grapheme index per letter)"""
+    counts = model.counts / max(model.counts.sum(), 1.0)
+    return _log_likelihood(counts, model.log_probs, np.append(mapping, len(model.graphemes)))
+
+def frequency_mapping(model: CipherModel) -> np.ndarray:
+    """Initial guess: the n-th most frequent letter reads as the n-th most frequent grapheme"""
+    letter_frequency = model.counts[:-1].sum(axis=1)
+    grapheme_order = np.argsort(-model.unigrams, kind="stable")
+    mapping = np.empty(len(letter_frequency), dtype=np.int64)
+    ranks = np.argsort(-letter_frequency, kind="stable")
+    mapping[ranks] = grapheme_order[np.arange(len(ranks)) % len(grapheme_order)]
+    return mapping
+
+def anneal(counts: np.ndarray, log_probs: np.ndarray, mapping: np.ndarray, steps: int,
+           temperatures: Tuple[float, float], seed) -> Tuple[np.ndarray, float, np.ndarray, float]:
+    """
+    One epoch of heat-bath annealing: each step picks a letter and redraws
+    its grapheme from all graphemes at once, weighted by exp(score change / T),
+    with T falling geometrically over the epoch. Scores are per bigram.
+    Returns (final mapping, final score, best mapping, best score).
+    """
+    rng = np.random.default_rng(seed)
+    n_letters, n_graphemes = len(mapping), log_probs.shape[0] - 1
+    counts = counts / max(counts.sum(), 1.0)
+    self_counts = np.diag(counts).copy()
+    off_diagonal = counts - np.diag(self_counts)
+    diagonal = np.diag(log_probs)[:n_graphemes]
+    following = log_probs[:n_graphemes]  # previous grapheme candidate -> everything
+    preceding = log_probs[:, :n_graphemes].T  # everything -> next grapheme candidate
+
+    occurrences = counts[:-1].sum(axis=1)
+
+    full = np.append(mapping, n_graphemes)
+    current = _log_likelihood(counts, log_probs, full)
+    totals = np.bincount(full[:-1], weights=occurrences, minlength=n_graphemes)
+    best, best_mapping = current, full[:-1].copy()
+    letters = rng.integers(n_letters, size=steps)
+    draws = rng.random(steps)
+    schedule = np.geomspace(temperatures[0], temperatures[1], steps) if steps else []
+    for letter, draw, temperature in zip(letters, draws, schedule):
+        # this letter's bigrams with every other letter, pooled by their graphemes
+        after = np.bincount(full, weights=off_diagonal[letter], minlength=n_graphemes + 1)
+        before = np.bincount(full, weights=off_diagonal[:, letter], minlength=n_graphemes + 1)
+        values = following @ after + preceding @ before + self_counts[letter] * diagonal
+        # homophone term: the letter's occurrences join the new grapheme's total
+        others = totals.copy()
+        others[full[letter]] -= occurrences[letter]
+        values -= _xlogx(others + occurrences[letter]) - _xlogx(others)
+        delta = values - values[full[letter]]
+        weights = np.exp((delta - delta.max()) / temperature)
+        cumulative = np.cumsum(weights)
+        choice = min(int(np.searchsorted(cumulative, draw * cumulative[-1], side="right")), n_graphemes - 1)
+        totals[full[letter]] -= occurrences[letter]
+        totals[choice] += occurrences[letter]
+        full[letter] = choice
+        current += delta[choice]
+        if current > best:
+            best, best_mapping = current, full[:-1].copy()
+    return full[:-1].copy(), current, best_mapping, best
+
+_worker_model: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+def _init_worker(counts: np.ndarray, log_probs: np.ndarray):
+    global _worker_model
+    _worker_model = (counts, log_probs)
+
+def _worker_anneal(args):
+    return anneal(*_worker_model, *args)
+
+def solve(model: CipherModel, chains: int = 4, epochs: int = 30, steps: int = 20000,
+          temperatures: Tuple[float, float] = (1e-3, 1e-5), seed: Optional[int] = None,
+          workers: Optional[int] = None,
+          on_epoch: Optional[Callable[[int, CipherResult], None]] = None) -> CipherResult:
+    """
+    Run independent annealing chains for a number of epochs, each epoch
+    cooling from temperatures[0] towards temperatures[1] (the whole range is
+    spread over the epochs). The first chain starts from the frequency
+    mapping, the others at random. After each epoch the worst chain restarts
+    from the best mapping found so far, and on_epoch(epoch, best) is called.
+    """
+    n_letters, n_graphemes = len(model.letter_ids), len(model.graphemes)
+    seeds = np.random.SeedSequence(seed)
+    rng = np.random.default_rng(seeds.spawn(1)[0])
+    states = [frequency_mapping(model)] + [rng.integers(n_graphemes, size=n_letters) for _ in range(chains - 1)]
+    epoch_temperatures = np.geomspace(temperatures[0], temperatures[1], epochs + 1)
+    best_mapping, best_score = states[0], score(model, states[0])
+    history = []
+
+    workers = min(workers or os.cpu_count() or 1, chains)
+    executor = None
+    if workers > 1 and n_letters:
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=pool_context(),
+                                       initializer=_init_worker, initargs=(model.counts, model.log_probs))
+    try:
+        for epoch in range(epochs):
+            schedule = (epoch_temperatures[epoch], epoch_temperatures[epoch + 1])
+            jobs = [(state, steps if n_letters else 0, schedule, chain_seed)
+                    for state, chain_seed in zip(states, seeds.spawn(chains))]
+            results = None
+            if executor is not None:
+                try:
+                    results = list(executor.map(_worker_anneal, jobs))
+                except (BrokenProcessPool, OSError):
+                    # carry on in process rather than lose the run
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    executor = None
+            if results is None:
+                results = [anneal(model.counts, model.log_probs, *job) for job in jobs]
+            states = [result[0] for result in results]
+            finals = [result[1] for result in results]
+            for _, _, chain_mapping, chain_best in results:
+                if chain_best > best_score:
+                    best_mapping, best_score = chain_mapping, chain_best
+            # share the best state: the worst chain continues from it
+            if chains > 1:
+                states[int(np.argmin(finals))] = best_mapping.copy()
+            history.append(best_score)
+            if on_epoch is not None:
+                on_epoch(epoch, _result(model, best_mapping, best_score, history))
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    return _result(model, best_mapping, score(model, best_mapping), history)
+
+def _result(model: CipherModel, mapping: np.ndarray, best_score: float, history: List[float]) -> CipherResult:
+    return CipherResult(
+        mapping={letter_id: model.graphemes[g] for letter_id, g in zip(model.letter_ids, mapping)},
+        score=float(best_score),
+        history=list(history),
+    )
+
+def decode_word(letter_ids: Sequence[str], mapping: Dict[str, str]) -> str:
+    """Spell a word with a mapping, marking unmapped letters with '?'"""
+    return "".join(mapping.get(letter_id, "?") for letter_id in letter_ids)
+
+def model_from_repository(english_sample_path: Path = Path("english_sample.txt"),
+                          graphemes: Sequence[str] = GRAPHEMES) -> CipherModel:
+    from components.corpus import build_corpus, load_current_corpus
+    from components.english_corpus import english_word_counts
+    from components.repository import load_letters, load_words, load_sentences
+    corpus = load_current_corpus() or build_corpus(load_letters(), load_words(), load_sentences())
+    english_words, english_counts = english_word_counts(Path(english_sample_path))
+    return build_model(corpus, english_words, english_counts, graphemes)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Letter-level cipher solver")
+    parser.add_argument("command", choices=["solve"])
+    parser.add_argument("--english", type=Path, default=Path("english_sample.txt"))
+    parser.add_argument("--graphemes", help="comma-separated grapheme inventory (default a-z)")
+    parser.add_argument("--chains", type=int, default=4)
+    parser.add_argument("--epochs", type=int, default=30)
+    parser.add_argument("--steps", type=int, default=20000, help="steps per chain and epoch")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    if args.command == "solve":
+        graphemes = tuple(args.graphemes.split(",")) if args.graphemes else GRAPHEMES
+        model = model_from_repository(args.english, graphemes)
+        result = solve(model, chains=args.chains, epochs=args.epochs, steps=args.steps, seed=args.seed,
+                       on_epoch=lambda epoch, best: print(f"epoch {epoch + 1}: best score {best.score:.4f}"))
+        for letter_id, grapheme in sorted(result.mapping.items(), key=lambda item: item[0]):
+            print(f"{letter_id}: {grapheme}")
+        from components.frequencies import frequency_store
+        from components.repository import load_words
+        words = load_words()
+        print("Most frequent words:")
+        for word_id, count in sorted(frequency_store.word_counts().items(), key=lambda item: -item[1])[:10]:
+            if word_id in words:
+                print(f"{word_id} ({count}x): {decode_word(words[word_id]['letter_ids'], result.mapping)}")
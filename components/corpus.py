@@ -0,0 +1,295 @@
+# components/corpus.py
+# Compact binary snapshot of the letter/word/sentence catalog for analytics.
+# Letters are a uint16 component-mask array, words are CSR arrays of letter
+# indices (offsets plus one flat uint32 array) and sentences are CSR arrays
+# of word indices, with a side table for their text and punctuation parts.
+# Every array is a plain .npy file under data/corpus/, so load_corpus
+# memory-maps the lot with no parse step, and worker processes share pages.
+# The manifest records the storage stamps of the tables it was exported
+# from; load_current_corpus only hands the export out while those still
+# match, which is how the frequency counters, the letter mask table and the
+# cipher solver skip parsing the tables after a fresh export.
+#
+# Export the current database with:
+#     python -m components.corpus export
+import argparse
+import json
+import os
+import shutil
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from render import SymbolGlyph
+
+CORPUS_DIR = Path("data/corpus")
+FORMAT_VERSION = 1
+
+ARRAYS = (
+    "letter_ids", "letter_masks", "letter_defined",
+    "word_ids", "word_offsets", "word_letters", "word_translations", "word_defined",
+    "sentence_ids", "sentence_offsets", "sentence_words",
+    "text_sentences", "text_positions", "text_types", "text_contents",
+)
+
+def _strings(values: Sequence[str]) -> np.ndarray:
+    """Fixed-width unicode array (memory-mappable, unlike object arrays)"""
+    width = max((len(value) for value in values), default=1) or 1
+    return np.array(values, dtype=f"<U{width}")
+
+def _csr(rows: Sequence[Sequence[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    offsets = np.zeros(len(rows) + 1, dtype=np.uint32)
+    offsets[1:] = np.cumsum([len(row) for row in rows], dtype=np.uint64)
+    flat = np.fromiter((index for row in rows for index in row), dtype=np.uint32, count=int(offsets[-1]))
+    return offsets, flat
+
+@dataclass
+class Corpus:
+    """Columnar view of the catalog; ids map to positions in the *_ids arrays"""
+    letter_ids: np.ndarray
+    letter_masks: np.ndarray
+    letter_defined: np.ndarray
+    word_ids: np.ndarray
+    word_offsets: np.ndarray
+    word_letters: np.ndarray
+    word_translations: np.ndarray
+    word_defined: np.ndarray
+    sentence_ids: np.ndarray
+    sentence_offsets: np.ndarray
+    sentence_words: np.ndarray
+    text_sentences: np.ndarray
+    text_positions: np.ndarray
+    text_types: np.ndarray
+    text_contents: np.ndarray
+
+    @property
+    def n_letters(self) -> int:
+        return len(self.letter_ids)
+
+    @property
+    def n_words(self) -> int:
+        return len(self.word_ids)
+
+    @property
+    def n_sentences(self) -> int:
+        return len(self.sentence_ids)
+
+    def word_lengths(self) -> np.ndarray:
+        return np.diff(self.word_offsets.astype(np.int64))
+
+    def sentence_lengths(self) -> np.ndarray:
+        """Number of word components in each sentence"""
+        return np.diff(self.sentence_offsets.astype(np.int64))
+
+    def word_letter_indices(self, word_index: int) -> np.ndarray:
+        return self.word_letters[self.word_offsets[word_index]:self.word_offsets[word_index + 1]]
+
+    def sentence_word_indices(self, sentence_index: int) -> np.ndarray:
+        return self.sentence_words[self.sentence_offsets[sentence_index]:self.sentence_offsets[sentence_index + 1]]
+
+    def sentence_components(self, sentence_index: int) -> list:
+        """Rebuild a sentence's component list as stored in the database"""
+        words = [{"type": "word", "content": str(self.word_ids[i])}
+                 for i in self.sentence_word_indices(sentence_index)]
+        texts = np.flatnonzero(self.text_sentences == sentence_index)
+        components = []
+        for i in texts:
+            position = int(self.text_positions[i])
+            while len(components) < position:
+                components.append(words.pop(0))
+            components.append({"type": str(self.text_types[i]), "content": str(self.text_contents[i])})
+        return components + words
+
+    def counted_sentences(self) -> np.ndarray:
+        """Sentences with numeric ids; the others are likely test sentences"""
+        return np.char.isnumeric(self.sentence_ids)
+
+    def word_counts(self) -> np.ndarray:
+        """Occurrences of every word across the counted sentences"""
+        weights = np.repeat(self.counted_sentences(), self.sentence_lengths())
+        return np.bincount(self.sentence_words[weights], minlength=self.n_words)
+
+    def letter_counts(self, word_counts: Optional[np.ndarray] = None) -> np.ndarray:
+        """Occurrences of every letter, weighting each word by its count"""
+        if word_counts is None:
+            word_counts = self.word_counts()
+        weights = np.repeat(word_counts, self.word_lengths())
+        return np.bincount(self.word_letters, weights=weights, minlength=self.n_letters).astype(np.int64)
+
+    def freq_distribution(self):
+        """Same result as analytics.get_freq_distibution, computed over the arrays"""
+        word_counts = self.word_counts()
+        letter_counts = self.letter_counts(word_counts)
+        used_words = np.flatnonzero(word_counts)
+        used_words = used_words[np.argsort(self.word_ids[used_words], kind="stable")]
+        used_letters = np.flatnonzero(letter_counts)
+        used_letters = used_letters[np.argsort(self.letter_ids[used_letters], kind="stable")]
+        return (self.word_ids[used_words], word_counts[used_words],
+                self.letter_ids[used_letters], letter_counts[used_letters])
+
+    def letters_with_mask(self, mask: int) -> np.ndarray:
+        """Ids of defined letters with exactly this component mask"""
+        return self.letter_ids[(self.letter_masks == mask) & self.letter_defined]
+
+    def words_with_letters(self, letter_ids: Sequence[str]) -> np.ndarray:
+        """Ids of words spelled with exactly these letters, in order"""
+        index = {str(letter_id): i for i, letter_id in enumerate(self.letter_ids)}
+        if any(letter_id not in index for letter_id in letter_ids):
+            return self.word_ids[:0]
+        query = np.array([index[letter_id] for letter_id in letter_ids], dtype=np.uint32)
+        candidates = np.flatnonzero((self.word_lengths() == len(query)) & self.word_defined)
+        if len(query) and len(candidates):
+            starts = self.word_offsets[candidates].astype(np.int64)
+            spelled = self.word_letters[starts[:, None] + np.arange(len(query))]
+            candidates = candidates[(spelled == query).all(axis=1)]
+        return self.word_ids[candidates]
+
+def build_corpus(letters: Mapping, words: Mapping, sentences: Mapping) -> Corpus:
+    """Convert the id -> record tables to arrays"""
+    letter_ids = list(letters)
+    word_ids = list(words)
+    letter_index = {letter_id: i for i, letter_id in enumerate(letter_ids)}
+    word_index = {word_id: i for i, word_id in enumerate(word_ids)}
+
+    def index_of(index: Dict[str, int], ids: list, key: str) -> int:
+        # references to missing records are kept, flagged as undefined
+        if key not in index:
+            index[key] = len(ids)
+            ids.append(key)
+        return index[key]
+
+    sentence_rows, text_sentences, text_positions, text_types, text_contents = [], [], [], [], []
+    for s, sentence_data in enumerate(sentences.values()):
+        row = []
+        for position, item in enumerate(sentence_data["components"]):
+            if item["type"] == "word":
+                row.append(index_of(word_index, word_ids, item["content"]))
+            else:
+                text_sentences.append(s)
+                text_positions.append(position)
+                text_types.append(item["type"])
+                text_contents.append(item["content"])
+        sentence_rows.append(row)
+    word_rows = [
+        [index_of(letter_index, letter_ids, letter_id)
+         for letter_id in (words[word_id]["letter_ids"] if word_id in words else [])]
+        for word_id in word_ids
+    ]
+    letter_masks = np.array(
+        [SymbolGlyph.from_components(letters[letter_id]["components"]).mask if letter_id in letters else 0
+         for letter_id in letter_ids],
+        dtype=np.uint16,
+    )
+    word_offsets, word_letters = _csr(word_rows)
+    sentence_offsets, sentence_words = _csr(sentence_rows)
+    return Corpus(
+        letter_ids=_strings(letter_ids),
+        letter_masks=letter_masks,
+        letter_defined=np.arange(len(letter_ids)) < len(letters),
+        word_ids=_strings(word_ids),
+        word_offsets=word_offsets,
+        word_letters=word_letters,
+        word_translations=_strings([words[word_id].get("translation") or "" if word_id in words else ""
+                                    for word_id in word_ids]),
+        word_defined=np.arange(len(word_ids)) < len(words),
+        sentence_ids=_strings(list(sentences)),
+        sentence_offsets=sentence_offsets,
+        sentence_words=sentence_words,
+        text_sentences=np.array(text_sentences, dtype=np.uint32),
+        text_positions=np.array(text_positions, dtype=np.uint32),
+        text_types=_strings(text_types),
+        text_contents=_strings(text_contents),
+    )
+
+def export_corpus(corpus: Corpus, path: Path = CORPUS_DIR, sources: Optional[dict] = None) -> Path:
+    """
+    Write every array as .npy plus a small manifest, swapping the directory in atomically.
+    sources are the storage stamps of the tables the corpus was built from.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    tmp_path.mkdir()
+    for name in ARRAYS:
+        np.save(tmp_path / f"{name}.npy", getattr(corpus, name))
+    manifest = {
+        "version": FORMAT_VERSION,
+        "letters": corpus.n_letters,
+        "words": corpus.n_words,
+        "sentences": corpus.n_sentences,
+        "sources": sources,
+    }
+    with open(tmp_path / "manifest.json", "w") as f:
+        json.dump(manifest, f, indent=2)
+    old_path = path.with_name(f"{path.name}.{os.getpid()}.old")
+    if path.exists():
+        os.replace(path, old_path)
+    os.replace(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+    return path
+
+def load_corpus(path: Path = CORPUS_DIR) -> Optional[Corpus]:
+    """Memory-map an exported corpus read-only, or None if there is none"""
+    path = Path(path)
+    try:
+        with open(path / "manifest.json", "r") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    if manifest.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported corpus format {manifest.get('version')} in {path}")
+    return Corpus(**{name: np.load(path / f"{name}.npy", mmap_mode="r") for name in ARRAYS})
+
+def _table_sources() -> dict:
+    from components.repository import TABLES, table_stamp
+    # round-tripped through JSON so it compares equal to the stored copy
+    return json.loads(json.dumps({name: table_stamp(name) for name in TABLES}))
+
+def export_from_repository(path: Path = CORPUS_DIR) -> Path:
+    from components.repository import load_letters, load_words, load_sentences
+    # stamped before reading, so a save landing meanwhile makes the export stale, not wrong
+    sources = _table_sources()
+    return export_corpus(build_corpus(load_letters(), load_words(), load_sentences()), path, sources)
+
+_current = {"key": None, "sources": None, "corpus": None}
+_current_lock = threading.Lock()
+
+def load_current_corpus(tables: Sequence[str] = ("letters", "words", "sentences"),
+                        path: Path = CORPUS_DIR) -> Optional[Corpus]:
+    """
+    The exported corpus if the given tables are unchanged since the export,
+    else None (then read the tables instead). The mapping is reused until
+    the export is replaced.
+    """
+    path = Path(path)
+    try:
+        stat = (path / "manifest.json").stat()
+    except FileNotFoundError:
+        return None
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    with _current_lock:
+        if _current["key"] != key:
+            with open(path / "manifest.json", "r") as f:
+                sources = json.load(f).get("sources")
+            _current.update(key=key, sources=sources, corpus=load_corpus(path) if sources else None)
+        sources, corpus = _current["sources"], _current["corpus"]
+    if corpus is None:
+        return None
+    current = _table_sources()
+    if any(sources.get(name) != current[name] for name in tables):
+        return None
+    return corpus
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Binary corpus export")
+    parser.add_argument("command", choices=["export"])
+    parser.add_argument("--path", type=Path, default=CORPUS_DIR)
+    args = parser.parse_args()
+    if args.command == "export":
+        corpus = load_corpus(export_from_repository(args.path))
+        print(f"Exported {corpus.n_letters} letters, {corpus.n_words} words "
+              f"and {corpus.n_sentences} sentences to {args.path}")
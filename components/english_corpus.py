@@ -0,0 +1,146 @@
+# components/english_corpus.py
+# Streaming word counter for the English reference corpus. Tokenization
+# matches the original loader: split on whitespace, lowercase, and drop
+# every token that contains punctuation. The file is read in chunks (the
+# token cut by a chunk boundary is carried over), large files are split into
+# byte ranges counted on a process pool, and the result is cached on disk
+# under the corpus' content hash, so a given corpus is only ever parsed once.
+import codecs
+import hashlib
+import json
+import os
+import re
+import string
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from components.parallel import pool_context
+CACHE_DIR = Path("data/english_freq")
+CHUNK_SIZE = 16 << 20
+PARALLEL_THRESHOLD = 64 << 20  # smaller corpora are counted in process
+# str.split() treats these as whitespace; an ASCII byte never occurs inside a
+# multi-byte UTF-8 character, so cutting right after one never splits a token
+_ASCII_WHITESPACE = frozenset(b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f")
+_PUNCTUATION = re.compile(f"[{re.escape(string.punctuation)}]")
+
+_memory: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+_lock = threading.Lock()
+
+def _count_range(path: str, start: int, end: int, chunk_size: int = CHUNK_SIZE) -> Counter:
+    """Count the lowercased tokens in a byte range that starts and ends on a token boundary"""
+    counts = Counter()
+    carry = ""
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        while remaining > 0:
+            data = f.read(min(chunk_size, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            text = carry + decoder.decode(data, final=remaining <= 0)
+            tokens = text.lower().split()
+            # the last token may continue in the next chunk
+            carry = tokens.pop() if tokens and not text[-1].isspace() else ""
+            counts.update(tokens)
+    if carry:
+        counts[carry.lower()] += 1
+    return counts
+
+def _split_points(path: Path, size: int, parts: int) -> List[int]:
+    """Byte offsets that cut the file into about `parts` ranges on whitespace"""
+    points = [0]
+    with open(path, "rb") as f:
+        for i in range(1, parts):
+            offset = max(size * i // parts, points[-1])
+            f.seek(offset)
+            while True:
+                block = f.read(1 << 16)
+                if not block:
+                    offset = size
+                    break
+                cut = next((j for j, byte in enumerate(block) if byte in _ASCII_WHITESPACE), None)
+                if cut is not None:
+                    offset += cut + 1
+                    break
+                offset += len(block)
+            if offset < size:
+                points.append(offset)
+    return points + [size]
+
+def count_tokens(path: Path, parallel: Optional[bool] = None, workers: Optional[int] = None) -> Counter:
+    """Token counts of a corpus, before punctuation filtering"""
+    path = Path(path)
+    size = path.stat().st_size
+    if parallel is None:
+        parallel = size >= PARALLEL_THRESHOLD
+    workers = workers or os.cpu_count() or 1
+    if not parallel or workers < 2:
+        return _count_range(str(path), 0, size)
+    points = _split_points(path, size, workers * 4)
+    counts = Counter()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=pool_context()) as executor:
+        futures = [executor.submit(_count_range, str(path), start, end)
+                   for start, end in zip(points, points[1:])]
+        for future in futures:
+            counts.update(future.result())
+    return counts
+
+def corpus_hash(path: Path) -> str:
+    """Content hash of a corpus, remembered per (size, mtime) so unchanged files aren't re-read"""
+    path = Path(path)
+    stat = path.stat()
+    index_path = CACHE_DIR / "index.json"
+    try:
+        with open(index_path, "r") as f:
+            index = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        index = {}
+    key = str(path.resolve())
+    entry = index.get(key)
+    if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+        return entry["sha256"]
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(block)
+    index[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest.hexdigest()}
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = index_path.with_name(f"index.{os.getpid()}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp_path, index_path)
+    return index[key]["sha256"]
+
+def english_word_counts(path: Path = Path("english_sample.txt"),
+                        parallel: Optional[bool] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Distinct words of the corpus in sorted order and their counts,
+    the same arrays as np.unique(words, return_counts=True) over the old word list.
+    """
+    digest = corpus_hash(path)
+    with _lock:
+        if digest in _memory:
+            return _memory[digest]
+    cache_path = CACHE_DIR / f"{digest}.npz"
+    if cache_path.exists():
+        with np.load(cache_path) as cached:
+            result = (cached["words"], cached["counts"])
+    else:
+        counts = count_tokens(path, parallel)
+        # the punctuation filter only has to look at each distinct token once
+        words = sorted(word for word in counts if not _PUNCTUATION.search(word))
+        result = (np.array(words, dtype=str), np.array([counts[word] for word in words], dtype=np.int64))
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f"{digest}.{os.getpid()}.tmp.npz")
+        np.savez(tmp_path, words=result[0], counts=result[1])
+        os.replace(tmp_path, cache_path)
+    with _lock:
+        _memory[digest] = result
+    return result
@@ -0,0 +1,198 @@
+# components/frequencies.py
+# Persistent word and letter occurrence counters (data/frequencies.json).
+# Counts follow get_freq_distibution: words are counted across sentences
+# with numeric ids, letters across the words of those sentences. Instead of
+# rescanning the corpus on every rerun, saves to the sentences and words
+# tables apply deltas to the counters. If the tables changed in a way the
+# counters did not see (another tool, a whole-table write), they are rebuilt.
+#
+# Rebuild them explicitly with:
+#     python -m components.frequencies rebuild
+import argparse
+import json
+import os
+import threading
+from collections import Counter
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from components.corpus import Corpus, load_current_corpus
+from components.file_lock import file_lock
+from components.repository import add_save_listener, load_table, table_generation, table_stamp
+
+FREQUENCY_PATH = Path("data/frequencies.json")
+SOURCE_TABLES = ("words", "sentences")
+
+def is_counted_sentence(sentence_id: str) -> bool:
+    """Whether a sentence counts towards frequencies; non-numeric ids are likely test sentences"""
+    return isinstance(sentence_id, str) and sentence_id.isnumeric()
+
+def sentence_words(sentence: Optional[dict]) -> List[str]:
+    """Word ids of a sentence, in order (none for a missing sentence)"""
+    if not sentence:
+        return []
+    return [item["content"] for item in sentence["components"] if item["type"] == "word"]
+
+def _generations() -> Dict[str, int]:
+    return {name: table_generation(name) for name in SOURCE_TABLES}
+
+def _sources():
+    # round-tripped through JSON so it compares equal to the stored copy
+    return json.loads(json.dumps({name: table_stamp(name) for name in SOURCE_TABLES}))
+
+def corpus_counts(corpus: Corpus) -> Tuple[Counter, Counter]:
+    """Word and letter occurrence counters of a binary corpus, as FrequencyStore counts them"""
+    word_counts = corpus.word_counts()
+    letter_counts = corpus.letter_counts(word_counts)
+    words = Counter({str(corpus.word_ids[i]): int(word_counts[i]) for i in np.flatnonzero(word_counts)})
+    letters = Counter({str(corpus.letter_ids[i]): int(letter_counts[i]) for i in np.flatnonzero(letter_counts)})
+    return words, letters
+
+class FrequencyStore:
+    def __init__(self, path: Path = FREQUENCY_PATH):
+        self.path = Path(path)
+        self.words = Counter()
+        self.letters = Counter()
+        self.sources = None
+        self.version = 0
+        self._generations = None  # table generations the counters were last synced with
+        self._file_stamp = None
+        self._lock = threading.RLock()
+        add_save_listener("sentences", self._on_sentence_saved)
+        add_save_listener("words", self._on_word_saved)
+
+    def _lock_path(self) -> Path:
+        return self.path.with_name(self.path.name + ".lock")
+
+    def _stat(self):
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _read(self):
+        """Pick up the file if another process rewrote it"""
+        stamp = self._stat()
+        if stamp is None or stamp == self._file_stamp:
+            return
+        with open(self.path, "r") as f:
+            stored = json.load(f)
+        self.words = Counter(stored["words"])
+        self.letters = Counter(stored["letters"])
+        self.sources = stored["sources"]
+        self._file_stamp = stamp
+        self.version += 1
+
+    def _write(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"sources": self.sources, "words": self.words, "letters": self.letters}, f)
+        os.replace(tmp_path, self.path)
+        self._file_stamp = self._stat()
+        self.version += 1
+
+    def rebuild(self):
+        """Recount everything from the current tables"""
+        with self._lock, file_lock(self._lock_path()):
+            self._rebuild()
+
+    def _rebuild(self):
+        self.sources = _sources()
+        self._generations = _generations()
+        corpus = load_current_corpus(SOURCE_TABLES)
+        if corpus is not None:
+            # a fresh binary export counts without parsing the tables
+            self.words, self.letters = corpus_counts(corpus)
+            self._write()
+            return
+        words_db, sentences_db = load_table("words"), load_table("sentences")
+        self.words = Counter()
+        for sentence_id, sentence in sentences_db.items():
+            if is_counted_sentence(sentence_id):
+                self.words.update(sentence_words(sentence))
+        self.letters = Counter()
+        for word_id, count in self.words.items():
+            for letter_id in words_db.get(word_id, {}).get("letter_ids", []):
+                self.letters[letter_id] += count
+        self._write()
+
+    def _current(self):
+        with self._lock:
+            self._read()
+            if self.sources != _sources():
+                with file_lock(self._lock_path()):
+                    self._read()
+                    if self.sources != _sources():
+                        self._rebuild()
+            self._generations = _generations()
+
+    def _apply(self, table: str, generation: int, update):
+        """Apply the delta of the save that took a table to `generation` and persist the counters, under the file lock"""
+        with self._lock, file_lock(self._lock_path()):
+            self._read()
+            if self.sources is not None and self._generations is not None and generation <= self._generations[table]:
+                return  # a recount already saw this save
+            if self.sources is None or self._generations is None or generation != self._generations[table] + 1:
+                # the table also changed in ways this save's delta doesn't cover
+                self._rebuild()
+                return
+            # fresh counters, so mappings handed out earlier stay consistent snapshots
+            self.words, self.letters = Counter(self.words), Counter(self.letters)
+            update()
+            # drop zero counts so the file doesn't accumulate dead entries
+            self.words = +self.words
+            self.letters = +self.letters
+            self.sources = _sources()
+            self._generations[table] = generation
+            self._write()
+
+    def _add_words(self, word_deltas: Counter):
+        words_db = load_table("words")
+        for word_id, delta in word_deltas.items():
+            self.words[word_id] += delta
+            for letter_id in words_db.get(word_id, {}).get("letter_ids", []):
+                self.letters[letter_id] += delta
+
+    def _on_sentence_saved(self, sentence_id: str, old_sentence: Optional[dict], new_sentence: dict,
+                           generation: int):
+        if not is_counted_sentence(sentence_id):
+            self._apply("sentences", generation, lambda: None)  # only the sources moved
+            return
+        deltas = Counter(sentence_words(new_sentence))
+        deltas.subtract(sentence_words(old_sentence))
+        self._apply("sentences", generation, lambda: self._add_words(deltas))
+
+    def _on_word_saved(self, word_id: str, old_word: Optional[dict], new_word: dict, generation: int):
+        def update():
+            count = self.words.get(word_id, 0)
+            for letter_id in (old_word or {}).get("letter_ids", []):
+                self.letters[letter_id] -= count
+            for letter_id in new_word.get("letter_ids", []):
+                self.letters[letter_id] += count
+        self._apply("words", generation, update)
+
+    def word_counts(self) -> Mapping[str, int]:
+        """Read-only word id -> occurrence count"""
+        self._current()
+        return MappingProxyType(self.words)
+
+    def letter_counts(self) -> Mapping[str, int]:
+        """Read-only letter id -> occurrence count"""
+        self._current()
+        return MappingProxyType(self.letters)
+
+frequency_store = FrequencyStore()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Word and letter frequency counters")
+    parser.add_argument("command", choices=["rebuild"])
+    args = parser.parse_args()
+    if args.command == "rebuild":
+        frequency_store.rebuild()
+        print(f"Counted {sum(frequency_store.words.values())} word and "
+              f"{sum(frequency_store.letters.values())} letter occurrences")
@@ -1,20 +1,82 @@
-from typing import List
-from render import SymbolGlyph, SymbolChain
+from typing import Dict, Iterable, List, Optional, Tuple
+from render import SymbolGlyph, SymbolChain, N_COMPONENTS
 import string
+import threading
 
 import numpy as np
 
+from components.corpus import load_current_corpus
+from components.repository import load_table, table_generation
+from components.table_index import TableIndex
+
+# number of set bits of every possible glyph mask
+POPCOUNT = np.array([bin(mask).count("1") for mask in range(1 << N_COMPONENTS)], dtype=np.uint8)
+
 def get_active_components_set(glyph: SymbolGlyph):
     """Convert glyph's active components to a frozenset for comparison"""
-    return frozenset(comp for comp, is_active in glyph.active_components.items() if is_active)
+    return frozenset(glyph.components())
 
-def find_duplicate_letter(glyph: SymbolGlyph, letters_db: dict):
+class _DuplicateIndex(TableIndex):
+    """
+    Hash index from a record's identity key to the ids sharing it, for one
+    repository table, so lookups stay constant-time as the catalog grows.
+    """
+
+    def __init__(self, table: str, key):
+        self.key = key
+        self.ids_by_key: Dict[object, List[str]] = {}
+        self.key_by_id: Dict[str, object] = {}
+        super().__init__([table])
+
+    def _rebuild(self):
+        self.ids_by_key, self.key_by_id = {}, {}
+        for record_id, record in load_table(self.tables[0]).items():
+            self._add(record_id, self.key(record))
+
+    def _add(self, record_id: str, key):
+        self.ids_by_key.setdefault(key, []).append(record_id)
+        self.key_by_id[record_id] = key
+
+    def _remove(self, record_id: str):
+        key = self.key_by_id.pop(record_id, None)
+        ids = self.ids_by_key.get(key)
+        if ids is not None:
+            ids.remove(record_id)
+            if not ids:
+                del self.ids_by_key[key]
+
+    def _apply(self, table: str, record_id: str, old_record: Optional[dict], new_record: dict):
+        self._remove(record_id)
+        self._add(record_id, self.key(new_record))
+
+    def lookup(self, key) -> Optional[str]:
+        """First id (in save order) of a record with this key, if any"""
+        with self._lock:
+            self._current()
+            ids = self.ids_by_key.get(key)
+            return ids[0] if ids else None
+
+def letter_key(components: Iterable[str]) -> int:
+    """Identity of a letter: its component bitmask"""
+    return SymbolGlyph.from_components(components).mask
+
+def word_key(letter_ids: Iterable[str]) -> Tuple[str, ...]:
+    """Identity of a word: its letter ids, in order"""
+    return tuple(letter_ids)
+
+letter_index = _DuplicateIndex("letters", lambda record: letter_key(record["components"]))
+word_index = _DuplicateIndex("words", lambda record: word_key(record["letter_ids"]))
+
+def find_duplicate_letter(glyph: SymbolGlyph, letters_db: Optional[dict] = None):
     """
     Check if a letter with the same component configuration already exists.
     Returns the letter ID if found, None otherwise.
+    Without letters_db, the saved letters are looked up through the index.
     """
+    if letters_db is None:
+        return letter_index.lookup(glyph.mask)
     current_components = get_active_components_set(glyph)
-    
+
     for letter_id, letter_data in letters_db.items():
         # Convert stored components to a set
         stored_components = frozenset(letter_data["components"])
@@ -22,11 +84,76 @@ def find_duplicate_letter(glyph: SymbolGlyph, letters_db: dict):
             return letter_id
     return None
 
-def find_duplicate_word(current_letters: List[str], words_db: dict):
+def find_duplicate_word(current_letters: List[str], words_db: Optional[dict] = None):
     """
     order matters
+    Without words_db, the saved words are looked up through the index.
     """
+    if words_db is None:
+        return word_index.lookup(word_key(current_letters))
     for word_id, word_data in words_db.items():
         if current_letters == word_data["letter_ids"]:
             return word_id
     return None
+
+_mask_table = {"generation": None, "ids": np.array([], dtype=str), "masks": np.array([], dtype=np.uint16)}
+_mask_table_lock = threading.Lock()
+
+def letter_mask_table() -> Tuple[np.ndarray, np.ndarray]:
+    """Saved letter ids and their component masks as parallel arrays, in save order"""
+    generation = table_generation("letters")
+    with _mask_table_lock:
+        if _mask_table["generation"] != generation:
+            corpus = load_current_corpus(["letters"])
+            if corpus is not None:
+                # a fresh binary export already holds the masks, in save order
+                defined = np.asarray(corpus.letter_defined)
+                _mask_table["ids"] = np.array(corpus.letter_ids[defined], dtype=str)
+                _mask_table["masks"] = np.array(corpus.letter_masks[defined], dtype=np.uint16)
+            else:
+                letters = load_table("letters")
+                _mask_table["ids"] = np.array(list(letters), dtype=str)
+                _mask_table["masks"] = np.fromiter(
+                    (letter_key(letter["components"]) for letter in letters.values()),
+                    dtype=np.uint16, count=len(letters),
+                )
+            _mask_table["generation"] = generation
+        return _mask_table["ids"], _mask_table["masks"]
+
+def hamming_distances(mask: int, masks: np.ndarray) -> np.ndarray:
+    """Number of component flips between one mask and each of an array of masks"""
+    return POPCOUNT[np.bitwise_xor(masks, np.uint16(mask))]
+
+def find_similar_letters(glyph: SymbolGlyph, max_distance: int = 2,
+                         include_exact: bool = False) -> List[Tuple[str, int]]:
+    """
+    Saved letters within max_distance component flips of the glyph,
+    as (letter id, distance) pairs, closest first.
+    """
+    ids, masks = letter_mask_table()
+    distances = hamming_distances(glyph.mask, masks)
+    close = np.flatnonzero((distances <= max_distance) & (include_exact | (distances > 0)))
+    close = close[np.argsort(distances[close], kind="stable")]
+    return [(str(ids[i]), int(distances[i])) for i in close]
+
+COMPONENT_QUERY_MODES = ("superset", "exact", "subset", "excluding")
+
+def component_filter(masks: np.ndarray, query: int, mode: str = "superset") -> np.ndarray:
+    """
+    Boolean selection of component masks against a query mask:
+    superset - has every queried component (and maybe more)
+    exact    - has exactly the queried components
+    subset   - has nothing but queried components
+    excluding - has none of the queried components
+    """
+    masks = np.asarray(masks, dtype=np.uint16)
+    query = np.uint16(query)
+    if mode == "superset":
+        return (masks & query) == query
+    if mode == "exact":
+        return masks == query
+    if mode == "subset":
+        return (masks & ~query) == 0
+    if mode == "excluding":
+        return (masks & query) == 0
+    raise ValueError(f"Unknown component query mode: {mode}")
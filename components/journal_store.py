@@ -0,0 +1,85 @@
+# components/journal_store.py
+# Append-only journal storage backend, selected with TUNIC_STORAGE=journal.
+# data/<table>.json stays the human-readable snapshot; every save appends
+# one JSON line to data/<table>.journal.jsonl, and loads replay the journal
+# over the snapshot. Once the journal is long enough it is folded into a
+# new snapshot, written to a temp file and swapped in with an atomic rename.
+import json
+import os
+from pathlib import Path
+from typing import Mapping, Tuple
+
+COMPACT_THRESHOLD = 256  # journal entries before compacting into the snapshot
+
+def journal_path(snapshot_path: Path) -> Path:
+    return snapshot_path.with_suffix(".journal.jsonl")
+
+def read_snapshot(snapshot_path: Path) -> dict:
+    if not snapshot_path.exists():
+        return {}
+    with open(snapshot_path, "r") as f:
+        return json.load(f)
+
+def replay(path: Path, data: dict, offset: int = 0) -> Tuple[int, int]:
+    """
+    Apply journal entries from a byte offset onto data, in place.
+    Returns (offset after the last complete line, number of entries applied);
+    an unterminated final line may still be in flight and is left for later.
+    """
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            chunk = f.read()
+    except FileNotFoundError:
+        return 0, 0
+    end = chunk.rfind(b"\n") + 1
+    applied = 0
+    for line in chunk[:end].splitlines():
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue  # torn line left behind by an interrupted append
+        data[record["id"]] = record
+        applied += 1
+    return offset + end, applied
+
+def append(path: Path, record: dict) -> Tuple[int, int]:
+    """Durably append one record to the journal, returning its (start, end) byte offsets"""
+    line = (json.dumps(record) + "\n").encode()
+    with open(path, "a+b") as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                # terminate a torn line from an interrupted append first
+                line = b"\n" + line
+        f.write(line)
+        f.flush()
+        os.fsync(f.fileno())
+        end = f.tell()
+    return end - len(line), end
+
+def _replace_atomically(path: Path, content: str):
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w") as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def write_snapshot(snapshot_path: Path, data: Mapping):
+    """Atomically replace the snapshot and empty the journal"""
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+    _replace_atomically(snapshot_path, json.dumps(dict(data), indent=2))
+    # a crash before this point just replays entries already in the new
+    # snapshot, which is harmless since replay is last-writer-wins per id
+    _replace_atomically(journal_path(snapshot_path), "")
+
+def compact(snapshot_path: Path) -> dict:
+    """Fold the journal into a fresh snapshot and return the merged table"""
+    data = read_snapshot(snapshot_path)
+    replay(journal_path(snapshot_path), data)
+    write_snapshot(snapshot_path, data)
+    return data
@@ -9,12 +9,14 @@ import time
 
 import numpy as np
 
-import io
-import base64
-from PIL import Image
 from st_clickable_images import clickable_images
 
-from components.analytics import get_freq_distibution
+from components.frequencies import frequency_store
+from components.identity import COMPONENT_QUERY_MODES, component_filter, find_duplicate_letter, find_similar_letters, letter_key
+from components.repository import allocate_id, initialize_table, load_letters, load_words, load_sentences, save_record, table_generation
+from components.thumbnails import letter_thumbnails, prefetch_letter_thumbnails
+from components.pagination import paginate, sorted_index
+from components.thumbnail_cache import thumbnail_cache
 import streamlit as st
 from render import SymbolGlyph, GlyphComponents
 from typing import Dict
@@ -86,45 +88,40 @@ def letter_creator_interface(subheader: str="Letter Components", show_preview: b
         }
     
     # Create glyph based on selections
-    glyph = SymbolGlyph()
-    
-    # Upper components
-    if upper_verticals:
-        glyph.activate_component(GlyphComponents.UPPER_LEFT_VERTICAL)
-    if upper_center:
-        glyph.activate_component(GlyphComponents.UPPER_CENTER_VERTICAL)
-        
-    # Lower components
-    if lower_verticals:
-        glyph.activate_component(GlyphComponents.LOWER_LEFT_VERTICAL)
-    if lower_center:
-        glyph.activate_component(GlyphComponents.LOWER_CENTER_VERTICAL)
-    if lower_circle:
-        glyph.activate_component(GlyphComponents.LOWER_CIRCLE)
-    
-    # Upper diamond
-    if upper_diamond["upper_left"]:
-        glyph.activate_component(GlyphComponents.UPPER_DIAMOND_UPPER_LEFT)
-    if upper_diamond["upper_right"]:
-        glyph.activate_component(GlyphComponents.UPPER_DIAMOND_UPPER_RIGHT)
-    if upper_diamond["lower_left"]:
-        glyph.activate_component(GlyphComponents.UPPER_DIAMOND_LOWER_LEFT)
-    if upper_diamond["lower_right"]:
-        glyph.activate_component(GlyphComponents.UPPER_DIAMOND_LOWER_RIGHT)
-    
-    # Lower diamond
-    if lower_diamond["upper_left"]:
-        glyph.activate_component(GlyphComponents.LOWER_DIAMOND_UPPER_LEFT)
-    if lower_diamond["upper_right"]:
-        glyph.activate_component(GlyphComponents.LOWER_DIAMOND_UPPER_RIGHT)
-    if lower_diamond["lower_left"]:
-        glyph.activate_component(GlyphComponents.LOWER_DIAMOND_LOWER_LEFT)
-    if lower_diamond["lower_right"]:
-        glyph.activate_component(GlyphComponents.LOWER_DIAMOND_LOWER_RIGHT)
+    selected = {
+        # Upper components
+        GlyphComponents.UPPER_LEFT_VERTICAL: upper_verticals,
+        GlyphComponents.UPPER_CENTER_VERTICAL: upper_center,
+        # Lower components
+        GlyphComponents.LOWER_LEFT_VERTICAL: lower_verticals,
+        GlyphComponents.LOWER_CENTER_VERTICAL: lower_center,
+        GlyphComponents.LOWER_CIRCLE: lower_circle,
+        # Upper diamond
+        GlyphComponents.UPPER_DIAMOND_UPPER_LEFT: upper_diamond["upper_left"],
+        GlyphComponents.UPPER_DIAMOND_UPPER_RIGHT: upper_diamond["upper_right"],
+        GlyphComponents.UPPER_DIAMOND_LOWER_LEFT: upper_diamond["lower_left"],
+        GlyphComponents.UPPER_DIAMOND_LOWER_RIGHT: upper_diamond["lower_right"],
+        # Lower diamond
+        GlyphComponents.LOWER_DIAMOND_UPPER_LEFT: lower_diamond["upper_left"],
+        GlyphComponents.LOWER_DIAMOND_UPPER_RIGHT: lower_diamond["upper_right"],
+        GlyphComponents.LOWER_DIAMOND_LOWER_LEFT: lower_diamond["lower_left"],
+        GlyphComponents.LOWER_DIAMOND_LOWER_RIGHT: lower_diamond["lower_right"],
+    }
+    glyph = SymbolGlyph.from_components(
+        component for component, is_selected in selected.items() if is_selected
+    )
 
     if show_preview:
         fig = render_letter_preview(glyph, scaling_factor=0.15)
         st.pyplot(fig, use_container_width=False)
+        duplicate_id = find_duplicate_letter(glyph)
+        if duplicate_id:
+            st.warning(f"⚠️ This letter configuration already exists with ID: '{duplicate_id}'")
+        similar = find_similar_letters(glyph, max_distance=2)
+        if similar:
+            st.caption("Similar letters: " + ", ".join(
+                f"{letter_id} ({distance} flip{'s' if distance > 1 else ''})" for letter_id, distance in similar[:8]
+            ))
         if st.button("Save Letter"):
             save_letter_from_glyph(glyph)
     
@@ -132,12 +129,10 @@ def letter_creator_interface(subheader: str="Letter Components", show_preview: b
 
 def save_letter_from_glyph(glyph: SymbolGlyph):
     """Save a letter to the database from a glyph"""
-    letters_db = load_letters()
-    highest_id = max([int(key) for key in letters_db.keys() if key.isnumeric()], default=0)
-    new_id = str(highest_id + 1)
+    new_id = allocate_id("letters")
     letter_data = {
         "id": new_id,
-        "components": [key for key, value in glyph.active_components.items() if value],
+        "components": glyph.components(),
         "notes": "Automatically created letter",
         "location": "Automatically created letter"
     }
@@ -147,12 +142,15 @@ def save_letter_from_glyph(glyph: SymbolGlyph):
 def _automatically_create_letter(active_components: list):
     """
     Creates a letter while skipping the entire form.
-    The id is an integer greater than the highest id in the db.
+    The id is an integer greater than the highest id in the db,
+    reserved atomically so concurrent sessions never collide.
     The rest of the information is not important.
     """
-    letters_db = load_letters()
-    highest_id = max([int(key) for key in letters_db.keys() if key.isnumeric()])
-    new_id = str(highest_id + 1)
+    duplicate_id = find_duplicate_letter(SymbolGlyph.from_components(active_components))
+    if duplicate_id:
+        st.write(f"Letter {duplicate_id} already has these components!")
+        return
+    new_id = allocate_id("letters")
     new_letter = {
         "id": new_id,
         "components": active_components,
@@ -166,65 +164,46 @@ def _automatically_create_letter(active_components: list):
 
 def initialize_letter_db():
     """Initialize the letters database if it doesn't exist"""
-    db_path = Path("data/letters.json")
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    if not db_path.exists():
-        with open(db_path, "w") as f:
-            json.dump({}, f)
-    
-    return db_path
-
-def load_letters():
-    """Load all saved letters from the database"""
-    db_path = Path("data/letters.json")
-    if db_path.exists():
-        with open(db_path, "r") as f:
-            return json.load(f)
-    return {}
-
-def load_words():
-    """Load all saved words from the database"""
-    db_path = Path("data/words.json")
-    if db_path.exists():
-        with open(db_path, "r") as f:
-            return json.load(f)
-    return {}
-
-def load_sentences():
-    """Load all saved sentences from the database"""
-    db_path = Path("data/sentences.json")
-    if db_path.exists():
-        with open(db_path, "r") as f:
-            return json.load(f)
-    return {}
+    return initialize_table("letters")
 
 def save_letter(letter_data: dict):
     """Save a letter to the database"""
-    db_path = initialize_letter_db()
-    with open(db_path, "r") as f:
-        db = json.load(f)
-    
-    letter_id = letter_data["id"]
-    db[letter_id] = letter_data
-    
-    with open(db_path, "w") as f:
-        json.dump(db, f, indent=2)
+    old_letter = load_letters().get(letter_data["id"])
+    if old_letter is not None and old_letter.get("components") != letter_data.get("components"):
+        # words drawn with the old shape of this letter are now stale
+        thumbnail_cache.invalidate_letter(letter_data["id"])
+    save_record("letters", letter_data)
 
 def create_letter_preview(components: list) -> Optional[plt.Figure]:
     """Create a preview figure for a letter from its components"""
-    glyph = SymbolGlyph()
-    for comp in components:
-        component_value = getattr(GlyphComponents, comp)
-        glyph.activate_component(component_value)
+    glyph = SymbolGlyph.from_components(components)
     
     fig, ax = plt.subplots(figsize=(2, 3))  # Smaller figure size for gallery
     glyph.render(ax)
     plt.close()
     return fig
 
-def render_letter_gallery(letters_db: Dict, show_top_k:int|None=None, callback=None):
-    """Render a grid of clickable letter previews with their IDs"""
+def _sorted_masks(gallery_key: str, sorted_ids: list, letters_db: Dict) -> np.ndarray:
+    """
+    Component masks aligned with the cached sort order, rebuilt when the
+    order changes or any letter is re-saved (same ids, new components)
+    """
+    state_key = f"{gallery_key}_sorted_masks"
+    generation = table_generation("letters")
+    cached = st.session_state.get(state_key)
+    if cached is not None and cached[0] is sorted_ids and cached[1] == generation:
+        return cached[2]
+    masks = np.fromiter((letter_key(letters_db[letter_id]["components"]) for letter_id in sorted_ids),
+                        dtype=np.uint16, count=len(sorted_ids))
+    st.session_state[state_key] = (sorted_ids, generation, masks)
+    return masks
+
+def render_letter_gallery(letters_db: Dict, show_top_k:int|None=None, callback=None,
+                          gallery_key: str="letter_gallery", prefetch: bool=True):
+    """
+    Render a grid of clickable letter previews with their IDs.
+    Unless show_top_k is set, only the current page is rendered.
+    """
     
     if not letters_db:
         st.write("No letters saved yet!")
@@ -236,61 +215,52 @@ def render_letter_gallery(letters_db: Dict, show_top_k:int|None=None, callback=N
     # Create a list to store the letter IDs in order of display
     ordered_letter_ids = []  # New list to maintain order
 
-    words_db = load_words()
-    sentence_db = load_sentences()
-    _, _, letter_frequency, letter_counts = get_freq_distibution(letters_db, words_db, sentence_db)
-    
-    # Create a frequency lookup dictionary from the NumPy arrays
-    frequency_dict = dict(zip(letter_frequency, letter_counts))
+    # Letter occurrence counts, kept up to date as words and sentences are saved
+    frequency_dict = frequency_store.letter_counts()
 
     glyph = st.session_state.get("current_glyph", SymbolGlyph())
-    active_components = glyph.active_components
-    active_components = [key for key, value in active_components.items() if value]
+    active_components = glyph.components()
     
-    # Sort letters_db items based on frequency counts
-    sorted_items = sorted(
-        letters_db.items(),
-        key=lambda x: frequency_dict.get(x[0], 0),  # Default to 0 if letter not found
-        reverse=True
+    # Sort letter ids by frequency once, reusing the order across reruns
+    sorted_ids = sorted_index(
+        gallery_key,
+        (tuple(letters_db), frequency_store.version),
+        list(letters_db),
+        sort_key=lambda letter_id: frequency_dict.get(letter_id, 0),  # Default to 0 if letter not found
     )
 
-    # filter letters based on active components
+    # filter letters based on active components, as one vectorized mask test
+    mode = "superset"
     if len(active_components) > 0:
-        new_sorted_items = []
-        for letter_id, item in sorted_items:
-            item_components = item["components"]
-
-            if all([reference_component in item_components for reference_component in active_components]):
-                new_sorted_items.append((letter_id, item))
-        sorted_items = new_sorted_items
+        mode = st.radio("Component filter", COMPONENT_QUERY_MODES, horizontal=True,
+                        key=f"{gallery_key}_component_mode")
+        selected = np.flatnonzero(component_filter(_sorted_masks(gallery_key, sorted_ids, letters_db),
+                                                   glyph.mask, mode))
+        sorted_ids = [sorted_ids[i] for i in selected]
+    sorted_items = [(letter_id, letters_db[letter_id]) for letter_id in sorted_ids]
 
+    next_items = []
     if show_top_k:
         sorted_items = sorted_items[:show_top_k]
+    else:
+        sorted_items, next_items = paginate(gallery_key, sorted_items,
+                                            filter_signature=(tuple(active_components), mode))
 
     if len(sorted_items) == 0:
         st.write("No letters found with the selected components.")
         # st.write("would you like to create this letter?")
-        if st.button("Create this letter?"):
+        if mode in ("superset", "exact") and st.button("Create this letter?"):
             _automatically_create_letter(active_components)
         
     
+    # Render all thumbnails as one batch, in display order
+    images = letter_thumbnails([letter_data["components"] for _, letter_data in sorted_items])
+    if prefetch and next_items:
+        prefetch_letter_thumbnails([letter_data["components"] for _, letter_data in next_items])
+
     for letter_id, letter_data in sorted_items:
         ordered_letter_ids.append(letter_id)  # Store letter IDs in display order
         
-        fig = create_letter_preview(letter_data["components"])
-        
-        # Convert Matplotlib figure to PIL image
-        buf = io.BytesIO()
-        fig.savefig(buf, format='png')
-        buf.seek(0)
-        img = Image.open(buf)
-        
-        # Encode the image as base64
-        buffered = io.BytesIO()
-        img.save(buffered, format="PNG")
-        encoded_img = base64.b64encode(buffered.getvalue()).decode()
-        images.append(f"data:image/png;base64,{encoded_img}")
-        
         # Add the title
         this_letter_freq = frequency_dict.get(letter_id, 0)
         titles.append(f"{letter_id}f:{this_letter_freq}")
@@ -300,7 +270,7 @@ def render_letter_gallery(letters_db: Dict, show_top_k:int|None=None, callback=N
         images,
         titles=titles,
         div_style={"display": "flex", "justify-content": "center", "flex-wrap": "wrap"},
-        img_style={"margin": "5px", "height": "100px", "width": "100px"},
+        img_style={"margin": "5px", "height": "100px", "width": "auto"},
     )
 
     if clicked_index > -1:
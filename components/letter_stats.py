@@ -0,0 +1,168 @@
+# components/letter_stats.py
+# Letter n-gram, position and word adjacency statistics. Counts live in
+# memory, are built once per table generation and kept current by save
+# listeners (only the saved word's or sentence's contribution moves), and
+# are handed out as NumPy arrays: dense matrices over the letters that occur
+# for bigrams and positions, COO triples for trigrams and word adjacency.
+# The arrays are cached until the next change.
+#
+# Letter statistics come in two weightings: "vocabulary" counts every saved
+# word once, "occurrences" weights each word by how often it occurs in the
+# recorded sentences (numeric ids only, as in components/frequencies.py).
+# Word adjacency counts consecutive words within those sentences.
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from components.frequencies import is_counted_sentence, sentence_words
+from components.repository import load_table
+from components.table_index import TableIndex
+
+WEIGHTINGS = ("vocabulary", "occurrences")
+SOURCE_TABLES = ("words", "sentences")
+
+def _word_ngrams(letter_ids: List[str]) -> Tuple[Counter, Counter, Counter]:
+    """Bigrams, trigrams and (letter, position) pairs of one word"""
+    bigrams = Counter(zip(letter_ids, letter_ids[1:]))
+    trigrams = Counter(zip(letter_ids, letter_ids[1:], letter_ids[2:]))
+    positions = Counter((letter_id, position) for position, letter_id in enumerate(letter_ids))
+    return bigrams, trigrams, positions
+
+def _add(target: Counter, source: Counter, weight: int):
+    if weight:
+        for key, count in source.items():
+            target[key] += count * weight
+            if not target[key]:
+                del target[key]
+
+class _LetterCounts:
+    """Bigram, trigram and position counters under one weighting"""
+
+    def __init__(self):
+        self.bigrams, self.trigrams, self.positions = Counter(), Counter(), Counter()
+
+    def add_word(self, letter_ids: List[str], weight: int):
+        for target, source in zip((self.bigrams, self.trigrams, self.positions), _word_ngrams(letter_ids)):
+            _add(target, source, weight)
+
+class LetterStatistics(TableIndex):
+    def __init__(self):
+        self.counts: Dict[str, _LetterCounts] = {}
+        self.word_counts = Counter()
+        self.adjacency = Counter()
+        self._cache: Dict[tuple, tuple] = {}
+        super().__init__(SOURCE_TABLES)
+
+    def _rebuild(self):
+        words_db, sentences_db = load_table("words"), load_table("sentences")
+        self.word_counts, self.adjacency = Counter(), Counter()
+        for sentence_id, sentence in sentences_db.items():
+            if is_counted_sentence(sentence_id):
+                word_ids = sentence_words(sentence)
+                self.word_counts.update(word_ids)
+                self.adjacency.update(zip(word_ids, word_ids[1:]))
+        self.counts = {weighting: _LetterCounts() for weighting in WEIGHTINGS}
+        for word_id, word in words_db.items():
+            self.counts["vocabulary"].add_word(word["letter_ids"], 1)
+            self.counts["occurrences"].add_word(word["letter_ids"], self.word_counts.get(word_id, 0))
+
+    def _apply(self, table: str, record_id: str, old_record: Optional[dict], new_record: dict):
+        if table == "words":
+            self._apply_word(record_id, old_record, new_record)
+        else:
+            self._apply_sentence(record_id, old_record, new_record)
+
+    def _apply_word(self, word_id: str, old_word: Optional[dict], new_word: dict):
+        count = self.word_counts.get(word_id, 0)
+        for weighting, weight in (("vocabulary", 1), ("occurrences", count)):
+            if old_word:
+                self.counts[weighting].add_word(old_word["letter_ids"], -weight)
+            self.counts[weighting].add_word(new_word["letter_ids"], weight)
+
+    def _apply_sentence(self, sentence_id: str, old_sentence: Optional[dict], new_sentence: dict):
+        if not is_counted_sentence(sentence_id):
+            return
+        old_words, new_words = sentence_words(old_sentence), sentence_words(new_sentence)
+        deltas = Counter(new_words)
+        deltas.subtract(old_words)
+        words_db = load_table("words")
+        for word_id, delta in deltas.items():
+            if delta:
+                self.word_counts[word_id] += delta
+                if not self.word_counts[word_id]:
+                    del self.word_counts[word_id]
+                if word_id in words_db:
+                    self.counts["occurrences"].add_word(words_db[word_id]["letter_ids"], delta)
+        _add(self.adjacency, Counter(zip(old_words, old_words[1:])), -1)
+        _add(self.adjacency, Counter(zip(new_words, new_words[1:])), 1)
+
+    def _cached(self, key: tuple, build):
+        with self._lock:
+            self._current()
+            cached = self._cache.get(key)
+            if cached is None or cached[0] != self.version:
+                cached = self._cache[key] = (self.version, build())
+            return cached[1]
+
+    def _letter_counts(self, weighting: str) -> _LetterCounts:
+        if weighting not in WEIGHTINGS:
+            raise ValueError(f"Unknown weighting: {weighting}")
+        return self.counts[weighting]
+
+    def letter_ids(self, weighting: str = "vocabulary") -> np.ndarray:
+        """Letters that occur under this weighting, sorted; the row/column order of the matrices"""
+        def build():
+            positions = self._letter_counts(weighting).positions
+            return np.array(sorted({letter_id for letter_id, _ in positions}), dtype=str)
+        return self._cached(("letter_ids", weighting), build)
+
+    def _letter_index(self, weighting: str) -> Dict[str, int]:
+        return {str(letter_id): i for i, letter_id in enumerate(self.letter_ids(weighting))}
+
+    def bigrams(self, weighting: str = "vocabulary") -> Tuple[np.ndarray, np.ndarray]:
+        """(letter ids, matrix) where matrix[i, j] counts letter i directly followed by letter j"""
+        def build():
+            index = self._letter_index(weighting)
+            matrix = np.zeros((len(index), len(index)), dtype=np.int64)
+            for (first, second), count in self._letter_counts(weighting).bigrams.items():
+                matrix[index[first], index[second]] = count
+            return self.letter_ids(weighting), matrix
+        return self._cached(("bigrams", weighting), build)
+
+    def trigrams(self, weighting: str = "vocabulary") -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(letter ids, n x 3 letter indices, n counts) of the letter triples that occur, most frequent first"""
+        def build():
+            index = self._letter_index(weighting)
+            items = sorted(self._letter_counts(weighting).trigrams.items(), key=lambda item: -item[1])
+            keys = np.array([[index[letter_id] for letter_id in key] for key, _ in items],
+                            dtype=np.int64).reshape(-1, 3)
+            counts = np.array([count for _, count in items], dtype=np.int64)
+            return self.letter_ids(weighting), keys, counts
+        return self._cached(("trigrams", weighting), build)
+
+    def positions(self, weighting: str = "vocabulary") -> Tuple[np.ndarray, np.ndarray]:
+        """(letter ids, matrix) where matrix[i, p] counts letter i at position p of a word"""
+        def build():
+            index = self._letter_index(weighting)
+            counts = self._letter_counts(weighting).positions
+            width = max((position + 1 for _, position in counts), default=0)
+            matrix = np.zeros((len(index), width), dtype=np.int64)
+            for (letter_id, position), count in counts.items():
+                matrix[index[letter_id], position] = count
+            return self.letter_ids(weighting), matrix
+        return self._cached(("positions", weighting), build)
+
+    def word_adjacency(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(word ids, n x 2 word indices, n counts) of consecutive word pairs in sentences, most frequent first"""
+        def build():
+            items = sorted(self.adjacency.items(), key=lambda item: -item[1])
+            word_ids = sorted({word_id for pair, _ in items for word_id in pair})
+            index = {word_id: i for i, word_id in enumerate(word_ids)}
+            pairs = np.array([[index[first], index[second]] for (first, second), _ in items],
+                             dtype=np.int64).reshape(-1, 2)
+            counts = np.array([count for _, count in items], dtype=np.int64)
+            return np.array(word_ids, dtype=str), pairs, counts
+        return self._cached(("adjacency",), build)
+
+letter_statistics = LetterStatistics()
@@ -0,0 +1,51 @@
+# components/pagination.py
+import streamlit as st
+from typing import Hashable, Iterable, List, Sequence, Tuple
+
+PAGE_SIZES = [24, 48, 96, 192]
+
+def sorted_index(key: str, signature: Hashable, ids: Iterable[str], sort_key) -> List[str]:
+    """
+    Sort ids once and keep the order in session state across reruns.
+    The cached order is reused for as long as the signature is unchanged.
+    """
+    state_key = f"{key}_sorted_index"
+    cached = st.session_state.get(state_key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    ordered = sorted(ids, key=sort_key, reverse=True)
+    st.session_state[state_key] = (signature, ordered)
+    return ordered
+
+def paginate(key: str, items: Sequence, filter_signature: Hashable = None,
+             default_page_size: int = 48) -> Tuple[Sequence, Sequence]:
+    """
+    Render page controls and return (visible items, next page items).
+    The page cursor resets whenever the filter signature changes.
+    """
+    page_key, size_key, signature_key = f"{key}_page", f"{key}_page_size", f"{key}_filter_signature"
+    if st.session_state.get(signature_key) != filter_signature:
+        st.session_state[signature_key] = filter_signature
+        st.session_state[page_key] = 0
+
+    page_size = st.session_state.get(size_key, default_page_size)
+    n_pages = max(1, -(-len(items) // page_size))
+    page = min(st.session_state.get(page_key, 0), n_pages - 1)
+
+    col1, col2, col3, col4 = st.columns([1, 1, 2, 2])
+    with col1:
+        if st.button("◀ Prev", key=f"{key}_prev", disabled=page == 0):
+            page -= 1
+    with col2:
+        if st.button("Next ▶", key=f"{key}_next", disabled=page >= n_pages - 1):
+            page += 1
+    with col3:
+        st.write(f"Page {page + 1} of {n_pages} ({len(items)} items)")
+    with col4:
+        st.selectbox("Page size", PAGE_SIZES, key=size_key,
+                     index=PAGE_SIZES.index(default_page_size) if default_page_size in PAGE_SIZES else 0,
+                     label_visibility="collapsed")
+    st.session_state[page_key] = page
+
+    start = page * page_size
+    return items[start:start + page_size], items[start + page_size:start + 2 * page_size]
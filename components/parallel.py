@@ -0,0 +1,10 @@
+# components/parallel.py
+# Shared settings for the process pools started from the app: the thumbnail
+# renderer, the English corpus counter and the cipher solver.
+import multiprocessing
+
+def pool_context():
+    """Multiprocessing context for worker pools started from the app"""
+    # the Streamlit script runs in a thread, so never fork the server process directly
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
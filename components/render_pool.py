@@ -0,0 +1,88 @@
+# components/render_pool.py
+import atexit
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from components.parallel import pool_context
+
+# (glyph masks, pixel height, format) -> data URI
+RenderSpec = Tuple[Tuple[int, ...], int, str]
+
+# below this many specs, pool round-trips cost more than they save; SVG
+# thumbnails are microseconds of string formatting, so they never go to the pool
+MIN_PARALLEL_BATCH = {"png": 32, "svg": None}
+CHUNKS_PER_WORKER = 4
+
+_executor = None
+_workers = os.cpu_count() or 1
+
+def _render_spec(spec: RenderSpec) -> str:
+    from components.thumbnails import render_chain_uri
+    masks, height, fmt = spec
+    return render_chain_uri(list(masks), height, fmt)
+
+def _render_specs(specs: Sequence[RenderSpec]) -> List[str]:
+    return [_render_spec(spec) for spec in specs]
+
+def _parallel_threshold(specs: Sequence[RenderSpec]) -> Optional[int]:
+    """Smallest batch worth sending to the pool, or None to always render in process"""
+    thresholds = {MIN_PARALLEL_BATCH.get(spec[2]) for spec in specs}
+    return None if not thresholds or None in thresholds else max(thresholds)
+
+def get_executor():
+    """Lazily start the persistent rendering pool shared by all reruns"""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=_workers, mp_context=pool_context())
+        atexit.register(shutdown_executor)
+    return _executor
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+def render_batch(specs: Sequence[RenderSpec], parallel: bool = True) -> List[str]:
+    """
+    Render a batch of thumbnails, returning data URIs in the order given.
+    Small batches, or any failure of the pool, fall back to rendering serially.
+    """
+    threshold = _parallel_threshold(specs)
+    if parallel and threshold is not None and len(specs) >= threshold:
+        try:
+            executor = get_executor()
+            chunksize = max(1, len(specs) // (_workers * CHUNKS_PER_WORKER))
+            return list(executor.map(_render_spec, specs, chunksize=chunksize))
+        except (BrokenProcessPool, OSError, RuntimeError):
+            shutdown_executor()
+    return [_render_spec(spec) for spec in specs]
+
+def submit_batch(specs: Sequence[RenderSpec], on_done: Callable[[Sequence[RenderSpec], List[str]], None]):
+    """
+    Render a batch in the background, calling on_done(specs, uris) per chunk.
+    Used for prefetching, so a pool that cannot be started is silently skipped.
+    """
+    if not specs:
+        return
+    if _parallel_threshold(specs) is None:
+        # cheaper to render right here than to pickle them to the pool
+        on_done(specs, _render_specs(specs))
+        return
+    try:
+        executor = get_executor()
+    except (OSError, RuntimeError):
+        return
+    chunksize = max(1, len(specs) // _workers)
+    for start in range(0, len(specs), chunksize):
+        chunk = list(specs[start:start + chunksize])
+        try:
+            future = executor.submit(_render_specs, chunk)
+        except (BrokenProcessPool, RuntimeError):
+            shutdown_executor()
+            return
+        future.add_done_callback(
+            lambda f, chunk=chunk: on_done(chunk, f.result()) if f.exception() is None else None
+        )
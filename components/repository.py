@@ -0,0 +1,298 @@
+# components/repository.py
+# Shared access to the JSON databases in data/. Parsed tables are cached in
+# process and revalidated by file mtime and size, so a rerun only re-parses
+# files that changed. Loads return read-only mappings (copy a record before
+# modifying it); saves cache a private deep copy of each record, so callers
+# may keep mutating what they passed in, and notify listeners with that copy.
+# A save updates the cached table in place unless a view of it was handed out
+# since its last copy; then it copies first, so that view stays a snapshot.
+import json
+import os
+import threading
+from contextlib import nullcontext
+from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+from components import journal_store, sqlite_store
+from components.file_lock import file_lock
+
+DATA_DIR = Path("data")
+# "json" (data/*.json, the default), "sqlite" (see components/sqlite_store.py)
+# or "journal" (data/*.json snapshots plus append-only journals, see components/journal_store.py)
+STORAGE_BACKEND = os.environ.get("TUNIC_STORAGE", "json")
+TABLES = {
+    "letters": "letters.json",
+    "words": "words.json",
+    "sentences": "sentences.json",
+}
+
+class _Table:
+    __slots__ = ("data", "stamp", "generation", "journal_offset", "journal_entries", "shared")
+
+    def __init__(self, data: dict, stamp, generation: int,
+                 journal_offset: int = 0, journal_entries: int = 0):
+        self.data = data
+        self.stamp = stamp
+        self.generation = generation
+        self.journal_offset = journal_offset
+        self.journal_entries = journal_entries
+        self.shared = False  # set once load_table hands out a view of data
+
+_tables: Dict[str, _Table] = {}
+_listeners: Dict[str, list] = {name: [] for name in TABLES}
+# per-table locks: in-process for the cache, on disk (data/<table>.lock) for writers
+_locks: Dict[str, threading.RLock] = {name: threading.RLock() for name in TABLES}
+
+def table_path(name: str) -> Path:
+    return DATA_DIR / TABLES[name]
+
+def _write_lock(name: str):
+    """Cross-process lock serializing writers of one table (SQLite locks itself)"""
+    if STORAGE_BACKEND == "sqlite":
+        return nullcontext()
+    return file_lock(DATA_DIR / f"{name}.lock")
+
+def _stamp(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def _backend_stamp(name: str):
+    if STORAGE_BACKEND == "sqlite":
+        return ("sqlite", sqlite_store.table_version(name))
+    if STORAGE_BACKEND == "journal":
+        path = table_path(name)
+        return (_stamp(path), _stamp(journal_store.journal_path(path)))
+    return _stamp(table_path(name))
+
+def _refresh_journal(name: str, table: Optional[_Table], stamp) -> _Table:
+    """Replay only the journal tail if the snapshot is unchanged, else reload everything"""
+    path = table_path(name)
+    generation = table.generation + 1 if table is not None else 1
+    if table is not None and table.stamp is not None and table.stamp[0] == stamp[0]:
+        data = _writable(table)
+        offset, applied = journal_store.replay(journal_store.journal_path(path), data, table.journal_offset)
+        if _stamp(path) == stamp[0]:
+            return _Table(data, stamp, generation, offset, table.journal_entries + applied)
+    while True:
+        data = journal_store.read_snapshot(path)
+        offset, applied = journal_store.replay(journal_store.journal_path(path), data)
+        # a compaction between reading the snapshot and the journal would
+        # hide entries; if the snapshot moved underneath us, read again
+        if _stamp(path) == stamp[0]:
+            return _Table(data, stamp, generation, offset, applied)
+        stamp = _backend_stamp(name)
+
+def _read(name: str, stamp) -> dict:
+    if STORAGE_BACKEND == "sqlite":
+        return sqlite_store.load_table(name)
+    if stamp is None:
+        return {}
+    with open(table_path(name), "r") as f:
+        return json.load(f)
+
+def _current(name: str) -> _Table:
+    """Return the cached table, re-reading it only if it changed"""
+    stamp = _backend_stamp(name)
+    with _locks[name]:
+        table = _tables.get(name)
+        if table is not None and table.stamp == stamp:
+            return table
+        if STORAGE_BACKEND == "journal":
+            table = _tables[name] = _refresh_journal(name, table, stamp)
+            return table
+        data = _read(name, stamp)
+        generation = table.generation + 1 if table is not None else 1
+        table = _Table(data, stamp, generation)
+        _tables[name] = table
+        return table
+
+def load_table(name: str) -> Mapping:
+    """Load a database as a read-only mapping of id -> record"""
+    with _locks[name]:
+        table = _current(name)
+        table.shared = True
+        return MappingProxyType(table.data)
+
+def table_generation(name: str) -> int:
+    """Counter that changes whenever the table's contents change"""
+    return _current(name).generation
+
+def table_stamp(name: str):
+    """Fingerprint of a table's storage that changes with every write, from any process"""
+    return _backend_stamp(name)
+
+def add_save_listener(name: str, listener: Callable[[str, Optional[dict], dict, int], None]):
+    """
+    Call listener(record_id, old_record, new_record, generation) after every save
+    to a table. Both records are the repository's own copies: read them, never
+    modify them. generation is the table generation the save of this record
+    reached: every record moves it on by one, so a listener that last saw
+    generation - 1 can apply the record as a delta, and anything else means
+    the table also changed in ways the record doesn't cover.
+    """
+    _listeners[name].append(listener)
+
+def initialize_table(name: str) -> Path:
+    """Initialize a database file if it doesn't exist"""
+    if STORAGE_BACKEND == "sqlite":
+        sqlite_store.connect()
+        return sqlite_store.DB_PATH
+    path = table_path(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if not path.exists():
+        with open(path, "w") as f:
+            json.dump({}, f)
+    return path
+
+def _write(name: str, data: dict, generation: int):
+    path = initialize_table(name)
+    # write a temp file and rename it over the table, so a crash never leaves it truncated
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+    _tables[name] = _Table(data, _stamp(path), generation)
+
+def _append_journal(name: str, table: _Table, data: dict, record: dict):
+    path = initialize_table(name)
+    journal = journal_store.journal_path(path)
+    start, end = journal_store.append(journal, record)
+    offset, entries = end, table.journal_entries + 1
+    generation = table.generation + 1
+    if start != table.journal_offset:
+        # someone else appended since our last read: pick their entries up too,
+        # and skip a generation so listeners rebuild rather than apply a delta
+        offset, applied = journal_store.replay(journal, data, table.journal_offset)
+        entries = table.journal_entries + applied
+        generation += 1
+    if entries >= journal_store.COMPACT_THRESHOLD:
+        data = journal_store.compact(path)
+        offset, entries = 0, 0
+    _tables[name] = _Table(data, _backend_stamp(name), generation, offset, entries)
+
+def _detached(record: dict) -> dict:
+    """Deep copy of a record, sharing nothing with the caller's (e.g. session state) lists"""
+    return json.loads(json.dumps(record))
+
+def _writable(table: _Table) -> dict:
+    """The table's dict for a save to modify: itself, or a copy if a view of it was handed out"""
+    return dict(table.data) if table.shared else table.data
+
+def _discard(name: str, table: _Table):
+    """Forget a cached table a failed save may have modified, so the next load re-reads it"""
+    _tables[name] = _Table({}, None, table.generation)
+
+def _sqlite_saved(name: str, table: _Table, data: dict, version: int, records: int = 1):
+    """Cache the table after a SQLite write of `records` records that produced `version`"""
+    if version == table.stamp[1] + 1:
+        _tables[name] = _Table(data, ("sqlite", version), table.generation + records)
+        return
+    # another process committed in between: our copy lacks its rows, so
+    # reload, and skip a generation so listeners rebuild rather than apply a delta
+    _tables[name] = _Table(sqlite_store.load_table(name), ("sqlite", version), table.generation + records + 1)
+
+def save_record(name: str, record: dict):
+    """
+    Insert or replace one record, keyed by its "id" field.
+    The table is revalidated under the write lock, so records saved
+    meanwhile by other sessions or processes are merged, never dropped.
+    """
+    record = _detached(record)
+    with _locks[name], _write_lock(name):
+        table = _current(name)
+        record_id = record["id"]
+        old_record = table.data.get(record_id)
+        data = _writable(table)
+        data[record_id] = record
+        try:
+            if STORAGE_BACKEND == "sqlite":
+                _sqlite_saved(name, table, data, sqlite_store.save_record(name, record))
+            elif STORAGE_BACKEND == "journal":
+                _append_journal(name, table, data, record)
+            else:
+                _write(name, data, table.generation + 1)
+        except BaseException:
+            _discard(name, table)
+            raise
+    for listener in _listeners[name]:
+        listener(record_id, old_record, record, table.generation + 1)
+
+def save_records(name: str, records: Iterable[dict]):
+    """
+    Insert or replace several records, keyed by their "id" fields, as one
+    atomic write: either all of them land or none do. The generation moves
+    on by one per record, and listeners hear of the records in order.
+    """
+    records = [_detached(record) for record in records]
+    with _locks[name], _write_lock(name):
+        table = _current(name)
+        data = _writable(table)
+        old_records = []
+        for record in records:
+            # an id saved twice in one batch replaces its own earlier record
+            old_records.append(data.get(record["id"]))
+            data[record["id"]] = record
+        try:
+            if STORAGE_BACKEND == "sqlite":
+                _sqlite_saved(name, table, data, sqlite_store.save_records(name, records), len(records))
+            elif STORAGE_BACKEND == "journal":
+                # one snapshot write instead of a run of appends that could be cut short
+                journal_store.write_snapshot(table_path(name), data)
+                _tables[name] = _Table(data, _backend_stamp(name), table.generation + len(records))
+            else:
+                _write(name, data, table.generation + len(records))
+        except BaseException:
+            _discard(name, table)
+            raise
+    for i, (record, old_record) in enumerate(zip(records, old_records)):
+        for listener in _listeners[name]:
+            listener(record["id"], old_record, record, table.generation + i + 1)
+
+def save_table(name: str, data: Mapping):
+    """Replace a whole table at once"""
+    data = _detached(dict(data))
+    with _locks[name], _write_lock(name):
+        table = _current(name)
+        if STORAGE_BACKEND == "sqlite":
+            version = sqlite_store.replace_table(name, data)
+            _tables[name] = _Table(data, ("sqlite", version), table.generation + 1)
+        elif STORAGE_BACKEND == "journal":
+            journal_store.write_snapshot(table_path(name), data)
+            _tables[name] = _Table(data, _backend_stamp(name), table.generation + 1)
+        else:
+            _write(name, data, table.generation + 1)
+
+def allocate_id(name: str) -> str:
+    """
+    Atomically reserve the next numeric id of a table, one above both the
+    highest numeric id in it and every id handed out before, so concurrent
+    sessions never mint the same id.
+    """
+    if STORAGE_BACKEND == "sqlite":
+        return sqlite_store.allocate_id(name)
+    sequence_path = DATA_DIR / f"{name}.seq"
+    with file_lock(DATA_DIR / f"{name}.seq.lock"):
+        highest = max((int(key) for key in load_table(name) if key.isnumeric()), default=0)
+        if sequence_path.exists():
+            highest = max(highest, int(sequence_path.read_text().strip() or 0))
+        new_id = highest + 1
+        tmp_path = sequence_path.with_name(f"{sequence_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(str(new_id))
+        os.replace(tmp_path, sequence_path)
+    return str(new_id)
+
+def load_letters() -> Mapping:
+    """Load all saved letters from the database"""
+    return load_table("letters")
+
+def load_words() -> Mapping:
+    """Load all saved words from the database"""
+    return load_table("words")
+
+def load_sentences() -> Mapping:
+    """Load all saved sentences from the database"""
+    return load_table("sentences")
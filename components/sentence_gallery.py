@@ -1,85 +1,59 @@
 # components/sentence_gallery.py
 import streamlit as st
-from render import SymbolChain, SymbolGlyph, GlyphComponents
-import matplotlib.pyplot as plt
+from render import SymbolChain, SymbolGlyph, GlyphComponents, SentenceLayout, layout_sentence
 from pathlib import Path
 import json
-from typing import Dict, List, Tuple
+from typing import Dict, List
 
-from components.word_gallery import create_glyph_from_letter_id
-
-def load_letters():
-    """Load all saved letters from the database"""
-    db_path = Path("data/letters.json")
-    if db_path.exists():
-        with open(db_path, "r") as f:
-            return json.load(f)
-    return {}
-
-def load_words():
-    """Load all saved words from the database"""
-    db_path = Path("data/words.json")
-    if db_path.exists():
-        with open(db_path, "r") as f:
-            return json.load(f)
-    return {}
-
-def load_sentences():
-    """Load all saved sentences from the database"""
-    db_path = Path("data/sentences.json")
-    if db_path.exists():
-        with open(db_path, "r") as f:
-            return json.load(f)
-    return {}
+from components.pagination import paginate
+from components.repository import initialize_table, load_letters, load_words, load_sentences, save_record
 
 def initialize_sentences_db():
     """Initialize the sentences database if it doesn't exist"""
-    db_path = Path("data/sentences.json")
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    if not db_path.exists():
-        with open(db_path, "w") as f:
-            json.dump({}, f)
-    
-    return db_path
+    return initialize_table("sentences")
 
 def save_sentence(sentence_data: dict):
     """Save a sentence to the database"""
-    db_path = initialize_sentences_db()
-    with open(db_path, "r") as f:
-        db = json.load(f)
-    
-    sentence_id = sentence_data["id"]
-    db[sentence_id] = sentence_data
-    
-    with open(db_path, "w") as f:
-        json.dump(db, f, indent=2)
+    save_record("sentences", sentence_data)
 
-def render_sentence_component(component: dict, words_db: Dict, letters_db: Dict) -> Tuple[plt.Figure, str]:
-    """Render a single sentence component (word, text, or punctuation)"""
-    if component["type"] == "word":
-        word_data = words_db[component["content"]]
-        # Create glyphs from letter IDs
-        glyphs = []
-        for letter_id in word_data["letter_ids"]:
-            glyph = create_glyph_from_letter_id(letter_id, letters_db)
-            if glyph:
-                glyphs.append(glyph)
-        
-        if glyphs:
-            # Create figure for this word
-            fig, ax = plt.subplots(figsize=(len(glyphs) * 1.5, 3))
-            word_chain = SymbolChain(glyphs)
-            word_chain.render(ax)
-            plt.close()
-            return fig, word_data.get("translation", component["content"])
+def build_sentence_layout(components: List[dict], words_db: Dict, letters_db: Dict) -> SentenceLayout:
+    """Lay out every component of a sentence on a single line"""
+    items = []
+    for component in components:
+        if component["type"] == "word":
+            word_data = words_db.get(component["content"])
+            glyphs = [
+                SymbolGlyph.from_components(letters_db[letter_id]["components"])
+                for letter_id in (word_data or {}).get("letter_ids", []) if letter_id in letters_db
+            ]
+            if glyphs:
+                items.append(SymbolChain(glyphs))
+            else:
+                # nothing to draw, show what we know about the word instead
+                items.append((word_data or {}).get("translation") or component["content"])
         else:
-            return None, word_data.get("translation", component["content"])
-    else:
-        return component["content"], component["content"]
+            items.append(component["content"])
+    return layout_sentence(items)
 
-def render_sentence_gallery(sentences_db: Dict, words_db: Dict):
-    """Render a list of sentences with their translations"""
+def show_sentence_image(components: List[dict], words_db: Dict, letters_db: Dict):
+    """Display a sentence as one inline image"""
+    layout = build_sentence_layout(components, words_db, letters_db)
+    st.image(layout.to_svg(height=120))
+
+def sentence_translation(components: List[dict], words_db: Dict) -> str:
+    """Build a translation from the components' word translations, without rendering"""
+    return " ".join(
+        words_db.get(comp["content"], {}).get("translation", comp["content"])
+        if comp["type"] == "word" else comp["content"]
+        for comp in components
+    )
+
+def render_sentence_gallery(sentences_db: Dict, words_db: Dict, gallery_key: str = "sentence_gallery"):
+    """
+    Render a list of sentences with their translations.
+    Symbols are only drawn for sentences on the current page that are
+    switched on; everything else is a text-only summary.
+    """
     st.subheader("Sentence Gallery")
     
     if not sentences_db:
@@ -104,43 +78,29 @@ def render_sentence_gallery(sentences_db: Dict, words_db: Dict):
         st.write("No matching sentences found.")
         return
     
+    show_all = st.toggle("Show symbols for every sentence on this page", key=f"{gallery_key}_show_all")
+    page_items, _ = paginate(gallery_key, list(filtered_sentences.items()),
+                             filter_signature=search_term, default_page_size=24)
+    
     # Display each sentence
-    for sentence_id, sentence_data in filtered_sentences.items():
-        with st.expander(f"Sentence: {sentence_id}"):
+    for sentence_id, sentence_data in page_items:
+        translation = sentence_data.get("translation") or sentence_translation(
+            sentence_data["components"], words_db
+        )
+        with st.expander(f"Sentence: {sentence_id} — {translation}"):
             # Location and date info
             if sentence_data.get("location_found"):
                 st.caption(f"Found: {sentence_data['location_found']}")
             
-            # Display original sentence with symbols
-            st.write("Original:")
-            original_container = st.container()
-            with original_container:
-                # Use columns for inline display
-                cols = st.columns(len(sentence_data["components"]))
-                
-                # Render each component
-                for idx, component in enumerate(sentence_data["components"]):
-                    with cols[idx]:
-                        rendered, translation = render_sentence_component(component, words_db, letters_db)
-                        if isinstance(rendered, plt.Figure):
-                            st.pyplot(rendered)
-                        elif rendered is not None:
-                            st.markdown(f"<h2 style='text-align: center;'>{rendered}</h2>", 
-                                      unsafe_allow_html=True)
-                        else:
-                            st.warning("Failed to render component")
+            # Display original sentence with symbols, only when asked for
+            show_symbols = show_all or st.toggle("Show symbols", key=f"{gallery_key}_symbols_{sentence_id}")
+            if show_symbols:
+                st.write("Original:")
+                show_sentence_image(sentence_data["components"], words_db, letters_db)
             
             # Display translation
             st.write("Translation:")
-            if sentence_data.get("translation"):
-                st.write(sentence_data["translation"])
-            else:
-                # Build translation from components
-                translation = " ".join(
-                    render_sentence_component(comp, words_db, letters_db)[1]
-                    for comp in sentence_data["components"]
-                )
-                st.write(translation)
+            st.write(translation)
             
             # Display notes if any
             if sentence_data.get("notes"):
@@ -150,14 +110,3 @@ def render_sentence_gallery(sentences_db: Dict, words_db: Dict):
             # Show date added
             if sentence_data.get("date_added"):
                 st.caption(f"Added: {sentence_data['date_added']}")
-
-def render_sentence_preview(sentence_components: List[dict], words_db: Dict) -> List[Tuple[plt.Figure, str]]:
-    """Render the visual preview of the sentence"""
-    letters_db = load_letters()
-    word_figures = []
-    
-    for item in sentence_components:
-        rendered, _ = render_sentence_component(item, words_db, letters_db)
-        word_figures.append((rendered, item["type"]))
-    
-    return word_figures
\ No newline at end of file
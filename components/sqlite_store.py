@@ -0,0 +1,224 @@
+# components/sqlite_store.py
+# Optional SQLite storage backend, selected with TUNIC_STORAGE=sqlite.
+# Each record is kept verbatim as JSON next to indexed columns (letter mask,
+# ordered word letters, ordered sentence components), so loads return
+# exactly what the JSON files held while saves only touch one row set.
+#
+# Import the existing JSON files with:
+#     python -m components.sqlite_store migrate
+import argparse
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Mapping, Optional
+
+from render import SymbolGlyph
+
+DB_PATH = Path("data/tunic.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS letters (
+    id TEXT PRIMARY KEY,
+    mask INTEGER NOT NULL,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS letters_mask ON letters(mask);
+
+CREATE TABLE IF NOT EXISTS words (
+    id TEXT PRIMARY KEY,
+    translation TEXT,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS words_translation ON words(translation);
+
+CREATE TABLE IF NOT EXISTS word_letters (
+    word_id TEXT NOT NULL REFERENCES words(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    letter_id TEXT NOT NULL,
+    PRIMARY KEY (word_id, position)
+);
+CREATE INDEX IF NOT EXISTS word_letters_letter ON word_letters(letter_id, word_id);
+
+CREATE TABLE IF NOT EXISTS sentences (
+    id TEXT PRIMARY KEY,
+    translation TEXT,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sentences_translation ON sentences(translation);
+
+CREATE TABLE IF NOT EXISTS sentence_components (
+    sentence_id TEXT NOT NULL REFERENCES sentences(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    content TEXT NOT NULL,
+    PRIMARY KEY (sentence_id, position)
+);
+CREATE INDEX IF NOT EXISTS sentence_components_word ON sentence_components(content) WHERE type = 'word';
+
+CREATE TABLE IF NOT EXISTS table_versions (
+    name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS id_sequences (
+    name TEXT PRIMARY KEY,
+    last_id INTEGER NOT NULL
+);
+"""
+
+TABLE_NAMES = ("letters", "words", "sentences")
+
+_local = threading.local()
+
+def connect(path: Path = DB_PATH) -> sqlite3.Connection:
+    """Per-thread connection with the schema in place"""
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    key = str(path)
+    if key not in connections:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # autocommit mode: writes open their own BEGIN IMMEDIATE transactions
+        conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.executescript(SCHEMA)
+        connections[key] = conn
+    return connections[key]
+
+@contextmanager
+def transaction(conn: sqlite3.Connection):
+    """
+    Write transaction that takes the database write lock up front, so
+    concurrent writers queue on busy_timeout instead of failing mid-way.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+def table_version(name: str, conn: Optional[sqlite3.Connection] = None) -> int:
+    """Counter bumped by every write to a table, from any process"""
+    conn = conn or connect()
+    row = conn.execute("SELECT version FROM table_versions WHERE name = ?", (name,)).fetchone()
+    return row[0] if row else 0
+
+def _bump_version(conn: sqlite3.Connection, name: str) -> int:
+    conn.execute(
+        "INSERT INTO table_versions (name, version) VALUES (?, 1) "
+        "ON CONFLICT(name) DO UPDATE SET version = version + 1",
+        (name,),
+    )
+    return table_version(name, conn)
+
+def load_table(name: str, conn: Optional[sqlite3.Connection] = None) -> Dict[str, dict]:
+    """Load a whole table as id -> record, in insertion order"""
+    if name not in TABLE_NAMES:
+        raise ValueError(f"Unknown table: {name}")
+    conn = conn or connect()
+    rows = conn.execute(f"SELECT id, record FROM {name} ORDER BY rowid")
+    return {record_id: json.loads(record) for record_id, record in rows}
+
+def _upsert(conn: sqlite3.Connection, name: str, record: dict, record_id: Optional[str] = None):
+    record_id = record["id"] if record_id is None else record_id
+    payload = json.dumps(record)
+    if name == "letters":
+        mask = SymbolGlyph.from_components(record.get("components", [])).mask
+        conn.execute(
+            "INSERT INTO letters (id, mask, record) VALUES (?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET mask = excluded.mask, record = excluded.record",
+            (record_id, mask, payload),
+        )
+    elif name == "words":
+        conn.execute(
+            "INSERT INTO words (id, translation, record) VALUES (?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET translation = excluded.translation, record = excluded.record",
+            (record_id, record.get("translation"), payload),
+        )
+        conn.execute("DELETE FROM word_letters WHERE word_id = ?", (record_id,))
+        conn.executemany(
+            "INSERT INTO word_letters (word_id, position, letter_id) VALUES (?, ?, ?)",
+            [(record_id, i, letter_id) for i, letter_id in enumerate(record.get("letter_ids", []))],
+        )
+    elif name == "sentences":
+        conn.execute(
+            "INSERT INTO sentences (id, translation, record) VALUES (?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET translation = excluded.translation, record = excluded.record",
+            (record_id, record.get("translation"), payload),
+        )
+        conn.execute("DELETE FROM sentence_components WHERE sentence_id = ?", (record_id,))
+        conn.executemany(
+            "INSERT INTO sentence_components (sentence_id, position, type, content) VALUES (?, ?, ?, ?)",
+            [(record_id, i, item["type"], item["content"])
+             for i, item in enumerate(record.get("components", []))],
+        )
+    else:
+        raise ValueError(f"Unknown table: {name}")
+
+def save_record(name: str, record: dict, conn: Optional[sqlite3.Connection] = None) -> int:
+    """Insert or replace one record; returns the table's new version"""
+    conn = conn or connect()
+    with transaction(conn):
+        _upsert(conn, name, record)
+        return _bump_version(conn, name)
+
+def save_records(name: str, records: Iterable[dict], conn: Optional[sqlite3.Connection] = None) -> int:
+    """Insert or replace several records in one transaction; returns the table's new version"""
+    conn = conn or connect()
+    with transaction(conn):
+        for record in records:
+            _upsert(conn, name, record)
+        return _bump_version(conn, name)
+
+def replace_table(name: str, data: Mapping[str, dict], conn: Optional[sqlite3.Connection] = None) -> int:
+    """Replace a whole table in one transaction; returns the new version"""
+    conn = conn or connect()
+    with transaction(conn):
+        conn.execute(f"DELETE FROM {name}")
+        for record_id, record in data.items():
+            _upsert(conn, name, record, record_id)
+        return _bump_version(conn, name)
+
+def allocate_id(name: str, conn: Optional[sqlite3.Connection] = None) -> str:
+    """Atomically reserve the next numeric id of a table"""
+    if name not in TABLE_NAMES:
+        raise ValueError(f"Unknown table: {name}")
+    conn = conn or connect()
+    with transaction(conn):
+        highest_row = conn.execute(
+            f"SELECT MAX(CAST(id AS INTEGER)) FROM {name} WHERE id NOT GLOB '*[^0-9]*' AND id != ''"
+        ).fetchone()
+        last_row = conn.execute("SELECT last_id FROM id_sequences WHERE name = ?", (name,)).fetchone()
+        new_id = max(highest_row[0] or 0, last_row[0] if last_row else 0) + 1
+        conn.execute(
+            "INSERT INTO id_sequences (name, last_id) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET last_id = excluded.last_id",
+            (name, new_id),
+        )
+    return str(new_id)
+
+def migrate_from_json(data_dir: Path = Path("data"), path: Path = DB_PATH):
+    """Import data/letters.json, words.json and sentences.json, replacing the SQLite tables"""
+    conn = connect(path)
+    for name in TABLE_NAMES:
+        json_path = Path(data_dir) / f"{name}.json"
+        if not json_path.exists():
+            continue
+        with open(json_path, "r") as f:
+            data = json.load(f)
+        replace_table(name, data, conn)
+        print(f"Imported {len(data)} {name} from {json_path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SQLite storage backend")
+    parser.add_argument("command", choices=["migrate"])
+    parser.add_argument("--data-dir", type=Path, default=Path("data"))
+    parser.add_argument("--db", type=Path, default=DB_PATH)
+    args = parser.parse_args()
+    if args.command == "migrate":
+        migrate_from_json(args.data_dir, args.db)
@@ -0,0 +1,63 @@
+# components/table_index.py
+# Base for in-memory indexes over repository tables. An index is built from
+# the tables on first use, then kept current by save listeners that apply
+# each saved record's delta. It tracks the table generations it is in step
+# with: if a save was not the next write after the last one it saw (another
+# process, a whole-table write), it is rebuilt on the next lookup instead.
+import threading
+from functools import partial
+from typing import Optional, Sequence, Tuple
+
+from components.repository import add_save_listener, table_generation
+
+class TableIndex:
+    """
+    Subclasses implement _rebuild() (read the tables from scratch) and
+    _apply(table, record_id, old_record, new_record) (one save's delta), and
+    call _current() under self._lock before reading their state.
+    """
+
+    def __init__(self, tables: Sequence[str]):
+        self.tables = tuple(tables)
+        self.generation: Optional[Tuple[int, ...]] = None  # None: not built, or out of step
+        self.version = 0  # bumped on every change, for keying derived caches
+        self._lock = threading.RLock()
+        for table in self.tables:
+            add_save_listener(table, partial(self._on_save, table))
+
+    def _generations(self) -> Tuple[int, ...]:
+        return tuple(table_generation(table) for table in self.tables)
+
+    def _rebuild(self):
+        raise NotImplementedError
+
+    def _apply(self, table: str, record_id: str, old_record: Optional[dict], new_record: dict):
+        raise NotImplementedError
+
+    def _current(self):
+        """Rebuild unless in step with the tables; call with self._lock held"""
+        # read the generations first: a write landing during the rebuild
+        # then just triggers another one
+        generation = self._generations()
+        if generation != self.generation:
+            self._rebuild()
+            self.generation = generation
+            self.version += 1
+
+    def _on_save(self, table: str, record_id: str, old_record: Optional[dict], new_record: dict,
+                 generation: int):
+        with self._lock:
+            if self.generation is None:
+                return  # not built yet, or already due for a rebuild
+            changed = self.tables.index(table)
+            before = self.generation[changed]
+            if generation <= before:
+                return  # a rebuild already saw this save
+            if generation != before + 1:
+                # not the next save after the last one seen: rebuild on next lookup
+                self.generation = None
+                return
+            self._apply(table, record_id, old_record, new_record)
+            self.version += 1
+            # the other tables are compared on the next lookup
+            self.generation = self.generation[:changed] + (generation,) + self.generation[changed + 1:]
@@ -0,0 +1,124 @@
+# components/thumbnail_cache.py
+import hashlib
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Hashable, Iterable, Optional
+
+# Bump whenever render.py, raster.py or atlas.py change what a thumbnail looks
+# like: disk entries live under a per-version directory, and directories of
+# other versions are deleted the first time the cache writes.
+RENDER_VERSION = 2
+
+class ThumbnailCache:
+    """
+    Content-addressed thumbnail store with two tiers:
+    a bounded in-memory LRU and a bounded persistent directory of data URIs.
+
+    Keys describe what is drawn (glyph masks, format, size) and the disk tier
+    is namespaced by render version, so an entry never goes stale;
+    invalidation only drops entries tied to a letter id whose components
+    changed. The disk tier keeps at most `max_disk_entries` files and drops
+    the least recently used ones (by mtime) when it overflows.
+    """
+    def __init__(self, cache_dir: Path = Path("data/thumbnails"), max_entries: int = 4096,
+                 max_disk_entries: int = 65536, version: int = RENDER_VERSION):
+        self.root_dir = Path(cache_dir)
+        self.cache_dir = self.root_dir / f"v{version}"
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory = OrderedDict()
+        self._keys_by_letter = {}
+        self._disk_entries = None  # counted on the first write
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+
+    def _path(self, key: Hashable) -> Path:
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return self.cache_dir / digest[:2] / f"{digest}.txt"
+
+    def get(self, key: Hashable, letter_ids: Iterable[str] = ()) -> Optional[str]:
+        """Return a cached data URI, promoting disk hits into memory"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+        path = self._path(key)
+        try:
+            value = path.read_text()
+            os.utime(path)  # mark as recently used for pruning
+        except FileNotFoundError:
+            return None
+        self._remember(key, value, letter_ids)
+        return value
+
+    def put(self, key: Hashable, value: str, letter_ids: Iterable[str] = ()):
+        """Store a data URI in both tiers, tagged with the letter ids it depends on"""
+        self._remember(key, value, letter_ids)
+        path = self._path(key)
+        with self._disk_lock:
+            if self._disk_entries is None:
+                self._drop_other_versions()
+                self._disk_entries = sum(1 for _ in self._disk_files())
+            is_new = not path.exists()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(value)
+        os.replace(tmp_path, path)
+        if is_new:
+            with self._disk_lock:
+                self._disk_entries += 1
+                if self._disk_entries > self.max_disk_entries:
+                    self._prune_disk()
+
+    def _disk_files(self):
+        return self.cache_dir.glob("*/*.txt")
+
+    def _drop_other_versions(self):
+        """Delete disk entries written by other render versions"""
+        if not self.root_dir.is_dir():
+            return
+        for entry in self.root_dir.iterdir():
+            if entry != self.cache_dir and entry.is_dir():
+                shutil.rmtree(entry, ignore_errors=True)
+
+    def _prune_disk(self):
+        """Delete the least recently used disk entries down to 90% of the limit"""
+        entries = []
+        for path in self._disk_files():
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                pass
+        entries.sort()
+        excess = len(entries) - int(self.max_disk_entries * 0.9)
+        for _, path in entries[:max(excess, 0)]:
+            path.unlink(missing_ok=True)
+        self._disk_entries = len(entries) - max(excess, 0)
+
+    def _remember(self, key, value, letter_ids):
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            for letter_id in letter_ids:
+                self._keys_by_letter.setdefault(letter_id, set()).add(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def invalidate_letter(self, letter_id: str):
+        """Drop every entry rendered from the given letter id"""
+        with self._lock:
+            keys = self._keys_by_letter.pop(letter_id, set())
+            for key in keys:
+                self._memory.pop(key, None)
+        for key in keys:
+            self._path(key).unlink(missing_ok=True)
+
+    def clear_memory(self):
+        with self._lock:
+            self._memory.clear()
+            self._keys_by_letter.clear()
+
+thumbnail_cache = ThumbnailCache()
@@ -0,0 +1,135 @@
+# components/thumbnails.py
+import os
+from typing import Dict, List, Optional, Sequence
+
+from render import SymbolChain, SymbolGlyph, geometry_to_svg, svg_data_uri
+from raster import rasterize_glyph, rasterize_chain, png_data_uri
+from atlas import ATLAS_HEIGHT, load_atlas, compose_chain
+from components.thumbnail_cache import thumbnail_cache
+from components.render_pool import render_batch, submit_batch
+
+# the atlas height, so atlas thumbnails are composed without resampling
+LETTER_THUMBNAIL_HEIGHT = ATLAS_HEIGHT
+WORD_THUMBNAIL_HEIGHT = ATLAS_HEIGHT
+# "png" thumbnails are sliced from the sprite atlas (or rasterized, in
+# parallel on the rendering pool); "svg" thumbnails are plain string
+# formatting, need no atlas and stay sharp at any zoom level, but each one
+# carries the full outline and the browser has to draw it
+THUMBNAIL_FORMAT = os.environ.get("TUNIC_THUMBNAILS", "png")
+
+def letter_masks(letter_ids: List[str], letters_db: Dict) -> List[int]:
+    """Glyph masks of a word's letters, skipping unknown letters"""
+    return [
+        SymbolGlyph.from_components(letters_db[letter_id]["components"]).mask
+        for letter_id in letter_ids if letter_id in letters_db
+    ]
+
+def render_chain_image(masks: List[int], height: int):
+    """
+    Chain image sliced from the sprite atlas if it has been built at this
+    height, else rasterized.
+    """
+    atlas = load_atlas()
+    if atlas is not None and atlas.shape[1] == height:
+        return compose_chain(atlas, masks)
+    glyphs = [SymbolGlyph(mask) for mask in masks]
+    if len(glyphs) == 1:
+        return rasterize_glyph(glyphs[0], height=height)
+    return rasterize_chain(SymbolChain(glyphs), height=height)
+
+def render_chain_uri(masks: List[int], height: int, fmt: str = THUMBNAIL_FORMAT) -> str:
+    """Render a chain of glyph masks as an SVG or PNG data URI"""
+    if fmt == "svg":
+        geometry = SymbolChain([SymbolGlyph(mask) for mask in masks]).geometry()
+        return svg_data_uri(geometry_to_svg(geometry.segments, geometry.circles, len(masks), height))
+    if fmt == "png":
+        return png_data_uri(render_chain_image(masks, height))
+    raise ValueError(f"Unknown thumbnail format: {fmt}")
+
+def letter_thumbnail(components: List[str], fmt: str = THUMBNAIL_FORMAT) -> str:
+    """Render a letter thumbnail as a data URI"""
+    mask = SymbolGlyph.from_components(components).mask
+    key = ("letter", mask, fmt, LETTER_THUMBNAIL_HEIGHT)
+    uri = thumbnail_cache.get(key)
+    if uri is None:
+        uri = render_chain_uri([mask], LETTER_THUMBNAIL_HEIGHT, fmt)
+        thumbnail_cache.put(key, uri)
+    return uri
+
+def word_thumbnail(letter_ids: List[str], letters_db: Dict, fmt: str = THUMBNAIL_FORMAT) -> Optional[str]:
+    """Render a word thumbnail as a data URI, skipping unknown letters"""
+    masks = letter_masks(letter_ids, letters_db)
+    if not masks:
+        return None
+    key = ("word", tuple(letter_ids), tuple(masks), fmt, WORD_THUMBNAIL_HEIGHT)
+    uri = thumbnail_cache.get(key, letter_ids)
+    if uri is None:
+        uri = render_chain_uri(masks, WORD_THUMBNAIL_HEIGHT, fmt)
+        thumbnail_cache.put(key, uri, letter_ids)
+    return uri
+
+def _cached_batch(requests: List[tuple], fmt: str) -> List[Optional[str]]:
+    """
+    Resolve (key, masks, height, letter_ids) requests from the cache and
+    render all misses as one batch on the rendering pool.
+    """
+    uris = [
+        thumbnail_cache.get(key, letter_ids) if masks else None
+        for key, masks, height, letter_ids in requests
+    ]
+    misses = [i for i, uri in enumerate(uris) if uri is None and requests[i][1]]
+    rendered = render_batch([(tuple(requests[i][1]), requests[i][2], fmt) for i in misses])
+    for i, uri in zip(misses, rendered):
+        key, _, _, letter_ids = requests[i]
+        thumbnail_cache.put(key, uri, letter_ids)
+        uris[i] = uri
+    return uris
+
+def _prefetch(requests: List[tuple], fmt: str):
+    """Render cache misses in the background so a later page is served warm"""
+    # one render per distinct spec, stored under every key that needs it
+    # (words with different letter ids can share the same masks)
+    pending: Dict[tuple, List[tuple]] = {}
+    for key, masks, height, letter_ids in requests:
+        if masks and thumbnail_cache.get(key, letter_ids) is None:
+            pending.setdefault((tuple(masks), height, fmt), []).append((key, letter_ids))
+
+    def store(specs, uris):
+        for spec, uri in zip(specs, uris):
+            for key, letter_ids in pending[spec]:
+                thumbnail_cache.put(key, uri, letter_ids)
+
+    submit_batch(list(pending), store)
+
+def _letter_requests(components_list: Sequence[List[str]], fmt: str) -> List[tuple]:
+    requests = []
+    for components in components_list:
+        mask = SymbolGlyph.from_components(components).mask
+        requests.append((("letter", mask, fmt, LETTER_THUMBNAIL_HEIGHT), [mask], LETTER_THUMBNAIL_HEIGHT, ()))
+    return requests
+
+def _word_requests(letter_ids_list: Sequence[List[str]], letters_db: Dict, fmt: str) -> List[tuple]:
+    requests = []
+    for letter_ids in letter_ids_list:
+        masks = letter_masks(letter_ids, letters_db)
+        key = ("word", tuple(letter_ids), tuple(masks), fmt, WORD_THUMBNAIL_HEIGHT)
+        requests.append((key, masks, WORD_THUMBNAIL_HEIGHT, tuple(letter_ids)))
+    return requests
+
+def letter_thumbnails(components_list: Sequence[List[str]], fmt: str = THUMBNAIL_FORMAT) -> List[str]:
+    """Batch version of letter_thumbnail, in display order"""
+    return _cached_batch(_letter_requests(components_list, fmt), fmt)
+
+def word_thumbnails(letter_ids_list: Sequence[List[str]], letters_db: Dict,
+                    fmt: str = THUMBNAIL_FORMAT) -> List[Optional[str]]:
+    """Batch version of word_thumbnail, in display order"""
+    return _cached_batch(_word_requests(letter_ids_list, letters_db, fmt), fmt)
+
+def prefetch_letter_thumbnails(components_list: Sequence[List[str]], fmt: str = THUMBNAIL_FORMAT):
+    """Warm the cache for letters that are about to be shown"""
+    _prefetch(_letter_requests(components_list, fmt), fmt)
+
+def prefetch_word_thumbnails(letter_ids_list: Sequence[List[str]], letters_db: Dict,
+                             fmt: str = THUMBNAIL_FORMAT):
+    """Warm the cache for words that are about to be shown"""
+    _prefetch(_word_requests(letter_ids_list, letters_db, fmt), fmt)
@@ -0,0 +1,232 @@
+# components/translation_solver.py
+# Frequency-based translation as one global assignment between glyph words
+# and English words, instead of greedy rank-to-rank matching. Each glyph word
+# only considers a window of English words of similar frequency rank, which
+# keeps the cost table at (glyph words x window) entries, and the assignment
+# is solved with a vectorized (Jacobi) auction algorithm that hands its last
+# few rows to shortest augmenting paths. No scipy needed.
+import heapq
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+RANK_WEIGHT = 1.0
+LENGTH_WEIGHT = 0.5
+UNASSIGNED_COST = 10.0  # cost of leaving a word without a translation
+PRECISION = 1e-3  # auction eps as a fraction of the cost range
+AUGMENT_TAIL = 16  # below this many bidders, the rest take shortest augmenting paths
+
+def average_ranks(counts: np.ndarray) -> np.ndarray:
+    """0-based frequency ranks (most frequent first), ties sharing their average rank"""
+    counts = np.asarray(counts)
+    order = np.argsort(-counts, kind="stable")
+    ranks = np.empty(len(counts), dtype=np.float64)
+    ranks[order] = np.arange(len(counts))
+    _, groups = np.unique(-counts, return_inverse=True)
+    sums = np.bincount(groups, weights=ranks)
+    sizes = np.bincount(groups)
+    return (sums / sizes)[groups]
+
+def candidate_windows(glyph_counts: np.ndarray, pool_size: int, window: int) -> np.ndarray:
+    """
+    For every glyph word, positions in the rank-ordered English pool of the
+    `window` words around its own ordinal frequency rank. Tied glyph words
+    get consecutive ordinals, so their windows tile the pool instead of all
+    competing for the same few English words.
+    """
+    window = min(window, pool_size)
+    ordinals = np.empty(len(glyph_counts), dtype=np.int64)
+    ordinals[np.argsort(-np.asarray(glyph_counts), kind="stable")] = np.arange(len(glyph_counts))
+    starts = np.clip(ordinals - window // 2, 0, pool_size - window)
+    return starts[:, None] + np.arange(window)
+
+def candidate_costs(glyph_ranks: np.ndarray, glyph_lengths: np.ndarray,
+                    english_ranks: np.ndarray, english_lengths: np.ndarray,
+                    candidates: np.ndarray,
+                    rank_weight: float = RANK_WEIGHT, length_weight: float = LENGTH_WEIGHT) -> np.ndarray:
+    """Cost of each glyph word / candidate pair: log-rank distance plus relative length mismatch"""
+    valid = candidates >= 0
+    safe = np.where(valid, candidates, 0)
+    rank_cost = np.abs(np.log1p(glyph_ranks)[:, None] - np.log1p(english_ranks[safe]))
+    glyph_lengths = glyph_lengths[:, None].astype(np.float64)
+    lengths = english_lengths[safe].astype(np.float64)
+    length_cost = np.abs(lengths - glyph_lengths) / np.maximum(np.maximum(lengths, glyph_lengths), 1.0)
+    return np.where(valid, rank_weight * rank_cost + length_weight * length_cost, np.inf)
+
+def _augment(free_rows: np.ndarray, objects: np.ndarray, benefits: np.ndarray, prices: np.ndarray,
+             assignment: np.ndarray, owner: np.ndarray):
+    """
+    Place the remaining free rows one at a time along shortest augmenting
+    paths (Dijkstra over reduced costs, prices as potentials), updating the
+    arrays in place. Only objects scanned before the free object that ends
+    the path get dearer, so unassigned objects keep the lowest price.
+    """
+    if not len(free_rows):
+        return
+    object_rows, benefit_rows = objects.tolist(), benefits.tolist()
+    price, owner_list, assigned = prices.tolist(), owner.tolist(), assignment.tolist()
+    # benefit of each row's current object (a row's dummy may repeat in its columns)
+    held = np.where(objects == assignment[:, None], benefits, -np.inf).max(axis=1).tolist()
+    dist = [np.inf] * len(price)
+    via = [-1] * len(price)
+    done = [False] * len(price)
+    for source in free_rows.tolist():
+        touched, heap = [], []
+        row_objects, row_benefits = object_rows[source], benefit_rows[source]
+        potential = max(benefit - price[obj] for obj, benefit in zip(row_objects, row_benefits))
+        d, row = 0.0, source
+        while True:
+            for obj, benefit in zip(row_objects, row_benefits):
+                if done[obj]:
+                    continue
+                # reduced costs are >= -eps after the auction; clamp the slack
+                nd = max(d + potential - benefit + price[obj], d)
+                if nd < dist[obj]:
+                    if dist[obj] == np.inf:
+                        touched.append(obj)
+                    dist[obj], via[obj] = nd, row
+                    heapq.heappush(heap, (nd, obj))
+            while True:
+                d, obj = heapq.heappop(heap)
+                if not done[obj] and d <= dist[obj]:
+                    break
+            done[obj] = True
+            row = owner_list[obj]
+            if row < 0:
+                break  # reached a free object
+            row_objects, row_benefits = object_rows[row], benefit_rows[row]
+            potential = held[row] - price[obj]
+        for scanned in touched:
+            if done[scanned]:
+                price[scanned] += d - dist[scanned]
+        # flip the path back to the source
+        while True:
+            row = via[obj]
+            previous = assigned[row]
+            assigned[row], owner_list[obj] = obj, row
+            held[row] = max(benefit for o, benefit in zip(object_rows[row], benefit_rows[row]) if o == obj)
+            if row == source:
+                break
+            obj = previous
+        for scanned in touched:
+            dist[scanned], done[scanned] = np.inf, False
+    prices[:], owner[:], assignment[:] = price, owner_list, assigned
+
+def auction_assignment(candidates: np.ndarray, costs: np.ndarray,
+                       unassigned_cost: float = UNASSIGNED_COST,
+                       precision: float = PRECISION) -> np.ndarray:
+    """
+    Minimum-cost assignment of rows to distinct objects over a sparse
+    candidate table (row i may take candidates[i, j] at costs[i, j]; -1 or
+    an infinite cost marks no candidate). Every row may also stay unassigned
+    at unassigned_cost, through a private dummy object.
+
+    Forward auction, Jacobi style: every unassigned row bids at once each
+    round, raising the price of its best object by the margin over its
+    second best plus eps, and the highest bid on each object wins it. eps is
+    `precision` times the cost range, and each row ends within eps of its
+    best choice at the final prices. All prices start equal, so objects
+    nobody wants keep the lowest price, as the asymmetric problem requires.
+    The last few rows are the ones that would set off long price wars; they
+    are placed by shortest augmenting paths instead.
+    Returns the object of each row, or -1 for unassigned rows.
+    """
+    n_rows = len(candidates)
+    if n_rows == 0:
+        return np.zeros(0, dtype=np.int64)
+    n_objects = int(candidates.max(initial=-1)) + 1
+    # after the candidates: the row's dummy object, then an impossible
+    # placeholder so every row has a runner-up to measure its margin against
+    dummies = n_objects + np.arange(n_rows)[:, None]
+    valid = (candidates >= 0) & np.isfinite(costs)
+    objects = np.concatenate([np.where(valid, candidates, dummies), dummies, dummies], axis=1)
+    benefits = np.concatenate([np.where(valid, -costs, -np.inf),
+                               np.full((n_rows, 1), -unassigned_cost),
+                               np.full((n_rows, 1), -np.inf)], axis=1)
+    finite = benefits[np.isfinite(benefits)]
+    eps = precision * (float(finite.max() - finite.min()) or 1.0)
+    # a row with only its dummy bids as if the runner-up were this far behind
+    fallback_margin = unassigned_cost + 1.0
+
+    prices = np.zeros(n_objects + n_rows)
+    assignment = np.full(n_rows, -1, dtype=np.int64)
+    owner = np.full(n_objects + n_rows, -1, dtype=np.int64)
+    while True:
+        bidders = np.flatnonzero(assignment < 0)
+        if len(bidders) <= AUGMENT_TAIL:
+            _augment(bidders, objects, benefits, prices, assignment, owner)
+            break
+        bidder_objects = objects[bidders]
+        values = benefits[bidders] - prices[bidder_objects]
+        best_col = values.argmax(axis=1)
+        index = np.arange(len(bidders))
+        best = values[index, best_col]
+        values[index, best_col] = -np.inf
+        second = values.max(axis=1)
+        second = np.where(np.isfinite(second), second, best - fallback_margin)
+        targets = bidder_objects[index, best_col]
+        bids = prices[targets] + (best - second) + eps
+        # the highest bid on each object wins it
+        order = np.lexsort((bids, targets))
+        targets, bidders, bids = targets[order], bidders[order], bids[order]
+        last = np.r_[targets[1:] != targets[:-1], True]
+        targets, bidders, bids = targets[last], bidders[last], bids[last]
+        outbid = owner[targets]
+        assignment[outbid[outbid >= 0]] = -1
+        owner[targets] = bidders
+        assignment[bidders] = targets
+        prices[targets] = bids
+    return np.where((assignment >= 0) & (assignment < n_objects), assignment, -1)
+
+def solve_translations(glyph_ids: Sequence[str], glyph_counts: np.ndarray, glyph_lengths: np.ndarray,
+                       english_words: np.ndarray, english_counts: np.ndarray,
+                       known: Optional[Mapping[str, str]] = None,
+                       window: int = 64, top_k: int = 5,
+                       rank_weight: float = RANK_WEIGHT, length_weight: float = LENGTH_WEIGHT,
+                       unassigned_cost: float = UNASSIGNED_COST) -> List[dict]:
+    """
+    Assign English translations to glyph words by frequency.
+    Known words keep their translation, which is then unavailable to the
+    others. Returns one entry per glyph word with its assigned translation
+    (None if none fits), its cost, whether it was known, and its top_k
+    cheapest candidates as (english word, cost) pairs.
+    """
+    known = dict(known or {})
+    glyph_ids = list(glyph_ids)
+    glyph_counts = np.asarray(glyph_counts)
+    glyph_lengths = np.asarray(glyph_lengths)
+    english_words = np.asarray(english_words)
+    english_counts = np.asarray(english_counts)
+    glyph_ranks = average_ranks(glyph_counts)
+    english_ranks = average_ranks(english_counts)
+
+    # known translations are fixed and taken out of the pool
+    taken = np.isin(english_words, list(known.values()))
+    pool = np.flatnonzero(~taken)
+    pool = pool[np.argsort(english_ranks[pool], kind="stable")]
+    open_rows = np.array([i for i, glyph_id in enumerate(glyph_ids) if glyph_id not in known], dtype=np.int64)
+
+    window_positions = candidate_windows(glyph_counts[open_rows], len(pool), window)
+    candidates = np.where(window_positions >= 0, pool[np.maximum(window_positions, 0)], -1)
+    english_lengths = np.char.str_len(english_words.astype(str)) if len(english_words) else np.zeros(0, int)
+    costs = candidate_costs(glyph_ranks[open_rows], glyph_lengths[open_rows],
+                            english_ranks, english_lengths, candidates, rank_weight, length_weight)
+    assignment = auction_assignment(candidates, costs, unassigned_cost)
+
+    solution = []
+    row_of = {row: i for i, row in enumerate(open_rows)}
+    for row, glyph_id in enumerate(glyph_ids):
+        if glyph_id in known:
+            solution.append({"word_id": glyph_id, "translation": known[glyph_id], "cost": 0.0,
+                             "known": True, "candidates": []})
+            continue
+        i = row_of[row]
+        order = np.argsort(costs[i], kind="stable")[:top_k]
+        ranked = [(str(english_words[candidates[i, j]]), float(costs[i, j]))
+                  for j in order if np.isfinite(costs[i, j])]
+        chosen = assignment[i]
+        cost = float(costs[i][candidates[i] == chosen][0]) if chosen >= 0 else unassigned_cost
+        solution.append({"word_id": glyph_id,
+                         "translation": str(english_words[chosen]) if chosen >= 0 else None,
+                         "cost": cost, "known": False, "candidates": ranked})
+    return solution
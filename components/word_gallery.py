@@ -5,59 +5,21 @@ import matplotlib.pyplot as plt
 from pathlib import Path
 import json
 from typing import Dict, Optional, List
-import io
-import base64
-from PIL import Image
 from st_clickable_images import clickable_images
 
-from components.analytics import get_freq_distibution
-
-def load_letters():
-    """Load all saved letters from the database"""
-    db_path = Path("data/letters.json")
-    if db_path.exists():
-        with open(db_path, "r") as f:
-            return json.load(f)
-    return {}
-
-def load_words():
-    """Load all saved words from the database"""
-    db_path = Path("data/words.json")
-    if db_path.exists():
-        with open(db_path, "r") as f:
-            return json.load(f)
-    return {}
-
-def load_sentences():
-    """Load all saved sentences from the database"""
-    db_path = Path("data/sentences.json")
-    if db_path.exists():
-        with open(db_path, "r") as f:
-            return json.load(f)
-    return {}
+from components.frequencies import frequency_store
+from components.repository import initialize_table, load_letters, load_words, load_sentences, save_record, table_generation
+from components.thumbnails import WORD_THUMBNAIL_HEIGHT, word_thumbnails, prefetch_word_thumbnails
+from components.pagination import paginate, sorted_index
+from components.word_index import LETTER_QUERIES
 
 def initialize_words_db():
     """Initialize the words database if it doesn't exist"""
-    db_path = Path("data/words.json")
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    if not db_path.exists():
-        with open(db_path, "w") as f:
-            json.dump({}, f)
-    
-    return db_path
+    return initialize_table("words")
 
 def save_word(word_data: dict):
     """Save a word to the database"""
-    db_path = initialize_words_db()
-    with open(db_path, "r") as f:
-        db = json.load(f)
-    
-    word_id = word_data["id"]
-    db[word_id] = word_data
-    
-    with open(db_path, "w") as f:
-        json.dump(db, f, indent=2)
+    save_record("words", word_data)
 
 def create_glyph_from_letter_id(letter_id: str, letters_db: Dict) -> Optional[SymbolGlyph]:
     """Create a glyph from a letter ID using the letters database"""
@@ -66,11 +28,7 @@ def create_glyph_from_letter_id(letter_id: str, letters_db: Dict) -> Optional[Sy
         return None
         
     letter_data = letters_db[letter_id]
-    glyph = SymbolGlyph()
-    for comp in letter_data["components"]:
-        component_value = getattr(GlyphComponents, comp)
-        glyph.activate_component(component_value)
-    return glyph
+    return SymbolGlyph.from_components(letter_data["components"])
 
 def create_word_preview(letter_ids: List[str], letters_db: Dict) -> Optional[plt.Figure]:
     """Create a preview figure for a word from its letter IDs"""
@@ -89,55 +47,66 @@ def create_word_preview(letter_ids: List[str], letters_db: Dict) -> Optional[plt
     plt.close()
     return fig
 
-def render_word_gallery(words_db: Dict, columns: int = 4, callback=None):
-    """Render a grid of clickable word previews with their IDs and translations, sorted by frequency"""
+def render_word_gallery(words_db: Dict, columns: int = 4, callback=None,
+                        gallery_key: str = "word_gallery", prefetch: bool = True):
+    """
+    Render a grid of clickable word previews with their IDs and translations, sorted by frequency.
+    Only the current page of matching words is rendered.
+    """
     
     if not words_db:
         st.write("No words saved yet!")
         return
     
-    # Load letters database for rendering and get frequency distribution
+    # Load letters database for rendering and the word frequency counts
     letters_db = load_letters()
-    sentences_db = load_sentences()
-    word_frequency, word_counts, _, _ = get_freq_distibution(letters_db, words_db, sentences_db)
-    
-    # Create frequency lookup dictionary
-    frequency_dict = dict(zip(word_frequency, word_counts))
+    frequency_dict = frequency_store.word_counts()
     
     # Add search/filter options
     search_term = st.text_input("Search words (ID, translation, or location)", "")
     
-    # Filter words based on search
-    filtered_words = {
-        id_: data for id_, data in words_db.items()
-        if (search_term.lower() in id_.lower() or
-            search_term.lower() in data.get("translation", "").lower() or
-            search_term.lower() in data.get("location_found", "").lower())
-    }
-    
     selected_letters = st.session_state.get("filter_by_letters", [])
+    letter_query = "contains all"
     if len(selected_letters) > 0:
-        # filter down only to words
-        # containing all selected letters
-        new_filtered_words = {}
-        for word_id, word_data in filtered_words.items():
-            word_letters = word_data["letter_ids"]
-            if all([letter_id in word_letters for letter_id in selected_letters]):
-                new_filtered_words[word_id] = word_data
+        letter_query = st.radio("Letter filter", list(LETTER_QUERIES), horizontal=True,
+                                key=f"{gallery_key}_letter_query")
+        # only the words matching the selected letters, looked up in the
+        # inverted letter index and sorted by frequency; the index lists them
+        # in save order, so ties come out as in the full listing below
+        matching_ids = sorted(
+            (word_id for word_id in LETTER_QUERIES[letter_query](selected_letters) if word_id in words_db),
+            key=lambda word_id: frequency_dict.get(word_id, 0),
+            reverse=True,
+        )
+    else:
+        # Sort all words by frequency once, reusing the order across reruns
+        matching_ids = sorted_index(
+            gallery_key,
+            (len(words_db), table_generation("words"), frequency_store.version),
+            words_db,
+            sort_key=lambda word_id: frequency_dict.get(word_id, 0),  # Default to 0 if word not found
+        )
 
-        filtered_words = new_filtered_words
+    # Filter words based on search
+    if search_term:
+        term = search_term.lower()
+        matching_ids = [
+            word_id for word_id in matching_ids
+            if word_id in words_db and
+               (term in word_id.lower() or
+                term in words_db[word_id].get("translation", "").lower() or
+                term in words_db[word_id].get("location_found", "").lower())
+        ]
 
-    if not filtered_words:
+    if not matching_ids:
         st.write("No matching words found.")
         return
     
-    # Sort filtered words by frequency
-    sorted_items = sorted(
-        filtered_words.items(),
-        key=lambda x: frequency_dict.get(x[0], 0),  # Default to 0 if word not found
-        reverse=True
-    )
-    filtered_words = dict(sorted_items)
+    # Only the visible page is rendered, and only its records are looked up
+    page_ids, next_ids = paginate(gallery_key, matching_ids,
+                                  filter_signature=(search_term, tuple(selected_letters), letter_query))
+    filtered_words = {word_id: words_db[word_id] for word_id in page_ids if word_id in words_db}
+    next_items = [(word_id, words_db[word_id]) for word_id in next_ids if word_id in words_db]
     
     # Create lists to store the encoded images, titles, and word data
     images = []
@@ -145,21 +114,15 @@ def render_word_gallery(words_db: Dict, columns: int = 4, callback=None):
     word_data_list = []
     ordered_word_ids = []  # Keep track of word IDs in display order
     
+    # Render all thumbnails as one batch, in display order
+    thumbnails = word_thumbnails([word_data["letter_ids"] for word_data in filtered_words.values()], letters_db)
+    if prefetch and next_items:
+        prefetch_word_thumbnails([word_data["letter_ids"] for _, word_data in next_items], letters_db)
+    
     # Iterate over the filtered and sorted words
-    for word_id, word_data in filtered_words.items():
-        fig = create_word_preview(word_data["letter_ids"], letters_db)
-        if fig:
-            # Convert Matplotlib figure to PIL image
-            buf = io.BytesIO()
-            fig.savefig(buf, format='png')
-            buf.seek(0)
-            img = Image.open(buf)
-            
-            # Encode the image as base64
-            buffered = io.BytesIO()
-            img.save(buffered, format="PNG")
-            encoded_img = base64.b64encode(buffered.getvalue()).decode()
-            images.append(f"data:image/png;base64,{encoded_img}")
+    for (word_id, word_data), img in zip(filtered_words.items(), thumbnails):
+        if img:
+            images.append(img)
             
             # Add the title, word data, and ID
             freq = frequency_dict.get(word_id, 0)
@@ -172,7 +135,7 @@ def render_word_gallery(words_db: Dict, columns: int = 4, callback=None):
         images,
         titles=titles,
         div_style={"display": "flex", "justify-content": "center", "flex-wrap": "wrap"},
-        img_style={"margin": "5px", "height": "150px", "width": "auto"},
+        img_style={"margin": "5px", "height": f"{WORD_THUMBNAIL_HEIGHT}px", "width": "auto"},
     )
     
     if clicked_index > -1:
@@ -0,0 +1,145 @@
+# components/word_index.py
+# Inverted index from letter id to the words spelled with it. Each letter has
+# a posting list of (word number, position) pairs sorted by word number, where
+# word numbers follow the words table's save order. Queries intersect sorted
+# posting arrays, so they cost time in proportion to the postings of the
+# queried letters rather than to the whole vocabulary.
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from components.repository import load_table
+from components.table_index import TableIndex
+
+_EMPTY = np.array([], dtype=np.int64)
+
+class _Posting:
+    """(word, position) pairs of one letter, sorted, plus the distinct words"""
+    __slots__ = ("words", "positions", "docs")
+
+    def __init__(self, words: np.ndarray, positions: np.ndarray):
+        order = np.lexsort((positions, words))
+        self.words = words[order]
+        self.positions = positions[order]
+        self.docs = np.unique(self.words)
+
+class LetterWordIndex(TableIndex):
+    def __init__(self, table: str = "words"):
+        self.word_ids: List[str] = []
+        self.word_numbers: Dict[str, int] = {}
+        self.lengths = _EMPTY
+        self.postings: Dict[str, _Posting] = {}
+        super().__init__([table])
+
+    def _rebuild(self):
+        words = load_table(self.tables[0])
+        self.word_ids = list(words)
+        self.word_numbers = {word_id: i for i, word_id in enumerate(self.word_ids)}
+        self.lengths = np.array([len(word["letter_ids"]) for word in words.values()], dtype=np.int64)
+        pairs: Dict[str, Tuple[list, list]] = {}
+        for number, word in enumerate(words.values()):
+            for position, letter_id in enumerate(word["letter_ids"]):
+                numbers, positions = pairs.setdefault(letter_id, ([], []))
+                numbers.append(number)
+                positions.append(position)
+        self.postings = {
+            letter_id: _Posting(np.array(numbers, dtype=np.int64), np.array(positions, dtype=np.int64))
+            for letter_id, (numbers, positions) in pairs.items()
+        }
+
+    def _apply(self, table: str, word_id: str, old_word: Optional[dict], new_word: dict):
+        number = self.word_numbers.get(word_id)
+        if number is None:
+            number = self.word_numbers[word_id] = len(self.word_ids)
+            self.word_ids.append(word_id)
+            self.lengths = np.append(self.lengths, 0)
+        # only the postings of the letters involved are touched
+        old_letters = set(old_word["letter_ids"]) if old_word else set()
+        for letter_id in old_letters | set(new_word["letter_ids"]):
+            posting = self.postings.get(letter_id)
+            words, positions = (posting.words, posting.positions) if posting is not None else (_EMPTY, _EMPTY)
+            keep = words != number
+            new_positions = [i for i, other in enumerate(new_word["letter_ids"]) if other == letter_id]
+            words = np.concatenate([words[keep], np.full(len(new_positions), number, dtype=np.int64)])
+            positions = np.concatenate([positions[keep], np.array(new_positions, dtype=np.int64)])
+            if len(words):
+                self.postings[letter_id] = _Posting(words, positions)
+            else:
+                self.postings.pop(letter_id, None)
+        self.lengths[number] = len(new_word["letter_ids"])
+
+    def _ids(self, numbers: np.ndarray) -> List[str]:
+        return [self.word_ids[number] for number in numbers]
+
+    def words_with_all(self, letter_ids: Sequence[str]) -> List[str]:
+        """Words containing every one of the letters, anywhere and in any order"""
+        with self._lock:
+            self._current()
+            if not letter_ids:
+                return list(self.word_ids)
+            postings = [self.postings.get(letter_id) for letter_id in set(letter_ids)]
+            if any(posting is None for posting in postings):
+                return []
+            # intersect smallest first, so every step is bounded by the result so far
+            postings.sort(key=lambda posting: len(posting.docs))
+            numbers = postings[0].docs
+            for posting in postings[1:]:
+                numbers = np.intersect1d(numbers, posting.docs, assume_unique=True)
+            return self._ids(numbers)
+
+    def _sequence_starts(self, letter_ids: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """(word, start position) of every occurrence of the letters, adjacent and in order"""
+        stride = int(self.lengths.max(initial=0)) + 1
+        keys = None
+        # rarest letter first; each posting is shifted back to the start position
+        for offset in sorted(range(len(letter_ids)), key=lambda i: self._posting_size(letter_ids[i])):
+            posting = self.postings.get(letter_ids[offset])
+            if posting is None:
+                return _EMPTY, _EMPTY
+            starts = posting.positions - offset
+            valid = starts >= 0
+            candidate = posting.words[valid] * stride + starts[valid]
+            keys = candidate if keys is None else np.intersect1d(keys, candidate)
+            if len(keys) == 0:
+                break
+        return keys // stride, keys % stride
+
+    def _posting_size(self, letter_id: str) -> int:
+        posting = self.postings.get(letter_id)
+        return 0 if posting is None else len(posting.words)
+
+    def words_with_sequence(self, letter_ids: Sequence[str]) -> List[str]:
+        """Words containing the letters next to each other, in this order"""
+        with self._lock:
+            self._current()
+            if not letter_ids:
+                return list(self.word_ids)
+            numbers, _ = self._sequence_starts(letter_ids)
+            return self._ids(np.unique(numbers))
+
+    def words_with_prefix(self, letter_ids: Sequence[str]) -> List[str]:
+        """Words that start with the letters, in this order"""
+        with self._lock:
+            self._current()
+            if not letter_ids:
+                return list(self.word_ids)
+            numbers, starts = self._sequence_starts(letter_ids)
+            return self._ids(np.unique(numbers[starts == 0]))
+
+    def words_with_suffix(self, letter_ids: Sequence[str]) -> List[str]:
+        """Words that end with the letters, in this order"""
+        with self._lock:
+            self._current()
+            if not letter_ids:
+                return list(self.word_ids)
+            numbers, starts = self._sequence_starts(letter_ids)
+            return self._ids(np.unique(numbers[starts == self.lengths[numbers] - len(letter_ids)]))
+
+letter_word_index = LetterWordIndex()
+
+LETTER_QUERIES = {
+    "contains all": letter_word_index.words_with_all,
+    "adjacent, in order": letter_word_index.words_with_sequence,
+    "starts with": letter_word_index.words_with_prefix,
+    "ends with": letter_word_index.words_with_suffix,
+}
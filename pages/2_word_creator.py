@@ -10,7 +10,22 @@ from components.word_gallery import render_word_gallery, save_word, load_words,
 from components.letter_gallery import load_letters, render_letter_gallery, letter_creator_interface
 from components.sentence_gallery import load_sentences
 from components.identity import find_duplicate_word
-from components.analytics import translate_words_from_english_freq
+from components.analytics import TRANSLATION_METHODS, apply_translation_diff, submit_translation
+from components.frequencies import frequency_store
+
+@st.fragment(run_every=1.0)
+def translation_progress():
+    """Poll the background translation and rerun the page once its diff is ready"""
+    job = st.session_state.translation_job
+    if not job.done():
+        st.info("Solving translations in the background...")
+        return
+    st.session_state.translation_job = None
+    try:
+        st.session_state.translation_diff = job.result()
+    except FileNotFoundError:
+        st.session_state.translation_missing_english = True
+    st.rerun()
 
 def word_creator():
     st.title("Word Creator")
@@ -79,7 +94,7 @@ def word_creator():
                                  help="Where in the game this word appears")
             
             # Check for duplicates before showing save controls
-            duplicate_id = find_duplicate_word(st.session_state.current_word_letters, words_db) 
+            duplicate_id = find_duplicate_word(st.session_state.current_word_letters)
             if duplicate_id:
                 st.warning(f"⚠️ This word configuration already exists with ID: '{duplicate_id}'")
             
@@ -99,21 +114,45 @@ def word_creator():
                 st.success(f"Word '{word_id}' saved successfully!")
 
     with tab3:
-        if st.button("Translate from English word frequency distribution"):
-            try:
-                letters, words, sentences = load_letters(), load_words(), load_sentences()
-                translate_words_from_english_freq(
-                    letters,
-                    words,
-                    sentences
-                )
-                st.warning("Word translations have been updated in the database!")
-            except FileNotFoundError:
-                msg = "Error: No English language data found on this device."
-                msg += "\nPlease acquire some English text and place it in a file called"
-                msg += "\nenglish_sample.txt next to this program entrypoint (app.py)"
-                st.error(msg)
+        method = st.radio("Translation method", list(TRANSLATION_METHODS), horizontal=True,
+                          help="rank order pairs words of equal frequency rank; global assignment "
+                               "picks the best overall matching by rank and word length")
+        if st.button("Translate from English word frequency distribution",
+                     disabled=st.session_state.get("translation_job") is not None):
+            letters, words, sentences = load_letters(), load_words(), load_sentences()
+            # dry run first: the diff is shown for review before anything is saved
+            st.session_state.translation_diff = None
+            st.session_state.translation_job = submit_translation(letters, words, sentences, method=method)
+        if st.session_state.get("translation_job") is not None:
+            translation_progress()
+        if st.session_state.pop("translation_missing_english", False):
+            msg = "Error: No English language data found on this device."
+            msg += "\nPlease acquire some English text and place it in a file called"
+            msg += "\nenglish_sample.txt next to this program entrypoint (app.py)"
+            st.error(msg)
+
+        diff = st.session_state.get("translation_diff")
+        if diff is not None:
+            st.write(f"Proposed translation changes: {len(diff['changes'])}")
+            if diff["changes"]:
+                st.dataframe(diff["changes"], hide_index=True)
+            if diff["skipped"]:
+                st.write(f"Known words kept as they are: {len(diff['skipped'])}")
+                st.dataframe(diff["skipped"], hide_index=True)
+            apply_col, discard_col = st.columns(2)
+            with apply_col:
+                if st.button("Apply translations", disabled=not diff["changes"]):
+                    applied = apply_translation_diff(diff)
+                    st.session_state.translation_diff = None
+                    st.warning(f"{len(applied)} word translations have been updated in the database!")
+            with discard_col:
+                if st.button("Discard"):
+                    st.session_state.translation_diff = None
+                    st.rerun()
 
+        if st.button("Recount word and letter frequencies"):
+            frequency_store.rebuild()
+            st.success("Frequency counts rebuilt from the database.")
 
         render_word_gallery(words_db)
 
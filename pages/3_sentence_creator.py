@@ -7,7 +7,7 @@ from pathlib import Path
 
 from components.letter_gallery import render_letter_gallery, load_letters
 from components.word_gallery import render_word_gallery, load_words
-from components.sentence_gallery import render_sentence_gallery, load_sentences, save_sentence, render_sentence_preview
+from components.sentence_gallery import render_sentence_gallery, load_sentences, save_sentence, show_sentence_image
 
 def sentence_creator():
     st.title("Sentence Creator")
@@ -73,28 +73,8 @@ def sentence_creator():
         if st.session_state.current_sentence:
             st.write("Symbolic Preview:")
             
-            # Create container for inline display
-            preview_container = st.container()
-            with preview_container:
-                cols = st.columns(len(st.session_state.current_sentence))
-                # if st.session_state.get("cleared"):
-                #     st.session_state.cleared = st.session_state.current_sentence = []
-                #     cols = st.columns(1)
-                
-                # Get all preview components
-                preview_components = render_sentence_preview(
-                    st.session_state.current_sentence, 
-                    words_db
-                )
-                
-                # Display components inline
-                for idx, (content, type_) in enumerate(preview_components):
-                    with cols[idx]:
-                        if type_ == "word":
-                            st.pyplot(content)
-                        else:
-                            st.markdown(f"<h2 style='text-align: center;'>{content}</h2>", 
-                                        unsafe_allow_html=True)
+            # Whole sentence as a single image
+            show_sentence_image(st.session_state.current_sentence, words_db, letters_db)
             
             # Translation preview
             st.write("Translation Preview:")
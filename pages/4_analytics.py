@@ -0,0 +1,87 @@
+# pages/4_analytics.py
+import streamlit as st
+import pandas as pd
+
+from components.letter_stats import WEIGHTINGS, letter_statistics
+from components.repository import load_letters, load_words
+from components.thumbnails import word_thumbnails
+
+TOP_N = 25
+
+def _glyph_table(letter_chains, counts, letters_db):
+    """Table of letter sequences with their rendered glyphs and counts"""
+    return pd.DataFrame({
+        "glyphs": word_thumbnails(letter_chains, letters_db),
+        "letters": [" · ".join(chain) for chain in letter_chains],
+        "count": counts,
+    })
+
+def analytics():
+    st.title("Analytics")
+    letters_db = load_letters()
+    words_db = load_words()
+
+    weighting = st.radio(
+        "Count letters per", WEIGHTINGS, horizontal=True,
+        help="vocabulary counts every saved word once; occurrences weights each "
+             "word by how often it appears in the recorded sentences",
+    )
+    glyph_column = {"glyphs": st.column_config.ImageColumn("glyphs")}
+    tab1, tab2, tab3, tab4 = st.tabs(["Bigrams", "Trigrams", "Positions", "Word adjacency"])
+
+    with tab1:
+        letter_ids, matrix = letter_statistics.bigrams(weighting)
+        if not matrix.any():
+            st.info("No letter pairs yet.")
+        else:
+            rows, cols = matrix.nonzero()
+            order = (-matrix[rows, cols]).argsort(kind="stable")[:TOP_N]
+            chains = [[str(letter_ids[rows[i]]), str(letter_ids[cols[i]])] for i in order]
+            st.subheader(f"Top {len(chains)} letter pairs")
+            st.dataframe(_glyph_table(chains, matrix[rows[order], cols[order]], letters_db),
+                         column_config=glyph_column, hide_index=True)
+            st.subheader("All pairs (row letter followed by column letter)")
+            st.dataframe(pd.DataFrame(matrix, index=letter_ids, columns=letter_ids))
+
+    with tab2:
+        letter_ids, triples, counts = letter_statistics.trigrams(weighting)
+        if not len(counts):
+            st.info("No letter triples yet.")
+        else:
+            chains = [[str(letter_ids[i]) for i in triple] for triple in triples[:TOP_N]]
+            st.subheader(f"Top {len(chains)} letter triples")
+            st.dataframe(_glyph_table(chains, counts[:TOP_N], letters_db),
+                         column_config=glyph_column, hide_index=True)
+
+    with tab3:
+        letter_ids, matrix = letter_statistics.positions(weighting)
+        if not matrix.any():
+            st.info("No letters yet.")
+        else:
+            st.subheader("Letter by position in word")
+            table = pd.DataFrame(matrix, columns=[f"#{p + 1}" for p in range(matrix.shape[1])])
+            table.insert(0, "glyphs", word_thumbnails([[str(letter_id)] for letter_id in letter_ids], letters_db))
+            table.insert(1, "letter", letter_ids)
+            st.dataframe(table, column_config=glyph_column, hide_index=True)
+
+    with tab4:
+        word_ids, pairs, counts = letter_statistics.word_adjacency()
+        if not len(counts):
+            st.info("No word pairs in the recorded sentences yet.")
+        else:
+            st.subheader(f"Top {min(TOP_N, len(counts))} consecutive word pairs")
+            pairs = pairs[:TOP_N]
+
+            def translation(word_id):
+                return words_db.get(word_id, {}).get("translation", "")
+
+            st.dataframe(pd.DataFrame({
+                "first": [str(word_ids[i]) for i in pairs[:, 0]],
+                "second": [str(word_ids[i]) for i in pairs[:, 1]],
+                "translation": [f"{translation(str(word_ids[a]))} {translation(str(word_ids[b]))}".strip()
+                                for a, b in pairs],
+                "count": counts[:TOP_N],
+            }), hide_index=True)
+
+if __name__ == "__main__":
+    analytics()
@@ -0,0 +1,136 @@
+"""Pure NumPy rasterizer for glyph and chain geometry.
+
+Draws the segment/circle tables compiled in render.py straight into a
+uint8 canvas (white background, black ink) without going through
+matplotlib, so gallery thumbnails skip figure setup entirely.
+"""
+import base64
+import io
+from typing import Tuple
+
+import numpy as np
+from PIL import Image
+
+from render import SymbolConfig, SymbolGlyph, SymbolChain
+
+STROKE_WIDTH = SymbolConfig.STROKE_WIDTH
+MARGIN = SymbolConfig.VIEW_MARGIN
+Y_RANGE = (SymbolConfig.VERTICAL_EXTENSION_DOWN - MARGIN, SymbolConfig.VERTICAL_EXTENSION_UP + MARGIN)
+
+def glyph_x_range(n_glyphs: int = 1) -> Tuple[float, float]:
+    """Horizontal extent of a chain of n glyphs, margin included"""
+    step = SymbolConfig.GLYPH_WIDTH + SymbolConfig.GLYPH_SPACING
+    return (-MARGIN, n_glyphs * step + MARGIN)
+
+def pixel_scale(height: int, y_range: Tuple[float, float] = Y_RANGE) -> float:
+    """Pixels per glyph unit for a canvas of the given height"""
+    return height / (y_range[1] - y_range[0])
+
+def _pixel_grid(x_range, y_range, scale, x_lo, x_hi, y_lo, y_hi):
+    """Glyph-space coordinates of the pixel centers in a clipped window"""
+    xs = x_range[0] + (np.arange(x_lo, x_hi) + 0.5) / scale
+    ys = y_range[1] - (np.arange(y_lo, y_hi) + 0.5) / scale
+    return xs[None, :], ys[:, None]
+
+def _window(ink: np.ndarray, x_range, y_range, scale, x0, y0, x1, y1, pad):
+    """Clip a glyph-space bounding box to pixel indices of the canvas"""
+    height, width = ink.shape
+    x_lo = max(int(np.floor((min(x0, x1) - x_range[0] - pad) * scale)), 0)
+    x_hi = min(int(np.ceil((max(x0, x1) - x_range[0] + pad) * scale)) + 1, width)
+    y_lo = max(int(np.floor((y_range[1] - max(y0, y1) - pad) * scale)), 0)
+    y_hi = min(int(np.ceil((y_range[1] - min(y0, y1) + pad) * scale)) + 1, height)
+    return x_lo, x_hi, y_lo, y_hi
+
+def draw_segments(ink: np.ndarray, segments: np.ndarray, x_range, y_range,
+                  stroke_width: float = STROKE_WIDTH) -> np.ndarray:
+    """Draw anti-aliased thick segments into a float ink canvas in place"""
+    scale = ink.shape[0] / (y_range[1] - y_range[0])
+    half = stroke_width / 2
+    feather = 0.5 / scale  # half a pixel of anti-aliasing
+    for x0, y0, x1, y1 in segments:
+        x_lo, x_hi, y_lo, y_hi = _window(ink, x_range, y_range, scale, x0, y0, x1, y1, half + 2 * feather)
+        if x_lo >= x_hi or y_lo >= y_hi:
+            continue
+        px, py = _pixel_grid(x_range, y_range, scale, x_lo, x_hi, y_lo, y_hi)
+        dx, dy = x1 - x0, y1 - y0
+        length_sq = dx * dx + dy * dy
+        if length_sq > 0:
+            t = np.clip(((px - x0) * dx + (py - y0) * dy) / length_sq, 0.0, 1.0)
+        else:
+            t = 0.0
+        dist = np.hypot(px - (x0 + t * dx), py - (y0 + t * dy))
+        coverage = np.clip((half + feather - dist) * scale, 0.0, 1.0)
+        window = ink[y_lo:y_hi, x_lo:x_hi]
+        np.maximum(window, coverage, out=window)
+    return ink
+
+def draw_circles(ink: np.ndarray, circles: np.ndarray, x_range, y_range,
+                 stroke_width: float = STROKE_WIDTH) -> np.ndarray:
+    """Draw anti-aliased circle outlines into a float ink canvas in place"""
+    scale = ink.shape[0] / (y_range[1] - y_range[0])
+    half = stroke_width / 2
+    feather = 0.5 / scale
+    for cx, cy, radius in circles:
+        pad = radius + half + 2 * feather
+        x_lo, x_hi, y_lo, y_hi = _window(ink, x_range, y_range, scale, cx, cy, cx, cy, pad)
+        if x_lo >= x_hi or y_lo >= y_hi:
+            continue
+        px, py = _pixel_grid(x_range, y_range, scale, x_lo, x_hi, y_lo, y_hi)
+        dist = np.abs(np.hypot(px - cx, py - cy) - radius)
+        coverage = np.clip((half + feather - dist) * scale, 0.0, 1.0)
+        window = ink[y_lo:y_hi, x_lo:x_hi]
+        np.maximum(window, coverage, out=window)
+    return ink
+
+def rasterize_ink(segments: np.ndarray, circles: np.ndarray,
+                  x_range: Tuple[float, float], height: int,
+                  y_range: Tuple[float, float] = Y_RANGE,
+                  stroke_width: float = STROKE_WIDTH,
+                  fraction_line: bool = True) -> np.ndarray:
+    """Rasterize a segment and circle table into a float ink coverage canvas"""
+    scale = pixel_scale(height, y_range)
+    width = max(int(round((x_range[1] - x_range[0]) * scale)), 1)
+    ink = np.zeros((height, width), dtype=np.float32)
+    if fraction_line:
+        fraction = np.array([[x_range[0], SymbolConfig.FRACTION_Y, x_range[1], SymbolConfig.FRACTION_Y]])
+        draw_segments(ink, fraction, x_range, y_range, stroke_width)
+    draw_segments(ink, segments, x_range, y_range, stroke_width)
+    draw_circles(ink, circles, x_range, y_range, stroke_width)
+    return ink
+
+def rasterize_geometry(segments: np.ndarray, circles: np.ndarray,
+                       x_range: Tuple[float, float], height: int,
+                       y_range: Tuple[float, float] = Y_RANGE,
+                       stroke_width: float = STROKE_WIDTH,
+                       fraction_line: bool = True) -> np.ndarray:
+    """Rasterize a segment and circle table into a uint8 grayscale image"""
+    return ink_to_image(rasterize_ink(segments, circles, x_range, height,
+                                      y_range, stroke_width, fraction_line))
+
+def ink_to_image(ink: np.ndarray) -> np.ndarray:
+    """Convert a float ink coverage canvas to black-on-white uint8 pixels"""
+    return (255 - np.rint(ink * 255)).astype(np.uint8)
+
+def rasterize_glyph(glyph: SymbolGlyph, height: int = 150,
+                    stroke_width: float = STROKE_WIDTH) -> np.ndarray:
+    """Rasterize a single glyph, fraction line included"""
+    geometry = glyph.geometry()
+    return rasterize_geometry(geometry.segments, geometry.circles, glyph_x_range(1),
+                              height, stroke_width=stroke_width)
+
+def rasterize_chain(chain: SymbolChain, height: int = 150,
+                    stroke_width: float = STROKE_WIDTH) -> np.ndarray:
+    """Rasterize a chain of glyphs sharing one fraction line"""
+    geometry = chain.geometry()
+    return rasterize_geometry(geometry.segments, geometry.circles, glyph_x_range(len(chain.glyphs)),
+                              height, stroke_width=stroke_width)
+
+def png_bytes(image: np.ndarray, optimize: bool = False) -> bytes:
+    """Encode a uint8 grayscale image as PNG"""
+    buffered = io.BytesIO()
+    Image.fromarray(image).save(buffered, format="PNG", optimize=optimize)
+    return buffered.getvalue()
+
+def png_data_uri(image: np.ndarray) -> str:
+    """Encode a uint8 grayscale image as a base64 PNG data URI"""
+    return f"data:image/png;base64,{base64.b64encode(png_bytes(image)).decode()}"
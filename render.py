@@ -1,7 +1,11 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection, PatchCollection
+from matplotlib.patches import Circle
 from dataclasses import dataclass
-from typing import List, Optional, Sequence
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from urllib.parse import quote
+from xml.sax.saxutils import escape
 
 class SymbolConfig:
     """Configuration constants for symbol rendering"""
@@ -22,6 +26,11 @@ class SymbolConfig:
     GLYPH_SPACING = 0.0  # spacing between glyphs (0 for shared verticals)
     BRIDGE_LENGTH = 0.1  # length of the tiny bridge lines
     LINEWIDTH = 3.0  # line width for all components
+    STROKE_WIDTH = 0.06  # stroke width in glyph units for the raster and SVG backends
+    VIEW_MARGIN = 0.2  # padding around rendered glyphs, in glyph units
+    WORD_GAP = 0.4  # space between words and text runs in a sentence
+    TEXT_SIZE = 0.7  # font size of inline sentence text, in glyph units
+    TEXT_CHAR_WIDTH = 0.6  # approximate advance of one character, relative to TEXT_SIZE
 
 class GlyphComponents:
     """Enumeration of possible glyph components"""
@@ -43,64 +52,99 @@ class GlyphComponents:
     LOWER_CIRCLE = "LOWER_CIRCLE"
     
     @classmethod
-    def all_components(cls) -> List[str]:
-        """Return all possible component names"""
-        return [getattr(cls, attr) for attr in dir(cls) 
-                if not attr.startswith('_') and isinstance(getattr(cls, attr), str)]
+    def all_components(cls) -> Tuple[str, ...]:
+        """Return all possible component names, in bit order"""
+        return COMPONENT_ORDER
+
+# Frozen component ordering: bit i of a glyph mask is COMPONENT_ORDER[i].
+# Alphabetical, which matches the vector layout used before glyphs were masks.
+COMPONENT_ORDER = tuple(sorted(
+    value for attr, value in vars(GlyphComponents).items()
+    if not attr.startswith('_') and isinstance(value, str)
+))
+COMPONENT_BITS = {component: 1 << i for i, component in enumerate(COMPONENT_ORDER)}
+N_COMPONENTS = len(COMPONENT_ORDER)
+_BIT_SHIFTS = np.arange(N_COMPONENTS)
+_BIT_VALUES = 1 << _BIT_SHIFTS
+UPPER_DIAMOND_MASK = sum(bit for comp, bit in COMPONENT_BITS.items() if comp.startswith("UPPER_DIAMOND"))
+LOWER_DIAMOND_MASK = sum(bit for comp, bit in COMPONENT_BITS.items() if comp.startswith("LOWER_DIAMOND"))
 
 class SymbolGlyph:
-    def __init__(self):
-        self.config = SymbolConfig()
-        self.active_components = {
-            component: False for component in GlyphComponents.all_components()
-        }
-    
-    def activate_component(self, component: str):
-        """Activate a specific component"""
-        if component in self.active_components:
-            self.active_components[component] = True
-        else:
+    """Immutable glyph stored as a bitmask of its active components"""
+    __slots__ = ("_mask",)
+    config = SymbolConfig()
+
+    def __init__(self, mask: int = 0):
+        if not 0 <= mask < (1 << N_COMPONENTS):
+            raise ValueError(f"Invalid glyph mask: {mask}")
+        object.__setattr__(self, "_mask", int(mask))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("SymbolGlyph is immutable")
+
+    def __eq__(self, other):
+        return isinstance(other, SymbolGlyph) and self._mask == other._mask
+
+    def __hash__(self):
+        return hash(self._mask)
+
+    def __repr__(self):
+        return f"SymbolGlyph({self.components()})"
+
+    @property
+    def mask(self) -> int:
+        return self._mask
+
+    @property
+    def active_components(self) -> Dict[str, bool]:
+        """Component name -> active flag, in bit order"""
+        return {component: bool(self._mask & bit) for component, bit in COMPONENT_BITS.items()}
+
+    def components(self) -> List[str]:
+        """Names of the active components, as stored in the letters database"""
+        return [component for component, bit in COMPONENT_BITS.items() if self._mask & bit]
+
+    @classmethod
+    def from_components(cls, components: Iterable[str]) -> 'SymbolGlyph':
+        """Create a symbol from a collection of component names"""
+        mask = 0
+        for component in components:
+            if component not in COMPONENT_BITS:
+                raise ValueError(f"Unknown component: {component}")
+            mask |= COMPONENT_BITS[component]
+        return cls(mask)
+
+    def with_component(self, component: str) -> 'SymbolGlyph':
+        """Return a copy of this symbol with a specific component activated"""
+        if component not in COMPONENT_BITS:
             raise ValueError(f"Unknown component: {component}")
-        
-    def activate_full_upper_diamond(self):
+        return SymbolGlyph(self._mask | COMPONENT_BITS[component])
+
+    def with_full_upper_diamond(self) -> 'SymbolGlyph':
         """Convenience method to activate all upper diamond components"""
-        for component in GlyphComponents.all_components():
-            if component.startswith("UPPER_DIAMOND"):
-                self.active_components[component] = True
+        return SymbolGlyph(self._mask | UPPER_DIAMOND_MASK)
 
-    def activate_full_lower_diamond(self):
+    def with_full_lower_diamond(self) -> 'SymbolGlyph':
         """Convenience method to activate all lower diamond components"""
-        for component in GlyphComponents.all_components():
-            if component.startswith("LOWER_DIAMOND"):
-                self.active_components[component] = True
+        return SymbolGlyph(self._mask | LOWER_DIAMOND_MASK)
     
     def to_vector(self) -> np.ndarray:
         """Convert symbol to one-hot encoded vector"""
-        return np.array([int(v) for v in self.active_components.values()])
+        return (self._mask >> _BIT_SHIFTS) & 1
     
     @classmethod
     def from_vector(cls, vector: np.ndarray) -> 'SymbolGlyph':
         """Create a symbol from a vector representation"""
-        symbol = cls()
-        for i, component in enumerate(GlyphComponents.all_components()):
-            if vector[i]:
-                symbol.activate_component(component)
-        return symbol
-    
-    def draw_center_bridge_line(self, ax: plt.Axes) -> plt.Axes:
-        ax.plot([self.config.CENTER_X, self.config.CENTER_X],
-                [self.config.FRACTION_Y, 
-                self.config.FRACTION_Y + self.config.BRIDGE_LENGTH],
-                'k-', linewidth=self.config.LINEWIDTH)
-        return ax
-    
-    def draw_left_bridge_line(self, ax: plt.Axes) -> plt.Axes:
-        ax.plot([self.config.LEFT_X, self.config.LEFT_X],
-                [self.config.FRACTION_Y, 
-                self.config.FRACTION_Y + self.config.BRIDGE_LENGTH],
-                'k-', linewidth=self.config.LINEWIDTH)
-        return ax
+        return cls(int(np.dot(np.asarray(vector, dtype=bool), _BIT_VALUES)))
     
+    def geometry(self) -> 'GlyphGeometry':
+        """Return the compiled segment/circle geometry of this glyph"""
+        geometry = _GEOMETRY_CACHE.get(self._mask)
+        if geometry is None:
+            geometry = compile_glyph_geometry(frozenset(self.components()), self.config)
+            _GEOMETRY_CACHE[self._mask] = geometry
+        return geometry
+
     def render(self, ax: Optional[plt.Axes] = None) -> plt.Axes:
         """Render the symbol"""
         if ax is None:
@@ -115,230 +159,170 @@ class SymbolGlyph:
         # Draw fraction line
         ax.axhline(y=self.config.FRACTION_Y, color='black', linewidth=self.config.LINEWIDTH)
         
-        # Draw upper components with gap
-        if self.active_components[GlyphComponents.UPPER_LEFT_VERTICAL]:
-            # Draw the main vertical line starting from above the gap
-            ax.plot([self.config.LEFT_X, self.config.LEFT_X],
-                   [self.config.FRACTION_Y + self.config.UPPER_GAP, 
-                    self.config.HALF_EXTENSION_UP],
-                   'k-', linewidth=self.config.LINEWIDTH)
-            # Draw left bridge line
-            ax = self.draw_left_bridge_line(ax)
-            
-        if self.active_components[GlyphComponents.UPPER_CENTER_VERTICAL]:
-            # Draw the main vertical line starting from above the gap
-            ax.plot([self.config.CENTER_X, self.config.CENTER_X],
-                   [self.config.FRACTION_Y + self.config.UPPER_GAP, 
-                    self.config.VERTICAL_EXTENSION_UP],
-                   'k-', linewidth=self.config.LINEWIDTH)
-            # Draw the center bridge line
-            ax = self.draw_center_bridge_line(ax)
-        
-        # Draw lower components with gap
-        if self.active_components[GlyphComponents.LOWER_LEFT_VERTICAL]:
-            ax.plot([self.config.LEFT_X, self.config.LEFT_X],
-                   [self.config.FRACTION_Y - self.config.LOWER_GAP, 
-                    self.config.HALF_EXTENSION_DOWN],
-                   'k-', linewidth=self.config.LINEWIDTH)
-            
-        if self.active_components[GlyphComponents.LOWER_CENTER_VERTICAL]:
-            ax.plot([self.config.CENTER_X, self.config.CENTER_X],
-                   [self.config.FRACTION_Y - self.config.LOWER_GAP, 
-                    self.config.VERTICAL_EXTENSION_DOWN],
-                   'k-', linewidth=self.config.LINEWIDTH)
-            
-        # Draw circle if present
-        if self.active_components[GlyphComponents.LOWER_CIRCLE]:
-            circle = plt.Circle((self.config.CENTER_X, 
-                               self.config.VERTICAL_EXTENSION_DOWN + self.config.CIRCLE_OFFSET),
-                              self.config.CIRCLE_RADIUS,
-                              fill=False, color='black',
-                                lw=self.config.LINEWIDTH)
-            ax.add_artist(circle)
-        
-        # Draw diamond edges with gaps and bridges
-        self._render_diamond_edges(ax, "upper")
-        self._render_diamond_edges(ax, "lower")
-        
+        geometry = self.geometry()
+        draw_geometry(ax, geometry.segments, geometry.circles, self.config.LINEWIDTH)
         return ax
-    
-    def _render_diamond_edges(self, ax: plt.Axes, position: str):
-        """Helper method to render diamond edges for upper or lower section"""
-        config = self.config
-        y_offset = config.LOWER_GAP if position == "lower" else config.UPPER_GAP
-        base_y = config.FRACTION_Y - y_offset if position == "lower" else config.FRACTION_Y + y_offset
-        
-        # Calculate diamond points
-        left_top = (config.LEFT_X, 
-                   config.HALF_EXTENSION_UP if position == "upper" 
-                   else config.HALF_EXTENSION_DOWN)
-        center_top = (config.CENTER_X,
-                     config.VERTICAL_EXTENSION_UP if position == "upper"
-                     else config.VERTICAL_EXTENSION_DOWN)
-        right_ref = (config.RIGHT_X,
-                    config.HALF_EXTENSION_UP if position == "upper"
-                    else config.HALF_EXTENSION_DOWN)
-        
-        prefix = "UPPER_" if position == "upper" else "LOWER_"
-        components = GlyphComponents
-        
-        if position == "upper":
-            # Handle upper diamond edges
-            if self.active_components[getattr(components, f"{prefix}DIAMOND_LOWER_LEFT")]:
-                ax.plot([left_top[0], center_top[0]], [left_top[1], base_y], 'k-', linewidth=self.config.LINEWIDTH)
-                if self.active_components[getattr(components, "LOWER_CENTER_VERTICAL")]:
-                    # Add center bridge line
-                    ax = self.draw_center_bridge_line(ax)
-                
-            if self.active_components[getattr(components, f"{prefix}DIAMOND_UPPER_LEFT")]:
-                ax.plot([left_top[0], center_top[0]], [left_top[1], center_top[1]], 'k-', linewidth=self.config.LINEWIDTH)
-                
-            if self.active_components[getattr(components, f"{prefix}DIAMOND_UPPER_RIGHT")]:
-                ax.plot([center_top[0], right_ref[0]], [center_top[1], right_ref[1]], 'k-', linewidth=self.config.LINEWIDTH)
-                
-            if self.active_components[getattr(components, f"{prefix}DIAMOND_LOWER_RIGHT")]:
-                ax.plot([center_top[0], right_ref[0]], [base_y, right_ref[1]], 'k-', linewidth=self.config.LINEWIDTH)
-                if self.active_components[getattr(components, "LOWER_CENTER_VERTICAL")]:
-                    ax = self.draw_center_bridge_line(ax)
-        else:
-            # Handle lower diamond edges (unchanged)
-            if self.active_components[getattr(components, f"{prefix}DIAMOND_LOWER_LEFT")]:
-                ax.plot([left_top[0], center_top[0]], [left_top[1], center_top[1]], 'k-', linewidth=self.config.LINEWIDTH)
-                
-            if self.active_components[getattr(components, f"{prefix}DIAMOND_UPPER_LEFT")]:
-                ax.plot([left_top[0], center_top[0]], [left_top[1], base_y], 'k-', linewidth=self.config.LINEWIDTH)
-                
-            if self.active_components[getattr(components, f"{prefix}DIAMOND_UPPER_RIGHT")]:
-                ax.plot([center_top[0], right_ref[0]], [base_y, right_ref[1]], 'k-', linewidth=self.config.LINEWIDTH)
-                
-            if self.active_components[getattr(components, f"{prefix}DIAMOND_LOWER_RIGHT")]:
-                ax.plot([center_top[0], right_ref[0]], [center_top[1], right_ref[1]], 'k-', linewidth=self.config.LINEWIDTH)
-
-    def draw_center_bridge_line_at_position(self, ax: plt.Axes, x_offset: float) -> plt.Axes:
-        ax.plot([x_offset + self.config.CENTER_X, x_offset + self.config.CENTER_X],
-                [self.config.FRACTION_Y, 
-                self.config.FRACTION_Y + self.config.BRIDGE_LENGTH],
-                'k-', linewidth=self.config.LINEWIDTH)
-        return ax
-    
-    def draw_left_bridge_line_at_position(self, ax: plt.Axes, x_offset: float) -> plt.Axes:
-        ax.plot([x_offset + self.config.LEFT_X, x_offset + self.config.LEFT_X],
-                [self.config.FRACTION_Y, 
-                self.config.FRACTION_Y + self.config.BRIDGE_LENGTH],
-                'k-', linewidth=self.config.LINEWIDTH)
-        return ax
-
 
     def render_at_position(self, ax: plt.Axes, position: int) -> None:
         """Render this glyph at a specific position in a chain"""
         config = self.config
         x_offset = position * (config.GLYPH_WIDTH + config.GLYPH_SPACING)
-        
-        # Draw upper components with gap
-        if self.active_components[GlyphComponents.UPPER_LEFT_VERTICAL]:
-            # Draw the main vertical line starting from above the gap
-            ax.plot([x_offset + config.LEFT_X, x_offset + config.LEFT_X],
-                   [config.FRACTION_Y + config.UPPER_GAP, 
-                    config.HALF_EXTENSION_UP],
-                   'k-', linewidth=self.config.LINEWIDTH)
-            # Draw left bridge line
-            ax = self.draw_left_bridge_line_at_position(ax, x_offset)
-            
-        if self.active_components[GlyphComponents.UPPER_CENTER_VERTICAL]:
-            # Draw the main vertical line starting from above the gap
-            ax.plot([x_offset + config.CENTER_X, x_offset + config.CENTER_X],
-                   [config.FRACTION_Y + config.UPPER_GAP, 
-                    config.VERTICAL_EXTENSION_UP],
-                   'k-', linewidth=self.config.LINEWIDTH)
-            # Draw center bridge line
-            ax = self.draw_center_bridge_line_at_position(ax, x_offset)
-        
-        # Draw lower components with gap
-        if self.active_components[GlyphComponents.LOWER_LEFT_VERTICAL]:
-            ax.plot([x_offset + config.LEFT_X, x_offset + config.LEFT_X],
-                   [config.FRACTION_Y - config.LOWER_GAP, 
-                    config.HALF_EXTENSION_DOWN],
-                   'k-', linewidth=self.config.LINEWIDTH)
-            
-        if self.active_components[GlyphComponents.LOWER_CENTER_VERTICAL]:
-            ax.plot([x_offset + config.CENTER_X, x_offset + config.CENTER_X],
-                   [config.FRACTION_Y - config.LOWER_GAP, 
-                    config.VERTICAL_EXTENSION_DOWN],
-                   'k-', linewidth=self.config.LINEWIDTH)
-            
-        # Draw circle if present
-        if self.active_components[GlyphComponents.LOWER_CIRCLE]:
-            circle = plt.Circle((x_offset + config.CENTER_X, 
-                               config.VERTICAL_EXTENSION_DOWN + config.CIRCLE_OFFSET),
-                              config.CIRCLE_RADIUS,
-                              fill=False, color='black',
-                                lw=self.config.LINEWIDTH)
-            ax.add_artist(circle)
-        
-        # Draw diamond edges with offset
-        self._render_diamond_edges_at_position(ax, "upper", x_offset)
-        self._render_diamond_edges_at_position(ax, "lower", x_offset)
+        geometry = self.geometry().offset(x_offset)
+        draw_geometry(ax, geometry.segments, geometry.circles, config.LINEWIDTH)
 
-    def _render_diamond_edges_at_position(self, ax: plt.Axes, position: str, x_offset: float):
-        """Helper method to render diamond edges for upper or lower section at a specific position"""
-        config = self.config
-        y_offset = config.LOWER_GAP if position == "lower" else config.UPPER_GAP
-        base_y = config.FRACTION_Y - y_offset if position == "lower" else config.FRACTION_Y + y_offset
-        
-        # Calculate diamond points with x_offset
-        if position == "upper":
-            left_top = (x_offset + config.LEFT_X, config.HALF_EXTENSION_UP)
-            center_top = (x_offset + config.CENTER_X, config.VERTICAL_EXTENSION_UP)
-            right_ref = (x_offset + config.RIGHT_X, config.HALF_EXTENSION_UP)
-        else:
-            left_top = (x_offset + config.LEFT_X, config.HALF_EXTENSION_DOWN)
-            center_top = (x_offset + config.CENTER_X, config.VERTICAL_EXTENSION_DOWN)
-            right_ref = (x_offset + config.RIGHT_X, config.HALF_EXTENSION_DOWN)
-        
-        prefix = "UPPER_" if position == "upper" else "LOWER_"
-        components = GlyphComponents
-        
-        if position == "upper":
-            # Handle upper diamond edges
-            if self.active_components[getattr(components, f"{prefix}DIAMOND_LOWER_LEFT")]:
-                ax.plot([left_top[0], center_top[0]], [left_top[1], base_y], 'k-', linewidth=self.config.LINEWIDTH)
-                if self.active_components[getattr(components, "LOWER_CENTER_VERTICAL")]:
-                    # weird rule but it's the only way to match in-game rendering  ¯\_(ツ)_/¯ 
-                    # Add center bridge line
-                    ax = self.draw_center_bridge_line_at_position(ax, x_offset)
-                
-            if self.active_components[getattr(components, f"{prefix}DIAMOND_UPPER_LEFT")]:
-                ax.plot([left_top[0], center_top[0]], [left_top[1], center_top[1]], 'k-', linewidth=self.config.LINEWIDTH)
-                
-            if self.active_components[getattr(components, f"{prefix}DIAMOND_UPPER_RIGHT")]:
-                ax.plot([center_top[0], right_ref[0]], [center_top[1], right_ref[1]], 'k-', linewidth=self.config.LINEWIDTH)
-                
-            if self.active_components[getattr(components, f"{prefix}DIAMOND_LOWER_RIGHT")]:
-                ax.plot([center_top[0], right_ref[0]], [base_y, right_ref[1]], 'k-', linewidth=self.config.LINEWIDTH)
-                # Add center bridge line
-                # ax = self.draw_center_bridge_line_at_position(ax, x_offset)
-                # this rule is weird: we only draw this when there is also a lower center vertical ¯\_(ツ)_/¯
-                if self.active_components[getattr(components, "LOWER_CENTER_VERTICAL")]:
-                    ax = self.draw_center_bridge_line_at_position(ax, x_offset)
-        else:
-            # Handle lower diamond edges (unchanged)
-            if self.active_components[getattr(components, f"{prefix}DIAMOND_LOWER_LEFT")]:
-                ax.plot([left_top[0], center_top[0]], [left_top[1], center_top[1]], 'k-', linewidth=self.config.LINEWIDTH)
-                
-            if self.active_components[getattr(components, f"{prefix}DIAMOND_UPPER_LEFT")]:
-                ax.plot([left_top[0], center_top[0]], [left_top[1], base_y], 'k-', linewidth=self.config.LINEWIDTH)
-                
-            if self.active_components[getattr(components, f"{prefix}DIAMOND_UPPER_RIGHT")]:
-                ax.plot([center_top[0], right_ref[0]], [base_y, right_ref[1]], 'k-', linewidth=self.config.LINEWIDTH)
-                
-            if self.active_components[getattr(components, f"{prefix}DIAMOND_LOWER_RIGHT")]:
-                ax.plot([center_top[0], right_ref[0]], [center_top[1], right_ref[1]], 'k-', linewidth=self.config.LINEWIDTH)
+    def to_svg(self, height: int = 150) -> str:
+        """Render the symbol as an SVG document"""
+        geometry = self.geometry()
+        return geometry_to_svg(geometry.segments, geometry.circles, 1, height, self.config)
+
+@dataclass(frozen=True)
+class GlyphGeometry:
+    """Precomputed drawing primitives of a glyph.
+
+    segments is an (N, 4) array of (x0, y0, x1, y1) rows and circles is an
+    (M, 3) array of (x, y, radius) rows, both in glyph coordinates.
+    """
+    segments: np.ndarray
+    circles: np.ndarray
+
+    def offset(self, x_offset: float) -> 'GlyphGeometry':
+        """Return a copy of this geometry shifted horizontally"""
+        segments = self.segments + np.array([x_offset, 0.0, x_offset, 0.0])
+        circles = self.circles + np.array([x_offset, 0.0, 0.0])
+        return GlyphGeometry(segments, circles)
+
+_GEOMETRY_CACHE = {}
+
+def compile_glyph_geometry(active: frozenset, config: SymbolConfig = SymbolConfig) -> GlyphGeometry:
+    """Compile a set of active component names into a GlyphGeometry"""
+    c = GlyphComponents
+    top, bottom = config.VERTICAL_EXTENSION_UP, config.VERTICAL_EXTENSION_DOWN
+    half_up, half_down = config.HALF_EXTENSION_UP, config.HALF_EXTENSION_DOWN
+    left, center, right = config.LEFT_X, config.CENTER_X, config.RIGHT_X
+    upper_base = config.FRACTION_Y + config.UPPER_GAP
+    lower_base = config.FRACTION_Y - config.LOWER_GAP
+    center_bridge = (center, config.FRACTION_Y, center, config.FRACTION_Y + config.BRIDGE_LENGTH)
+    left_bridge = (left, config.FRACTION_Y, left, config.FRACTION_Y + config.BRIDGE_LENGTH)
+
+    # (component, segment, bridge drawn along with it)
+    rules = [
+        (c.UPPER_LEFT_VERTICAL, (left, upper_base, left, half_up), left_bridge),
+        (c.UPPER_CENTER_VERTICAL, (center, upper_base, center, top), center_bridge),
+        (c.LOWER_LEFT_VERTICAL, (left, lower_base, left, half_down), None),
+        (c.LOWER_CENTER_VERTICAL, (center, lower_base, center, bottom), None),
+        (c.UPPER_DIAMOND_UPPER_LEFT, (left, half_up, center, top), None),
+        (c.UPPER_DIAMOND_UPPER_RIGHT, (center, top, right, half_up), None),
+        (c.LOWER_DIAMOND_LOWER_LEFT, (left, half_down, center, bottom), None),
+        (c.LOWER_DIAMOND_UPPER_LEFT, (left, half_down, center, lower_base), None),
+        (c.LOWER_DIAMOND_UPPER_RIGHT, (center, lower_base, right, half_down), None),
+        (c.LOWER_DIAMOND_LOWER_RIGHT, (center, bottom, right, half_down), None),
+    ]
+    # weird rule but it's the only way to match in-game rendering  ¯\_(ツ)_/¯
+    # the inner upper diamond edges only get a center bridge when there is
+    # also a lower center vertical
+    inner_bridge = center_bridge if c.LOWER_CENTER_VERTICAL in active else None
+    rules += [
+        (c.UPPER_DIAMOND_LOWER_LEFT, (left, half_up, center, upper_base), inner_bridge),
+        (c.UPPER_DIAMOND_LOWER_RIGHT, (center, upper_base, right, half_up), inner_bridge),
+    ]
+
+    segments = []
+    for component, segment, bridge in rules:
+        if component not in active:
+            continue
+        segments.append(segment)
+        if bridge is not None and bridge not in segments:
+            segments.append(bridge)
+
+    circles = []
+    if c.LOWER_CIRCLE in active:
+        circles.append((center, bottom + config.CIRCLE_OFFSET, config.CIRCLE_RADIUS))
+
+    return GlyphGeometry(
+        np.array(segments, dtype=float).reshape(-1, 4),
+        np.array(circles, dtype=float).reshape(-1, 3),
+    )
+
+def draw_geometry(ax: plt.Axes, segments: np.ndarray, circles: np.ndarray, linewidth: float) -> plt.Axes:
+    """Draw a segment table and circle table with one collection each"""
+    if len(segments):
+        ax.add_collection(LineCollection(
+            segments.reshape(-1, 2, 2),
+            colors='black', linewidths=linewidth, capstyle='projecting'
+        ), autolim=False)
+    if len(circles):
+        ax.add_collection(PatchCollection(
+            [Circle((x, y), r) for x, y, r in circles],
+            facecolor='none', edgecolor='black', linewidths=linewidth
+        ), autolim=False)
+    return ax
+
+def _svg_number(value: float) -> str:
+    """Compact SVG coordinate formatting"""
+    text = f"{value:.3f}".rstrip("0").rstrip(".")
+    return "0" if text in ("", "-0") else text
+
+def _svg_document(segments: np.ndarray, circles: np.ndarray, x0: float, x1: float,
+                  height: int, config: SymbolConfig, texts: Sequence[Tuple[float, str]] = ()) -> str:
+    """Format strokes, circles and text runs spanning [x0, x1] as an SVG document"""
+    margin = config.VIEW_MARGIN
+    y_top = config.VERTICAL_EXTENSION_UP + margin
+    view_height = y_top - (config.VERTICAL_EXTENSION_DOWN - margin)
+    width = height * (x1 - x0) / view_height
+    f = _svg_number
+
+    path = [f"M{f(a)} {f(-b)}L{f(c)} {f(-d)}" for a, b, c, d in segments]
+    shapes = [f'<path d="{"".join(path)}"/>']
+    shapes += [f'<circle cx="{f(x)}" cy="{f(-y)}" r="{f(r)}"/>' for x, y, r in circles]
+    labels = [
+        f'<text x="{f(x)}" y="{f(-config.FRACTION_Y)}">{escape(text)}</text>' for x, text in texts
+    ]
+    text_group = (
+        f'<g font-family="sans-serif" font-size="{f(config.TEXT_SIZE)}" dominant-baseline="central">'
+        f'{"".join(labels)}</g>'
+    ) if labels else ""
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{f(width)}" height="{height}" '
+        f'viewBox="{f(x0)} {f(-y_top)} {f(x1 - x0)} {f(view_height)}">'
+        f'<g fill="none" stroke="#000" stroke-width="{f(config.STROKE_WIDTH)}" stroke-linecap="square">'
+        f'{"".join(shapes)}</g>{text_group}</svg>'
+    )
+
+def geometry_to_svg(segments: np.ndarray, circles: np.ndarray, n_glyphs: int = 1,
+                    height: int = 150, config: SymbolConfig = SymbolConfig) -> str:
+    """Format a segment and circle table as a standalone SVG document.
+
+    Glyph coordinates are used directly in the viewBox with y negated,
+    and the fraction line spans the full width as in the matplotlib view.
+    """
+    x0 = -config.VIEW_MARGIN
+    x1 = n_glyphs * (config.GLYPH_WIDTH + config.GLYPH_SPACING) + config.VIEW_MARGIN
+    fraction = np.array([[x0, config.FRACTION_Y, x1, config.FRACTION_Y]])
+    return _svg_document(np.concatenate([fraction, segments]), circles, x0, x1, height, config)
+
+def svg_data_uri(svg: str) -> str:
+    """Wrap an SVG document as a data URI usable as an <img> source"""
+    return "data:image/svg+xml;utf8," + quote(svg, safe=" =:/,.-")
 
 class SymbolChain:
     """Class to handle chains of symbols"""
     def __init__(self, glyphs: Sequence[SymbolGlyph]):
         self.glyphs = glyphs
         self.config = SymbolConfig()  # Use same config for consistency
+
+    def geometry(self) -> GlyphGeometry:
+        """Return the geometry of every glyph in the chain, offset to its position"""
+        step = self.config.GLYPH_WIDTH + self.config.GLYPH_SPACING
+        geometries = [glyph.geometry() for glyph in self.glyphs]
+        seg_offsets = np.repeat(np.arange(len(geometries)) * step,
+                                [len(g.segments) for g in geometries])
+        circle_offsets = np.repeat(np.arange(len(geometries)) * step,
+                                   [len(g.circles) for g in geometries])
+        segments = np.concatenate([g.segments for g in geometries] + [np.empty((0, 4))])
+        circles = np.concatenate([g.circles for g in geometries] + [np.empty((0, 3))])
+        segments[:, [0, 2]] += seg_offsets[:, None]
+        circles[:, 0] += circle_offsets
+        return GlyphGeometry(segments, circles)
     
     def render(self, ax: Optional[plt.Axes] = None) -> plt.Axes:
         """Render the entire chain of symbols"""
@@ -356,8 +340,58 @@ class SymbolChain:
         ax.axhline(y=self.config.FRACTION_Y, color='black', linewidth=self.config.LINEWIDTH,
                   xmin=0, xmax=len(self.glyphs))
         
-        # Render each glyph
-        for i, glyph in enumerate(self.glyphs):
-            glyph.render_at_position(ax, i)
+        # Draw every glyph at once
+        geometry = self.geometry()
+        draw_geometry(ax, geometry.segments, geometry.circles, self.config.LINEWIDTH)
         
-        return ax
\ No newline at end of file
+        return ax
+
+    def to_svg(self, height: int = 150) -> str:
+        """Render the entire chain of symbols as an SVG document"""
+        geometry = self.geometry()
+        return geometry_to_svg(geometry.segments, geometry.circles, len(self.glyphs), height, self.config)
+
+@dataclass(frozen=True)
+class SentenceLayout:
+    """Glyph-space layout of a whole sentence.
+
+    Each word gets its own fraction line (part of segments); texts holds
+    (left x, text) runs drawn inline, vertically centered on the fraction line.
+    """
+    segments: np.ndarray
+    circles: np.ndarray
+    texts: Tuple[Tuple[float, str], ...]
+    width: float
+
+    def to_svg(self, height: int = 150, config: SymbolConfig = SymbolConfig) -> str:
+        """Render the whole sentence as one SVG document"""
+        return _svg_document(self.segments, self.circles, 0.0, self.width, height, config, self.texts)
+
+def layout_sentence(items: Sequence[Union[SymbolChain, str]],
+                    config: SymbolConfig = SymbolConfig) -> SentenceLayout:
+    """Lay out words (glyph chains) and text or punctuation runs on one line"""
+    margin = config.VIEW_MARGIN
+    step = config.GLYPH_WIDTH + config.GLYPH_SPACING
+    segments, circles, texts = [], [], []
+    x = 0.0
+    for i, item in enumerate(items):
+        # punctuation hugs the previous item, everything else is spaced out
+        is_punctuation = isinstance(item, str) and all(not char.isalnum() for char in item)
+        if i > 0 and not is_punctuation:
+            x += config.WORD_GAP
+        if isinstance(item, SymbolChain):
+            block_width = len(item.glyphs) * step + 2 * margin
+            segments.append(np.array([[x, config.FRACTION_Y, x + block_width, config.FRACTION_Y]]))
+            geometry = item.geometry().offset(x + margin)
+            segments.append(geometry.segments)
+            circles.append(geometry.circles)
+            x += block_width
+        else:
+            texts.append((x, item))
+            x += len(item) * config.TEXT_CHAR_WIDTH * config.TEXT_SIZE
+    return SentenceLayout(
+        np.concatenate(segments + [np.empty((0, 4))]),
+        np.concatenate(circles + [np.empty((0, 3))]),
+        tuple(texts),
+        max(x, 2 * margin),
+    )
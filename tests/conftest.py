@@ -0,0 +1,32 @@
+# tests/conftest.py
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# the app runs from the repository root, so its modules import from there
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from components import repository, sqlite_store  # noqa: E402
+
+BACKENDS = ("json", "journal", "sqlite")
+
+@pytest.fixture(params=BACKENDS)
+def storage(request, tmp_path, monkeypatch):
+    """
+    Run a test against an empty data/ directory under each storage backend.
+    The app's own save listeners are switched off meanwhile, so only the
+    indexes a test builds itself see its saves.
+    """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(repository, "STORAGE_BACKEND", request.param)
+    monkeypatch.setattr(repository, "_listeners", {name: [] for name in repository.TABLES})
+    # SQLite connections are cached per thread by (relative) path
+    monkeypatch.setattr(sqlite_store, "_local", threading.local())
+    # cached tables belong to another directory: force a reload, while
+    # generations keep counting up so no index mistakes them for current
+    for table in repository._tables.values():
+        table.stamp = ("stale",)
+    return request.param
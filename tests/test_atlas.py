@@ -0,0 +1,33 @@
+# tests/test_atlas.py
+# Thumbnails sliced from the sprite atlas must be pixel-identical to what
+# the rasterizer draws for the same glyphs.
+import random
+
+import numpy as np
+import pytest
+
+from atlas import ATLAS_HEIGHT, build_atlas, compose_chain, compose_glyph, load_atlas
+from raster import rasterize_chain, rasterize_glyph
+from render import N_COMPONENTS, SymbolChain, SymbolGlyph
+
+@pytest.fixture(scope="module")
+def atlas(tmp_path_factory):
+    path = build_atlas(tmp_path_factory.mktemp("atlas") / "glyph_atlas.npy", ATLAS_HEIGHT)
+    return load_atlas(path)
+
+def test_every_glyph_matches_the_rasterizer(atlas):
+    assert atlas.shape[:2] == (1 << N_COMPONENTS, ATLAS_HEIGHT)
+    for mask in range(1 << N_COMPONENTS):
+        expected = rasterize_glyph(SymbolGlyph(mask), ATLAS_HEIGHT)
+        np.testing.assert_array_equal(compose_glyph(atlas, mask), expected, err_msg=str(mask))
+
+def test_chains_match_the_rasterizer(atlas):
+    rng = random.Random(0)
+    for _ in range(300):
+        masks = [rng.randrange(1 << N_COMPONENTS) for _ in range(rng.randrange(1, 10))]
+        expected = rasterize_chain(SymbolChain([SymbolGlyph(mask) for mask in masks]), ATLAS_HEIGHT)
+        np.testing.assert_array_equal(compose_chain(atlas, masks), expected, err_msg=str(masks))
+
+def test_heights_without_whole_pixel_cells_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        build_atlas(tmp_path / "glyph_atlas.npy", 150)
@@ -0,0 +1,63 @@
+# tests/test_english_corpus.py
+# The streaming, chunked and parallel counters must count exactly what the
+# original loader did: text.split(), lowercase, drop tokens with punctuation.
+import random
+import string
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from components import english_corpus
+from components.english_corpus import _count_range, count_tokens, english_word_counts
+
+# str.split() separators, several of them multi-byte in UTF-8
+WHITESPACE = [" ", "  ", "\n", "\r\n", "\t", "\x0b", "\x0c", "\x1c", "\x85", "\xa0", "\u2003", "\u2028", "\u3000"]
+TOKENS = ["the", "The", "THE", "of", "café", "Café", "naïve", "straße", "日本語", "🙂", "x🙂y", "İstanbul",
+          "don't", "end.", "(aside)", "well,", "a-b", "ŁÓDŹ", "ﬁne", "Ω"]
+
+@pytest.fixture(scope="module")
+def corpus(tmp_path_factory):
+    rng = random.Random(0)
+    parts = []
+    for _ in range(40000):
+        parts.append(rng.choice(TOKENS))
+        parts.append(rng.choice(WHITESPACE))
+    path = tmp_path_factory.mktemp("english") / "sample.txt"
+    path.write_bytes("".join(parts).encode("utf-8"))
+    return path
+
+def baseline_tokens(path):
+    return Counter(word.lower() for word in path.read_text(encoding="utf-8").split())
+
+def test_serial_parallel_and_chunked_counts_agree(corpus):
+    expected = baseline_tokens(corpus)
+    assert count_tokens(corpus, parallel=False) == expected
+    assert count_tokens(corpus, parallel=True, workers=4) == expected
+    # chunk boundaries land inside tokens and inside multi-byte characters
+    for chunk_size in (1, 3, 7, 4096):
+        assert _count_range(str(corpus), 0, corpus.stat().st_size, chunk_size) == expected
+
+def test_split_points_cut_on_whitespace(corpus):
+    size = corpus.stat().st_size
+    points = english_corpus._split_points(corpus, size, 37)
+    assert points[0] == 0 and points[-1] == size and points == sorted(set(points))
+    counts = Counter()
+    for start, end in zip(points, points[1:]):
+        counts.update(_count_range(str(corpus), start, end, 5))
+    assert counts == baseline_tokens(corpus)
+
+def test_word_counts_match_the_original_loader(corpus, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(english_corpus, "_memory", {})
+    words = [word.lower() for word in corpus.read_text(encoding="utf-8").split()]
+    words = [word for word in words if not any(char in string.punctuation for char in word)]
+    expected_words, expected_counts = np.unique(words, return_counts=True)
+    for parallel, cached in ((False, False), (True, False), (None, True)):
+        english_corpus._memory.clear()
+        if not cached:
+            for path in english_corpus.CACHE_DIR.glob("*.npz"):
+                path.unlink()
+        result_words, result_counts = english_word_counts(corpus, parallel)
+        assert result_words.tolist() == expected_words.tolist()
+        assert result_counts.tolist() == expected_counts.tolist()
@@ -0,0 +1,76 @@
+# tests/test_frequencies.py
+# The counters kept current by save deltas must always equal a full recount
+# with the original get_freq_distibution.
+import random
+from collections import Counter
+
+from components import repository
+from components.analytics import get_freq_distibution
+from components.corpus import export_from_repository
+from components.frequencies import FrequencyStore
+
+LETTERS = [str(i) for i in range(12)]
+
+def recount():
+    word_ids, word_counts, letter_ids, letter_counts = get_freq_distibution(
+        repository.load_letters(), repository.load_words(), repository.load_sentences()
+    )
+    return (Counter(dict(zip(word_ids.tolist(), word_counts.tolist()))),
+            Counter(dict(zip(letter_ids.tolist(), letter_counts.tolist()))))
+
+def random_word(rng, word_id):
+    return {"id": word_id, "letter_ids": rng.choices(LETTERS, k=rng.randrange(1, 6))}
+
+def random_sentence(rng, sentence_id, word_ids):
+    components = [{"type": "word", "content": rng.choice(word_ids)} for _ in range(rng.randrange(0, 7))]
+    components.insert(rng.randrange(len(components) + 1), {"type": "text", "content": "."})
+    return {"id": sentence_id, "components": components}
+
+def test_deltas_match_a_full_recount(storage, tmp_path):
+    rng = random.Random(0)
+    word_ids = [str(i) for i in range(30)]
+    repository.save_records("words", [random_word(rng, word_id) for word_id in word_ids])
+    store = FrequencyStore(tmp_path / "frequencies.json")
+    rebuilds = []
+    rebuild = store._rebuild
+    store._rebuild = lambda: (rebuilds.append(1), rebuild())
+    assert (store.word_counts(), store.letter_counts()) == recount()
+
+    for step in range(150):
+        roll = rng.random()
+        if roll < 0.3:
+            repository.save_record("words", random_word(rng, rng.choice(word_ids)))
+        elif roll < 0.4:
+            repository.save_records("words", [random_word(rng, rng.choice(word_ids)) for _ in range(3)])
+        else:
+            # numeric ids are counted, the others are test sentences
+            sentence_id = str(rng.randrange(20)) if rng.random() < 0.8 else f"test{rng.randrange(3)}"
+            repository.save_record("sentences", random_sentence(rng, sentence_id, word_ids))
+        words, letters = recount()
+        assert store.word_counts() == words, step
+        assert store.letter_counts() == letters, step
+    # every change arrived as a delta; only the first lookup counted from scratch
+    assert len(rebuilds) == 1
+
+def test_writes_the_listeners_missed_trigger_a_recount(storage, tmp_path):
+    rng = random.Random(1)
+    word_ids = [str(i) for i in range(10)]
+    repository.save_records("words", [random_word(rng, word_id) for word_id in word_ids])
+    store = FrequencyStore(tmp_path / "frequencies.json")
+    store.word_counts()
+    sentences = {str(i): random_sentence(rng, str(i), word_ids) for i in range(8)}
+    repository.save_table("sentences", sentences)  # whole-table writes have no per-record deltas
+    words, letters = recount()
+    assert (store.word_counts(), store.letter_counts()) == (words, letters)
+    # a store in another process picks the persisted counters up
+    assert FrequencyStore(tmp_path / "frequencies.json").word_counts() == words
+
+def test_a_fresh_corpus_export_counts_the_same(storage, tmp_path):
+    rng = random.Random(2)
+    word_ids = [str(i) for i in range(20)]
+    repository.save_records("words", [random_word(rng, word_id) for word_id in word_ids])
+    repository.save_records("sentences", [random_sentence(rng, str(i), word_ids) for i in range(15)]
+                            + [random_sentence(rng, "test", word_ids)])
+    export_from_repository()
+    store = FrequencyStore(tmp_path / "frequencies.json")
+    assert (store.word_counts(), store.letter_counts()) == recount()
@@ -0,0 +1,69 @@
+# tests/test_letter_stats.py
+# Statistics kept current by save deltas must equal the ones a fresh
+# instance builds from the tables.
+import random
+
+from components import repository
+from components.letter_stats import WEIGHTINGS, LetterStatistics
+
+LETTERS = [str(i) for i in range(10)]
+
+def triples(letter_ids, keys, counts):
+    return {tuple(str(letter_ids[i]) for i in key): int(count) for key, count in zip(keys, counts)}
+
+def snapshot(stats):
+    result = {}
+    for weighting in WEIGHTINGS:
+        letter_ids, bigrams = stats.bigrams(weighting)
+        result["bigrams", weighting] = (letter_ids.tolist(), bigrams.tolist())
+        result["trigrams", weighting] = triples(*stats.trigrams(weighting))
+        letter_ids, positions = stats.positions(weighting)
+        result["positions", weighting] = (letter_ids.tolist(), positions.tolist())
+    result["adjacency"] = triples(*stats.word_adjacency())
+    return result
+
+def random_word(rng, word_id):
+    return {"id": word_id, "letter_ids": rng.choices(LETTERS, k=rng.randrange(1, 7))}
+
+def random_sentence(rng, sentence_id, word_ids):
+    return {"id": sentence_id, "components": [
+        {"type": "word", "content": rng.choice(word_ids)} if rng.random() < 0.85 else {"type": "text", "content": ","}
+        for _ in range(rng.randrange(0, 8))
+    ]}
+
+def test_deltas_match_a_fresh_build(storage):
+    rng = random.Random(0)
+    # sentences may use words that are only saved later
+    word_ids = [str(i) for i in range(25)]
+    repository.save_records("words", [random_word(rng, word_id) for word_id in word_ids[:15]])
+    stats = LetterStatistics()
+    rebuilds = []
+    rebuild = stats._rebuild
+    stats._rebuild = lambda: (rebuilds.append(1), rebuild())
+    assert snapshot(stats) == snapshot(LetterStatistics())
+
+    for step in range(120):
+        roll = rng.random()
+        if roll < 0.3:
+            repository.save_record("words", random_word(rng, rng.choice(word_ids)))
+        elif roll < 0.4:
+            repository.save_records("words", [random_word(rng, rng.choice(word_ids)) for _ in range(3)])
+        elif roll < 0.5:
+            repository.save_records("sentences", [random_sentence(rng, str(rng.randrange(15)), word_ids)
+                                                  for _ in range(2)])
+        else:
+            sentence_id = str(rng.randrange(15)) if rng.random() < 0.8 else f"test{rng.randrange(3)}"
+            repository.save_record("sentences", random_sentence(rng, sentence_id, word_ids))
+        if step % 10 == 0:
+            assert snapshot(stats) == snapshot(LetterStatistics()), step
+    assert snapshot(stats) == snapshot(LetterStatistics())
+    assert len(rebuilds) == 1
+
+def test_whole_table_writes_trigger_a_rebuild(storage):
+    rng = random.Random(1)
+    word_ids = [str(i) for i in range(10)]
+    repository.save_records("words", [random_word(rng, word_id) for word_id in word_ids])
+    stats = LetterStatistics()
+    snapshot(stats)
+    repository.save_table("sentences", {str(i): random_sentence(rng, str(i), word_ids) for i in range(6)})
+    assert snapshot(stats) == snapshot(LetterStatistics())
@@ -0,0 +1,107 @@
+# tests/test_render.py
+# The compiled segment tables must draw exactly the strokes the original
+# per-component matplotlib renderer drew, for every one of the 8192 glyphs.
+import random
+
+import numpy as np
+import pytest
+
+from render import N_COMPONENTS, GlyphComponents, SymbolChain, SymbolConfig, SymbolGlyph
+
+def reference_strokes(active, x_offset=0.0, config=SymbolConfig):
+    """
+    Strokes of the original render_at_position, one ax.plot or Circle call
+    each, as ((x0, y0, x1, y1) segments, (x, y, radius) circles).
+    """
+    c = GlyphComponents
+    segments, circles = [], []
+
+    def plot(xs, ys):
+        segments.append((xs[0], ys[0], xs[1], ys[1]))
+
+    def center_bridge():
+        plot([x_offset + config.CENTER_X] * 2, [config.FRACTION_Y, config.FRACTION_Y + config.BRIDGE_LENGTH])
+
+    def left_bridge():
+        plot([x_offset + config.LEFT_X] * 2, [config.FRACTION_Y, config.FRACTION_Y + config.BRIDGE_LENGTH])
+
+    if c.UPPER_LEFT_VERTICAL in active:
+        plot([x_offset + config.LEFT_X] * 2, [config.FRACTION_Y + config.UPPER_GAP, config.HALF_EXTENSION_UP])
+        left_bridge()
+    if c.UPPER_CENTER_VERTICAL in active:
+        plot([x_offset + config.CENTER_X] * 2, [config.FRACTION_Y + config.UPPER_GAP, config.VERTICAL_EXTENSION_UP])
+        center_bridge()
+    if c.LOWER_LEFT_VERTICAL in active:
+        plot([x_offset + config.LEFT_X] * 2, [config.FRACTION_Y - config.LOWER_GAP, config.HALF_EXTENSION_DOWN])
+    if c.LOWER_CENTER_VERTICAL in active:
+        plot([x_offset + config.CENTER_X] * 2, [config.FRACTION_Y - config.LOWER_GAP, config.VERTICAL_EXTENSION_DOWN])
+    if c.LOWER_CIRCLE in active:
+        circles.append((x_offset + config.CENTER_X, config.VERTICAL_EXTENSION_DOWN + config.CIRCLE_OFFSET,
+                        config.CIRCLE_RADIUS))
+
+    for position in ("upper", "lower"):
+        upper = position == "upper"
+        base_y = config.FRACTION_Y + config.UPPER_GAP if upper else config.FRACTION_Y - config.LOWER_GAP
+        half = config.HALF_EXTENSION_UP if upper else config.HALF_EXTENSION_DOWN
+        tip = config.VERTICAL_EXTENSION_UP if upper else config.VERTICAL_EXTENSION_DOWN
+        left_top = (x_offset + config.LEFT_X, half)
+        center_top = (x_offset + config.CENTER_X, tip)
+        right_ref = (x_offset + config.RIGHT_X, half)
+        prefix = "UPPER_" if upper else "LOWER_"
+        if upper:
+            if prefix + "DIAMOND_LOWER_LEFT" in active:
+                plot([left_top[0], center_top[0]], [left_top[1], base_y])
+                if c.LOWER_CENTER_VERTICAL in active:
+                    center_bridge()
+            if prefix + "DIAMOND_UPPER_LEFT" in active:
+                plot([left_top[0], center_top[0]], [left_top[1], center_top[1]])
+            if prefix + "DIAMOND_UPPER_RIGHT" in active:
+                plot([center_top[0], right_ref[0]], [center_top[1], right_ref[1]])
+            if prefix + "DIAMOND_LOWER_RIGHT" in active:
+                plot([center_top[0], right_ref[0]], [base_y, right_ref[1]])
+                if c.LOWER_CENTER_VERTICAL in active:
+                    center_bridge()
+        else:
+            if prefix + "DIAMOND_LOWER_LEFT" in active:
+                plot([left_top[0], center_top[0]], [left_top[1], center_top[1]])
+            if prefix + "DIAMOND_UPPER_LEFT" in active:
+                plot([left_top[0], center_top[0]], [left_top[1], base_y])
+            if prefix + "DIAMOND_UPPER_RIGHT" in active:
+                plot([center_top[0], right_ref[0]], [base_y, right_ref[1]])
+            if prefix + "DIAMOND_LOWER_RIGHT" in active:
+                plot([center_top[0], right_ref[0]], [center_top[1], right_ref[1]])
+    return segments, circles
+
+def _rows(table):
+    """Set of table rows, so strokes drawn twice (shared bridges) count once"""
+    return {tuple(round(float(value), 9) for value in row) for row in table}
+
+def test_glyph_geometry_matches_reference_for_every_mask():
+    for mask in range(1 << N_COMPONENTS):
+        glyph = SymbolGlyph(mask)
+        geometry = glyph.geometry()
+        segments, circles = reference_strokes(set(glyph.components()))
+        assert _rows(geometry.segments) == _rows(segments), mask
+        assert _rows(geometry.circles) == _rows(circles), mask
+        # the compiled table never draws the same stroke twice
+        assert len(_rows(geometry.segments)) == len(geometry.segments), mask
+
+def test_chain_geometry_offsets_every_glyph():
+    rng = random.Random(0)
+    step = SymbolConfig.GLYPH_WIDTH + SymbolConfig.GLYPH_SPACING
+    for _ in range(200):
+        glyphs = [SymbolGlyph(rng.randrange(1 << N_COMPONENTS)) for _ in range(rng.randrange(1, 8))]
+        geometry = SymbolChain(glyphs).geometry()
+        segments, circles = [], []
+        for position, glyph in enumerate(glyphs):
+            glyph_segments, glyph_circles = reference_strokes(set(glyph.components()), position * step)
+            segments += glyph_segments
+            circles += glyph_circles
+        assert _rows(geometry.segments) == _rows(segments)
+        assert _rows(geometry.circles) == _rows(circles)
+
+@pytest.mark.parametrize("mask", [0, 1, 0b1010101010101, (1 << N_COMPONENTS) - 1])
+def test_mask_round_trips_through_components_and_vector(mask):
+    glyph = SymbolGlyph(mask)
+    assert SymbolGlyph.from_components(glyph.components()) == glyph
+    assert SymbolGlyph.from_vector(glyph.to_vector()) == glyph
@@ -0,0 +1,89 @@
+# tests/test_translation_solver.py
+# The auction (with and without its augmenting-path tail) against brute
+# force over every assignment of small instances.
+import random
+
+import numpy as np
+import pytest
+
+from components import translation_solver
+from components.translation_solver import auction_assignment, solve_translations
+
+UNASSIGNED_COST = 3.0
+
+def random_instance(rng):
+    n_rows, n_objects = rng.randrange(1, 8), rng.randrange(1, 7)
+    width = rng.randrange(1, 5)
+    candidates = np.full((n_rows, width), -1, dtype=np.int64)
+    costs = np.full((n_rows, width), np.inf)
+    for i in range(n_rows):
+        objects = rng.sample(range(n_objects), min(width, n_objects))
+        for j, obj in enumerate(objects):
+            if rng.random() < 0.85:
+                candidates[i, j] = obj
+                # a few exact ties, a few costlier than staying unassigned
+                costs[i, j] = rng.choice([1.0, 2.0, round(rng.uniform(0, 4), 3)])
+    return candidates, costs
+
+def row_costs(candidates, costs, i):
+    return {int(obj): float(cost) for obj, cost in zip(candidates[i], costs[i]) if obj >= 0 and np.isfinite(cost)}
+
+def brute_force(candidates, costs):
+    options = [row_costs(candidates, costs, i) for i in range(len(candidates))]
+    best = float("inf")
+    def search(i, used, total):
+        nonlocal best
+        if total >= best:
+            return
+        if i == len(options):
+            best = total
+            return
+        search(i + 1, used, total + UNASSIGNED_COST)
+        for obj, cost in options[i].items():
+            if obj not in used:
+                search(i + 1, used | {obj}, total + cost)
+    search(0, frozenset(), 0.0)
+    return best
+
+def total_cost(candidates, costs, assignment):
+    total = 0.0
+    for i, obj in enumerate(assignment):
+        options = row_costs(candidates, costs, i)
+        assert obj == -1 or obj in options, "assigned a non-candidate"
+        total += options[obj] if obj >= 0 else UNASSIGNED_COST
+    assigned = assignment[assignment >= 0]
+    assert len(set(assigned.tolist())) == len(assigned), "object assigned twice"
+    return total
+
+# tail 0 is the pure auction, 3 hands it the last rows, and by default these
+# instances go straight to augmenting paths (exact, so any eps passes); a
+# tiny eps would only make the auction's price wars endless
+@pytest.mark.parametrize("tail, precision", [
+    (0, translation_solver.PRECISION), (0, 0.05),
+    (3, translation_solver.PRECISION), (3, 0.05),
+    (translation_solver.AUGMENT_TAIL, 1e-12), (translation_solver.AUGMENT_TAIL, translation_solver.PRECISION),
+])
+def test_matches_brute_force(monkeypatch, tail, precision):
+    monkeypatch.setattr(translation_solver, "AUGMENT_TAIL", tail)
+    rng = random.Random(f"{tail}-{precision}")
+    for _ in range(150):
+        candidates, costs = random_instance(rng)
+        assignment = auction_assignment(candidates, costs, UNASSIGNED_COST, precision)
+        finite = [-cost for cost in costs[np.isfinite(costs) & (candidates >= 0)]] + [-UNASSIGNED_COST]
+        eps = precision * ((max(finite) - min(finite)) or 1.0)
+        # each row ends within eps of its best choice
+        assert total_cost(candidates, costs, assignment) <= brute_force(candidates, costs) + len(candidates) * eps + 1e-9
+
+def test_known_words_keep_their_translation():
+    rng = np.random.default_rng(0)
+    glyph_ids = [str(i) for i in range(30)]
+    english_words = np.array([f"w{i}" for i in range(40)])
+    known = {"3": "w0", "7": "w5"}
+    solution = solve_translations(glyph_ids, rng.integers(1, 50, 30), rng.integers(1, 6, 30),
+                                  english_words, rng.integers(1, 500, 40), known=known, window=8)
+    assert [entry["word_id"] for entry in solution] == glyph_ids
+    for entry in solution:
+        if entry["word_id"] in known:
+            assert entry["known"] and entry["translation"] == known[entry["word_id"]]
+    translations = [entry["translation"] for entry in solution if entry["translation"] is not None]
+    assert len(translations) == len(set(translations))